@@ -1,63 +1,261 @@
 import time
 from math import inf
-from core.game import OthelloGame, BLACK, WHITE
 
-class AlphaBetaAgent:
-    def __init__(self, max_depth=3, player=BLACK):
+from core.game import OthelloGame, BLACK, WHITE, COORDS
+from core.zobrist import ZOBRIST_TURN
+from algoritmos.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from algoritmos.ordering import MoveOrderer
+from algoritmos.endgame import EndgameSolver
+from algoritmos.parallel import parallel_root_search
+from algoritmos.book import load_book
+from algoritmos.registry import lazy_evaluator
+from algoritmos.ponder import Ponderer
+from algoritmos.search import SearchTimeout, SearchDriver, CHECK_INTERVAL, check_deadline, empty_squares
+
+class AlphaBetaAgent(SearchDriver):
+    def __init__(self, max_depth=3, player=BLACK, tt_size_mb=16, time_limit=None, ordering=True, workers=1,
+                 endgame_empties=10, endgame_time=None, book=None, evaluator=None,
+                 batch_leaves=False, ponder=False):
         self.max_depth = max_depth
         self.player = player
+        # Con time_limit (segundos) se usa profundizacion iterativa y max_depth es solo un tope (0 = sin tope)
+        self.time_limit = time_limit
         self.nodes_expanded = 0
+        self.depth_reached = 0
         self.name = "AlphaBethaAgent"
+        self._deadline = None
+        self._root_move = None
+        self._cancelled = False
+        # La tabla de transposicion se mantiene entre jugadas de una misma partida (0 la desactiva)
+        self.tt = TranspositionTable(tt_size_mb) if tt_size_mb else None
+        # Los valores de la tabla son desde el punto de vista de self.player: si cambia, la tabla se vacia
+        self._tt_player = player
+        # ordering puede ser True/False o un MoveOrderer configurado; sin orden solo se adelanta la jugada de la tabla
+        if ordering is True:
+            ordering = MoveOrderer()
+        self.orderer = ordering or None
+        # Con workers > 1 las jugadas de la raiz se reparten entre procesos
+        self.workers = workers
+        # Con endgame_empties casillas vacias o menos se resuelve el final de forma exacta (0 lo desactiva).
+        # endgame_time limita ese calculo (por defecto la mitad de time_limit); si se agota se usa la busqueda normal.
+        self.endgame_empties = endgame_empties
+        self.endgame_time = endgame_time
+        self.solver = EndgameSolver()
+        # Libro de aperturas (ruta o OpeningBook): si la posicion esta en el libro no se busca
+        self.book = load_book(book)
+        self.book_hit = False
+        self.book_hits = 0
+        # Funcion de evaluacion (None: diferencia de fichas; "pattern" o ruta: evaluacion por patrones)
+        self.evaluator = lazy_evaluator(evaluator)
+        # Con batch_leaves los dos ultimos niveles se expanden enteros y sus hojas se evaluan con una sola llamada
+        # a evaluate_batch
+        if batch_leaves and not hasattr(self.evaluator, "evaluate_batch"):
+            raise ValueError("batch_leaves requiere un evaluador con evaluate_batch (por ejemplo \"linear\")")
+        self.batch_leaves = batch_leaves
+        # Con ponder, ponder(game) busca en segundo plano mientras juega el rival, con la misma tabla (solo con workers=1)
+        if ponder and workers > 1:
+            raise ValueError("ponder requiere workers=1")
+        self.ponderer = Ponderer(self) if ponder else None
+        self.ponder_hit = False
+        self._config = {"max_depth": max_depth, "player": player, "tt_size_mb": tt_size_mb,
+                        "ordering": bool(ordering), "evaluator": evaluator, "batch_leaves": batch_leaves}
 
     def evaluate(self, game: OthelloGame):
+        if self.evaluator is not None:
+            return self.evaluator(game, self.player)
         black, white = game.count_pieces()
         return black - white if self.player == BLACK else white - black
 
-    def alphabeta(self, game: OthelloGame, depth: int, alpha: float, beta: float, maximizing_player: bool):
+    def alphabeta(self, game: OthelloGame, depth: int, alpha: float, beta: float, maximizing_player: bool, ply: int = 0):
         self.nodes_expanded += 1
+        if self._deadline is not None and not self.nodes_expanded % CHECK_INTERVAL:
+            check_deadline(self._deadline)
 
         if depth == 0 or game.is_game_over():
             return self.evaluate(game), None
 
         current_player = self.player if maximizing_player else game.opponent(self.player)
+
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            key = game.hash ^ ZOBRIST_TURN if current_player == WHITE else game.hash
+            entry = tt.probe(key)
+            if entry is not None:
+                tt_move = entry[4]
+                # En la raiz siempre se busca para obtener una jugada
+                if ply > 0 and entry[1] >= depth:
+                    value, flag = entry[2], entry[3]
+                    if flag == EXACT:
+                        tt.cutoffs += 1
+                        return value, tt_move
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    elif flag == UPPER:
+                        beta = min(beta, value)
+                    if beta <= alpha:
+                        tt.cutoffs += 1
+                        return value, tt_move
+
         valid_moves = game.get_valid_moves(current_player)
 
         if not valid_moves:
-            return self.alphabeta(game, depth - 1, alpha, beta, not maximizing_player)[0], None
+            return self.alphabeta(game, depth - 1, alpha, beta, not maximizing_player, ply + 1)[0], None
+
+        if ply == 0 and self._root_move is not None:
+            # La mejor jugada de la iteracion anterior se explora primero
+            tt_move = self._root_move
+        if self.orderer is not None:
+            valid_moves = self.orderer.order(valid_moves, current_player, ply, tt_move)
+        elif tt_move is not None and tt_move in valid_moves:
+            valid_moves.remove(tt_move)
+            valid_moves.insert(0, tt_move)
 
+        window_alpha, window_beta = alpha, beta
         best_move = None
 
-        if maximizing_player:
-            max_eval = -inf
+        if depth <= 2 and self.batch_leaves:
+            best_value, best_move = self._last_plies(game, valid_moves, current_player, maximizing_player, depth)
+            if (best_value >= beta if maximizing_player else best_value <= alpha) and self.orderer is not None:
+                self.orderer.record_cutoff(best_move, current_player, ply, depth)
+
+        elif maximizing_player:
+            best_value = -inf
             for move in valid_moves:
-                next_state = game.clone()
-                next_state.make_move(*move, current_player)
-                eval, _ = self.alphabeta(next_state, depth - 1, alpha, beta, False)
-                if eval > max_eval:
-                    max_eval = eval
+                undo = game.make_move(*move, current_player)
+                eval, _ = self.alphabeta(game, depth - 1, alpha, beta, False, ply + 1)
+                game.unmake_move(undo)
+                if eval > best_value:
+                    best_value = eval
                     best_move = move
                 alpha = max(alpha, eval)
                 if beta <= alpha:
+                    if self.orderer is not None:
+                        self.orderer.record_cutoff(move, current_player, ply, depth)
                     break
-            return max_eval, best_move
 
         else:
-            min_eval = inf
+            best_value = inf
             for move in valid_moves:
-                next_state = game.clone()
-                next_state.make_move(*move, current_player)
-                eval, _ = self.alphabeta(next_state, depth - 1, alpha, beta, True)
-                if eval < min_eval:
-                    min_eval = eval
+                undo = game.make_move(*move, current_player)
+                eval, _ = self.alphabeta(game, depth - 1, alpha, beta, True, ply + 1)
+                game.unmake_move(undo)
+                if eval < best_value:
+                    best_value = eval
                     best_move = move
                 beta = min(beta, eval)
                 if beta <= alpha:
+                    if self.orderer is not None:
+                        self.orderer.record_cutoff(move, current_player, ply, depth)
                     break
-            return min_eval, best_move
 
-    def get_move(self, game: OthelloGame):
-        self.nodes_expanded = 0
-        start_time = time.time()
-        _, move = self.alphabeta(game, self.max_depth, -inf, inf, True)
-        elapsed_time = time.time() - start_time
-        return move, self.nodes_expanded, elapsed_time
\ No newline at end of file
+        if tt is not None:
+            if best_value <= window_alpha:
+                flag = UPPER
+            elif best_value >= window_beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, depth, best_value, flag, best_move)
+
+        return best_value, best_move
+
+    def _last_plies(self, game: OthelloGame, moves, player, maximizing_player: bool, depth: int):
+        # Las hojas de los ultimos `depth` niveles (1 o 2) se generan con operaciones vectoriales y se evaluan
+        # con una sola llamada a evaluate_batch; sin cortes dentro del lote. Con 2 niveles el lote son todos
+        # los nietos (decenas de posiciones), que amortizan el costo fijo de cada operacion de NumPy.
+        # Un hijo sin respuestas es una hoja, como en alphabeta (el pase consume un nivel).
+        # NumPy ya esta cargado por el evaluador: el import local no lo carga para quien no usa lotes.
+        import numpy as np
+        from core.vector_env import legal_masks, flip_masks, unpack
+        own, opp = game._bitboards(player)
+        bits = np.array([1 << (x * game.size + y) for x, y in moves], dtype=np.uint64)
+        own = np.full(len(moves), own, dtype=np.uint64)
+        opp = np.full(len(moves), opp, dtype=np.uint64)
+        flipped = flip_masks(own, opp, bits)
+        leaves_own, leaves_opp = own | flipped | bits, opp & ~flipped
+        parents = None
+        if depth == 2:
+            replies = legal_masks(leaves_opp, leaves_own)
+            parents, squares = np.nonzero(unpack(replies))
+            reply_bits = np.left_shift(np.uint64(1), squares.astype(np.uint64))
+            child_own, child_opp = leaves_own[parents], leaves_opp[parents]
+            flipped = flip_masks(child_opp, child_own, reply_bits)
+            passed = np.flatnonzero(replies == np.uint64(0))
+            parents = np.concatenate([parents, passed])
+            leaves_own = np.concatenate([child_own & ~flipped, leaves_own[passed]])
+            leaves_opp = np.concatenate([child_opp | flipped | reply_bits, leaves_opp[passed]])
+        self.nodes_expanded += len(moves) + (len(leaves_own) if depth == 2 else 0)
+        if player == BLACK:
+            values = self.evaluator.evaluate_batch(leaves_own, leaves_opp)
+        else:
+            values = self.evaluator.evaluate_batch(leaves_opp, leaves_own)
+        if self.player == WHITE:
+            values = -values
+        if parents is not None:
+            # Valor de cada hijo: lo mejor para el rival entre sus respuestas
+            leaves = values
+            values = np.full(len(moves), inf if maximizing_player else -inf)
+            (np.minimum if maximizing_player else np.maximum).at(values, parents, leaves)
+        index = int(values.argmax() if maximizing_player else values.argmin())
+        return float(values[index]), moves[index]
+
+    def search_config(self):
+        # El jugador puede cambiar despues de crear el agente (por ejemplo al alternar colores)
+        return dict(self._config, player=self.player)
+
+    def child_value(self, game: OthelloGame, depth: int, alpha: float, beta: float):
+        # Valor de una posicion tras una jugada de la raiz (juega el rival); usado por los procesos auxiliares
+        return self.alphabeta(game, depth, alpha, beta, False, 1)[0]
+
+    def search_root(self, game: OthelloGame, depth: int):
+        if self.workers > 1 and depth > 0:
+            moves = game.get_valid_moves(self.player)
+            if self.orderer is not None:
+                moves = self.orderer.order(moves, self.player, 0, self._root_move)
+            elif self._root_move in moves:
+                moves.remove(self._root_move)
+                moves.insert(0, self._root_move)
+            if len(moves) > 1:
+                return parallel_root_search(self, game, depth, moves, self._deadline, split_first=True)[1]
+        return self.alphabeta(game.clone(), depth, -inf, inf, True)[1]
+
+    def solve_endgame(self, game: OthelloGame, deadline=None):
+        # Con deadline el solucionador usa endgame_time o la mitad del tiempo restante, sin pasarse del deadline
+        own, opp = game._bitboards(self.player)
+        if not game.legal_mask(self.player):
+            return None
+        time_limit = self.endgame_time
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            time_limit = min(time_limit or remaining / 2, remaining)
+        try:
+            _, sq = self.solver.solve(own, opp, time_limit)
+        except SearchTimeout:
+            return None
+        finally:
+            self.nodes_expanded += self.solver.nodes
+        self.depth_reached = empty_squares(game)
+        return COORDS[sq]
+
+    def prepare(self, game: OthelloGame):
+        if self.tt is not None:
+            if self.player != self._tt_player:
+                self.tt.clear()
+                self._tt_player = self.player
+            self.tt.new_search()
+        if self.orderer is not None:
+            self.orderer.new_search()
+            self.orderer.resize(game.size)
+
+    def exact_move(self, game: OthelloGame, deadline=None):
+        # El solucionador de finales es de 8x8; en otros tamanos se busca normalmente
+        if self.endgame_empties and game.size == 8 and empty_squares(game) <= self.endgame_empties:
+            return self.solve_endgame(game, deadline)
+        return None
+
+    def cancel(self):
+        super().cancel()
+        self.solver._deadline = -inf
@@ -0,0 +1,122 @@
+import argparse
+import struct
+import time
+from math import inf
+
+from core.bitboard import FULL, canonical, SYMMETRY_SQUARES
+from core.game import OthelloGame, BLACK, WHITE, COORDS
+from core.zobrist import zobrist_hash, ZOBRIST_TURN
+from algoritmos.registry import cached_model
+
+# Archivo: cabecera fija y entradas ordenadas por hash (hash uint64, casilla canonica uint8, puntaje int8)
+MAGIC = b"OTHBOOK\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIQ12x")  # magic, version, cantidad de entradas
+ENTRY = struct.Struct("<QBb")
+
+# INVERSE_SQUARES[s][sq]: casilla real que la simetria s lleva a sq
+INVERSE_SQUARES = [[0] * 64 for _ in range(8)]
+for _s in range(8):
+    for _sq in range(64):
+        INVERSE_SQUARES[_s][SYMMETRY_SQUARES[_s][_sq]] = _sq
+
+
+def position_hash(black, white, player):
+    # Hash de la posicion canonica (la menor de las 8 simetricas) con el turno; y la simetria usada
+    key, symmetry = canonical(black, white)
+    h = zobrist_hash(key >> 64, key & FULL)
+    return (h ^ ZOBRIST_TURN if player == WHITE else h), symmetry
+
+
+class OpeningBook:
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else {}  # hash -> (casilla canonica, puntaje)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, game, player, move, score):
+        h, symmetry = position_hash(game.black, game.white, player)
+        self.entries[h] = (SYMMETRY_SQUARES[symmetry][move[0] * 8 + move[1]], max(-128, min(127, int(score))))
+
+    def lookup(self, game, player):
+        h, symmetry = position_hash(game.black, game.white, player)
+        entry = self.entries.get(h)
+        if entry is None:
+            return None
+        move = COORDS[INVERSE_SQUARES[symmetry][entry[0]]]
+        # Proteccion ante colisiones de hash: la jugada debe ser legal
+        return move if game.is_valid_move(*move, player) else None
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.entries)))
+            for h in sorted(self.entries):
+                f.write(ENTRY.pack(h, *self.entries[h]))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: formato de libro de aperturas no soportado")
+        entries = {}
+        for h, sq, score in ENTRY.iter_unpack(data[HEADER.size:HEADER.size + count * ENTRY.size]):
+            entries[h] = (sq, score)
+        return cls(entries)
+
+
+def load_book(book):
+    # Acepta una ruta (cargada una vez por proceso), un OpeningBook ya cargado o None
+    return cached_model(book, OpeningBook.load) if isinstance(book, str) else book
+
+
+def build_book(plies=6, depth=6, progress=None):
+    # Recorre todas las posiciones hasta `plies` jugadas (sin repetir simetricas) y guarda
+    # la mejor jugada de una busqueda alfa-beta a profundidad `depth` para el jugador al turno
+    from algoritmos.alphabeta import AlphaBetaAgent
+
+    book = OpeningBook()
+    agents = {color: AlphaBetaAgent(depth, color, endgame_empties=0) for color in (BLACK, WHITE)}
+    frontier = [OthelloGame()]
+    seen = set()
+    for ply in range(plies):
+        next_frontier = []
+        for game in frontier:
+            player = game.current_player
+            moves = game.get_valid_moves(player)
+            if not moves:
+                player = game.opponent(player)
+                game.current_player = player
+                moves = game.get_valid_moves(player)
+                if not moves:
+                    continue
+            h, _ = position_hash(game.black, game.white, player)
+            if h in seen:
+                continue
+            seen.add(h)
+            score, move = agents[player].alphabeta(game.clone(), depth, -inf, inf, True)
+            book.add(game, player, move, score)
+            for reply in moves:
+                child = game.clone()
+                child.make_move(*reply, player)
+                next_frontier.append(child)
+        frontier = next_frontier
+        if progress:
+            progress(ply + 1, len(book))
+    return book
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un libro de aperturas a partir de busquedas profundas")
+    parser.add_argument("--plies", type=int, default=6, help="jugadas desde la posicion inicial")
+    parser.add_argument("--depth", type=int, default=6, help="profundidad de la busqueda por posicion")
+    parser.add_argument("--output", default="book.bin")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    book = build_book(args.plies, args.depth,
+                      progress=lambda ply, size: print(f"jugada {ply}: {size} posiciones"))
+    book.save(args.output)
+    print(f"{len(book)} posiciones en {args.output} ({time.perf_counter() - start:.1f} s)")
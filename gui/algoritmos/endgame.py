@@ -0,0 +1,200 @@
+import argparse
+import random
+import time
+
+from core.bitboard import FULL, legal_moves, flips, popcount
+from algoritmos.search import CHECK_INTERVAL, SearchTimeout, make_deadline, check_deadline
+
+# Cuadrantes 4x4 del tablero, para ordenar por paridad de casillas vacias
+QUADRANTS = [0x000000000F0F0F0F, 0x00000000F0F0F0F0, 0x0F0F0F0F00000000, 0xF0F0F0F000000000]
+
+# Con pocas vacias ordenar por movilidad cuesta mas de lo que ahorra; se usa solo paridad
+FASTEST_FIRST_EMPTIES = 7
+
+SCORE_MAX = 64
+
+
+def _bits(bb):
+    squares = []
+    while bb:
+        low = bb & -bb
+        squares.append(low.bit_length() - 1)
+        bb ^= low
+    return squares
+
+
+class EndgameSolver:
+    # Busqueda exacta (negamax alfa-beta) del resultado final: diferencia de fichas propias menos rivales
+    def __init__(self):
+        self.nodes = 0
+        self._deadline = None
+
+    def _parity_order(self, moves, empties):
+        odd = 0
+        for quadrant in QUADRANTS:
+            if popcount(empties & quadrant) & 1:
+                odd |= quadrant
+        return _bits(moves & odd) + _bits(moves & ~odd)
+
+    def _last1(self, own, opp, sq):
+        # Ultima casilla vacia: juega quien pueda, sin generar jugadas
+        f = flips(own, opp, sq)
+        if f:
+            return popcount(own | f) + 1 - popcount(opp ^ f)
+        f = flips(opp, own, sq)
+        if f:
+            return popcount(own ^ f) - popcount(opp | f) - 1
+        return popcount(own) - popcount(opp)
+
+    def _last2(self, own, opp, alpha, beta, sq1, sq2):
+        self.nodes += 1
+        best = None
+        for a, b in ((sq1, sq2), (sq2, sq1)):
+            f = flips(own, opp, a)
+            if f:
+                value = -self._last1(opp ^ f, own | f | (1 << a), b)
+                if best is None or value > best:
+                    best = value
+                    if best >= beta:
+                        return best
+        if best is not None:
+            return best
+        # Sin jugadas propias: juega el rival y la ultima casilla se resuelve desde este lado
+        for a, b in ((sq1, sq2), (sq2, sq1)):
+            f = flips(opp, own, a)
+            if f:
+                value = self._last1(own ^ f, opp | f | (1 << a), b)
+                if best is None or value < best:
+                    best = value
+                    if best <= alpha:
+                        return best
+        if best is not None:
+            return best
+        return popcount(own) - popcount(opp)
+
+    def search(self, own, opp, alpha, beta, passed=False):
+        self.nodes += 1
+        if self._deadline is not None and not self.nodes % CHECK_INTERVAL:
+            check_deadline(self._deadline)
+
+        empties = ~(own | opp) & FULL
+        n_empties = popcount(empties)
+        if n_empties == 1:
+            return self._last1(own, opp, empties.bit_length() - 1)
+        if n_empties == 2:
+            sq1, sq2 = _bits(empties)
+            return self._last2(own, opp, alpha, beta, sq1, sq2)
+
+        moves = legal_moves(own, opp)
+        if not moves:
+            if passed:
+                return popcount(own) - popcount(opp)
+            return -self.search(opp, own, -beta, -alpha, True)
+
+        best = -SCORE_MAX - 1
+        for sq in self.order(own, opp, moves, empties, n_empties):
+            f = flips(own, opp, sq)
+            value = -self.search(opp ^ f, own | f | (1 << sq), -beta, -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return best
+
+    def order(self, own, opp, moves, empties, n_empties):
+        ordered = self._parity_order(moves, empties)
+        if n_empties <= FASTEST_FIRST_EMPTIES:
+            return ordered
+        # Primero las jugadas que dejan al rival con menos respuestas (fastest-first)
+        mobility = []
+        for sq in ordered:
+            f = flips(own, opp, sq)
+            mobility.append(popcount(legal_moves(opp ^ f, own | f | (1 << sq))))
+        return [sq for _, _, sq in sorted(zip(mobility, range(len(ordered)), ordered))]
+
+    def _root(self, own, opp, alpha, beta):
+        moves = legal_moves(own, opp)
+        empties = ~(own | opp) & FULL
+        best, best_sq = -SCORE_MAX - 1, None
+        for sq in self.order(own, opp, moves, empties, popcount(empties)):
+            f = flips(own, opp, sq)
+            value = -self.search(opp ^ f, own | f | (1 << sq), -beta, -alpha)
+            if value > best:
+                best, best_sq = value, sq
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return best, best_sq
+
+    def solve(self, own, opp, time_limit=None):
+        # Devuelve (puntaje exacto, casilla) para el jugador con las fichas `own`, que debe tener jugadas.
+        # Primero una ventana nula alrededor de 0 decide ganar/empatar/perder y luego se busca el puntaje exacto.
+        self.nodes = 0
+        self._deadline = make_deadline(time_limit)
+        try:
+            wld, sq = self._root(own, opp, -1, 1)
+            if wld > 0:
+                score, exact_sq = self._root(own, opp, 0, SCORE_MAX)
+            elif wld < 0:
+                score, exact_sq = self._root(own, opp, -SCORE_MAX, 0)
+            else:
+                return 0, sq
+            return score, exact_sq
+        finally:
+            self._deadline = None
+
+
+def random_position(empties, rng):
+    # Partida aleatoria hasta que queden `empties` casillas vacias con el jugador al turno con jugadas
+    while True:
+        own, opp = 0x0000000810000000, 0x0000001008000000
+        while popcount(~(own | opp) & FULL) > empties:
+            moves = _bits(legal_moves(own, opp))
+            if not moves:
+                if not legal_moves(opp, own):
+                    break
+                own, opp = opp, own
+                continue
+            sq = rng.choice(moves)
+            f = flips(own, opp, sq)
+            own, opp = opp ^ f, own | f | (1 << sq)
+        if popcount(~(own | opp) & FULL) == empties and legal_moves(own, opp):
+            return own, opp
+
+
+def benchmark(empties=12, positions=10, seed=0, time_limit=None):
+    rng = random.Random(seed)
+    solver = EndgameSolver()
+    rows = []
+    for _ in range(positions):
+        own, opp = random_position(empties, rng)
+        start = time.perf_counter()
+        try:
+            score, sq = solver.solve(own, opp, time_limit)
+        except SearchTimeout:
+            score, sq = None, None
+        elapsed = time.perf_counter() - start
+        rows.append((score, sq, solver.nodes, elapsed))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del solucionador exacto de finales")
+    parser.add_argument("--empties", type=int, nargs="+", default=[8, 10, 12, 14])
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=None)
+    args = parser.parse_args()
+
+    print("| Vacias | Posiciones | Resueltas | Tiempo medio (s) | Tiempo max (s) | Nodos medios | Nodos/s |")
+    print("|--------|------------|-----------|------------------|----------------|--------------|---------|")
+    for empties in args.empties:
+        rows = benchmark(empties, args.positions, args.seed, args.time_limit)
+        solved = [r for r in rows if r[0] is not None]
+        total_time = sum(r[3] for r in rows)
+        total_nodes = sum(r[2] for r in rows)
+        print(f"| {empties:<6} | {len(rows):<10} | {len(solved):<9} | {total_time / len(rows):<16.3f} "
+              f"| {max(r[3] for r in rows):<14.3f} | {total_nodes // len(rows):<12} | {total_nodes / total_time:<7.0f} |")
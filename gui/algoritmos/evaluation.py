@@ -0,0 +1,314 @@
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from core.bitboard import FULL, NOT_COL_0, NOT_COL_7, popcount, symmetries
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.ordering import SQUARE_WEIGHTS
+from algoritmos.value_model import ValueModel, VALUE_MODEL_FILE
+from algoritmos.registry import cached_model
+
+# Casillas de cada instancia de patron. Todas las instancias de un tipo son imagenes simetricas de la
+# primera con las casillas en el mismo orden relativo, por eso comparten tabla. El codigo de una
+# instancia es sum(3 ** i * c_i) con c_i = 0 vacia, 1 negra, 2 blanca.
+EDGE_PATTERNS = [
+    [(0, i) for i in range(8)],
+    [(7, i) for i in range(8)],
+    [(i, 0) for i in range(8)],
+    [(i, 7) for i in range(8)],
+]
+CORNER_PATTERNS = [
+    [(r, c) for r in range(3) for c in range(3)],
+    [(7 - r, c) for r in range(3) for c in range(3)],
+    [(r, 7 - c) for r in range(3) for c in range(3)],
+    [(7 - r, 7 - c) for r in range(3) for c in range(3)],
+]
+DIAGONAL_PATTERNS = [
+    [(i, i) for i in range(8)],
+    [(7 - i, i) for i in range(8)],
+]
+PATTERNS = EDGE_PATTERNS + CORNER_PATTERNS + DIAGONAL_PATTERNS
+
+EDGE_SIZE = 3 ** 8
+CORNER_SIZE = 3 ** 9
+DIAGONAL_SIZE = 3 ** 8
+# Desplazamiento de cada instancia en el vector de pesos concatenado (bordes, esquinas, diagonales)
+OFFSETS = [0] * 4 + [EDGE_SIZE] * 4 + [EDGE_SIZE + CORNER_SIZE] * 2
+N_WEIGHTS = EDGE_SIZE + CORNER_SIZE + DIAGONAL_SIZE
+
+# BASE3[code]: valor en base 3 de un codigo binario de hasta 9 casillas (bit i -> 3 ** i)
+BASE3 = [sum(3 ** i for i in range(9) if code >> i & 1) for code in range(512)]
+# REVERSE[byte]: byte con los bits invertidos (lee una fila de derecha a izquierda)
+REVERSE = [int(f"{byte:08b}"[::-1], 2) for byte in range(256)]
+
+
+def _low_run(byte):
+    # Bits en 1 consecutivos desde el bit 0
+    return (~byte & (byte + 1)) - 1
+
+
+# MIRROR_9[code]: bloque 3x3 con cada fila de 3 bits invertida
+MIRROR_9 = [sum(1 << (3 * (i // 3) + 2 - i % 3) for i in range(9) if code >> i & 1) for code in range(512)]
+# STABLE[byte]: fichas de un borde unidas a una esquina propia (no pueden voltearse)
+STABLE = [popcount(_low_run(byte) | REVERSE[_low_run(REVERSE[byte])]) for byte in range(256)]
+
+COLUMN_0 = 0x0101010101010101
+DIAGONAL = 0x8040201008040201
+ANTI_DIAGONAL = 0x0102040810204080
+GATHER_COLUMN = 0x0102040810204080  # bit 8 * i -> bit 56 + i
+GATHER_DIAGONAL = 0x0101010101010101
+
+WEIGHTS_FILE = "pattern_weights.npz"
+
+
+def _lines(bb):
+    # Bytes de bb en el orden de las casillas de cada patron de 8: filas 0 y 7, columnas 0 y 7, diagonales
+    return (bb & 0xFF, bb >> 56,
+            ((bb & COLUMN_0) * GATHER_COLUMN & FULL) >> 56,
+            ((bb >> 7 & COLUMN_0) * GATHER_COLUMN & FULL) >> 56,
+            ((bb & DIAGONAL) * GATHER_DIAGONAL & FULL) >> 56,
+            ((bb & ANTI_DIAGONAL) * GATHER_DIAGONAL & FULL) >> 56)
+
+
+def _corners(bb):
+    # Codigos de 9 bits de los cuatro bloques 3x3 de las esquinas. Los bloques de la derecha se leen
+    # con las columnas en orden natural y MIRROR_9 los lleva al orden del patron.
+    return ((bb & 7) | (bb >> 5 & 0x38) | (bb >> 10 & 0x1C0),
+            (bb >> 56 & 7) | (bb >> 45 & 0x38) | (bb >> 34 & 0x1C0),
+            MIRROR_9[(bb >> 5 & 7) | (bb >> 10 & 0x38) | (bb >> 15 & 0x1C0)],
+            MIRROR_9[(bb >> 61) | (bb >> 50 & 0x38) | (bb >> 39 & 0x1C0)])
+
+
+def _neighbours(bb):
+    # Casillas vecinas (en las 8 direcciones) de alguna ficha de bb
+    return (bb << 8 & FULL | bb >> 8 | (bb << 1 | bb << 9 | bb >> 7) & NOT_COL_0
+            | (bb >> 1 | bb >> 9 | bb << 7) & NOT_COL_7)
+
+
+def potential_mobility(black, white):
+    # Casillas vacias junto a fichas rivales, de negras y de blancas: aproxima la movilidad sin
+    # calcular las jugadas legales (unas pocas operaciones de bits en vez de dos generaciones de jugadas)
+    empty = ~(black | white) & FULL
+    return _neighbours(white) & empty, _neighbours(black) & empty
+
+
+def features(black, white):
+    # (codigos de los 10 patrones, estabilidad de bordes negras - blancas)
+    b_top, b_bottom, b_left, b_right, b_diag, b_anti = _lines(black)
+    w_top, w_bottom, w_left, w_right, w_diag, w_anti = _lines(white)
+    b0, b1, b2, b3 = _corners(black)
+    w0, w1, w2, w3 = _corners(white)
+    indices = (BASE3[b_top] + 2 * BASE3[w_top], BASE3[b_bottom] + 2 * BASE3[w_bottom],
+               BASE3[b_left] + 2 * BASE3[w_left], BASE3[b_right] + 2 * BASE3[w_right],
+               BASE3[b0] + 2 * BASE3[w0], BASE3[b1] + 2 * BASE3[w1],
+               BASE3[b2] + 2 * BASE3[w2], BASE3[b3] + 2 * BASE3[w3],
+               BASE3[b_diag] + 2 * BASE3[w_diag], BASE3[b_anti] + 2 * BASE3[w_anti])
+    # Las esquinas cuentan en sus dos bordes
+    stability = (STABLE[b_top] + STABLE[b_bottom] + STABLE[b_left] + STABLE[b_right]
+                 - STABLE[w_top] - STABLE[w_bottom] - STABLE[w_left] - STABLE[w_right])
+    return indices, stability
+
+
+class PatternEvaluator:
+    # Evaluacion lineal desde el punto de vista de negras, en fichas de diferencia final estimada
+    def __init__(self, weights, mobility=1.0, stability=1.0):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.mobility = float(mobility)
+        self.stability = float(stability)
+        # Tablas indexadas directamente por (bits negras << 8 | bits blancas) de cada patron, con la
+        # estabilidad ya sumada en la de bordes. Listas de Python: indexarlas de a un elemento es
+        # bastante mas rapido que indexar arreglos NumPy.
+        self._edge = self._expand(self.weights[:EDGE_SIZE], 8, self.stability)
+        self._corner = self._expand(self.weights[EDGE_SIZE:EDGE_SIZE + CORNER_SIZE], 9)
+        self._corner_mirror = [self._corner[MIRROR_9[code >> 9] << 9 | MIRROR_9[code & 0x1FF]]
+                               for code in range(1 << 18)]
+        self._diagonal = self._expand(self.weights[EDGE_SIZE + CORNER_SIZE:], 8)
+
+    @staticmethod
+    def _expand(weights, size, stability=0.0):
+        base3 = np.array(BASE3[:1 << size])
+        black, white = np.meshgrid(np.arange(1 << size), np.arange(1 << size), indexing="ij")
+        valid = (black & white) == 0
+        table = np.where(valid, weights[np.where(valid, base3[black] + 2 * base3[white], 0)], 0.0)
+        if stability:
+            stable = np.array(STABLE)
+            table += stability * (stable[black] - stable[white])
+        return table.ravel().tolist()
+
+    @classmethod
+    def default(cls):
+        # Sin pesos ajustados: cada patron suma los pesos estaticos de sus casillas, repartidos
+        # entre los patrones que cubren la misma casilla
+        coverage = [[0] * 8 for _ in range(8)]
+        for pattern in PATTERNS:
+            for x, y in pattern:
+                coverage[x][y] += 1
+        weights = np.zeros(N_WEIGHTS)
+        for pattern, offset in ((EDGE_PATTERNS[0], 0), (CORNER_PATTERNS[0], EDGE_SIZE),
+                                (DIAGONAL_PATTERNS[0], EDGE_SIZE + CORNER_SIZE)):
+            for code in range(3 ** len(pattern)):
+                value, rest = 0.0, code
+                for x, y in pattern:
+                    rest, cell = divmod(rest, 3)
+                    if cell:
+                        value += (1 if cell == 1 else -1) * SQUARE_WEIGHTS[x][y] / coverage[x][y]
+                weights[offset + code] = value / 10
+        return cls(weights, mobility=1.0, stability=1.0)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["weights"], *data["scalars"])
+
+    def save(self, path):
+        np.savez(path, weights=self.weights, scalars=np.array([self.mobility, self.stability]))
+
+    def score(self, black, white, moves_black, moves_white):
+        # Misma extraccion que _lines y _corners, escrita en linea porque es el camino caliente de la busqueda
+        b, w = black, white
+        edge, corner, mirror, diagonal = self._edge, self._corner, self._corner_mirror, self._diagonal
+        return (edge[(b & 0xFF) << 8 | (w & 0xFF)] + edge[(b >> 56) << 8 | (w >> 56)]
+                + edge[((b & COLUMN_0) * GATHER_COLUMN & FULL) >> 48 & 0xFF00 | ((w & COLUMN_0) * GATHER_COLUMN & FULL) >> 56]
+                + edge[((b >> 7 & COLUMN_0) * GATHER_COLUMN & FULL) >> 48 & 0xFF00
+                       | ((w >> 7 & COLUMN_0) * GATHER_COLUMN & FULL) >> 56]
+                + diagonal[((b & DIAGONAL) * GATHER_DIAGONAL & FULL) >> 48 & 0xFF00
+                           | ((w & DIAGONAL) * GATHER_DIAGONAL & FULL) >> 56]
+                + diagonal[((b & ANTI_DIAGONAL) * GATHER_DIAGONAL & FULL) >> 48 & 0xFF00
+                           | ((w & ANTI_DIAGONAL) * GATHER_DIAGONAL & FULL) >> 56]
+                + corner[((b & 7) | (b >> 5 & 0x38) | (b >> 10 & 0x1C0)) << 9
+                         | (w & 7) | (w >> 5 & 0x38) | (w >> 10 & 0x1C0)]
+                + corner[((b >> 56 & 7) | (b >> 45 & 0x38) | (b >> 34 & 0x1C0)) << 9
+                         | (w >> 56 & 7) | (w >> 45 & 0x38) | (w >> 34 & 0x1C0)]
+                + mirror[((b >> 5 & 7) | (b >> 10 & 0x38) | (b >> 15 & 0x1C0)) << 9
+                         | (w >> 5 & 7) | (w >> 10 & 0x38) | (w >> 15 & 0x1C0)]
+                + mirror[((b >> 61) | (b >> 50 & 0x38) | (b >> 39 & 0x1C0)) << 9
+                         | (w >> 61) | (w >> 50 & 0x38) | (w >> 39 & 0x1C0)]
+                + self.mobility * (popcount(moves_black) - popcount(moves_white)))
+
+    def __call__(self, game, player):
+        # Movilidad potencial en vez de jugadas legales: generar las jugadas de los dos colores en cada hoja
+        # costaba mas que los patrones. Solo se generan si quien mueve no tiene casillas vacias junto a
+        # fichas rivales (puede no tener jugadas); con alguna se supone que la partida sigue, lo que solo
+        # falla en posiciones bloqueadas poco frecuentes (los nodos internos usan game.is_game_over).
+        black, white = game.black, game.white
+        moves_black, moves_white = potential_mobility(black, white)
+        own = moves_black if game.current_player == BLACK else moves_white
+        if own or game.legal_mask(BLACK) or game.legal_mask(WHITE):
+            value = self.score(black, white, moves_black, moves_white)
+        else:
+            # Partida terminada: diferencia exacta
+            value = game.black_count - game.white_count
+        return value if player == BLACK else -value
+
+
+# Evaluadores ya construidos, para cargar cada tabla una sola vez por proceso
+_EVALUATORS = {}
+
+
+def get_evaluator(spec):
+    # None: diferencia de fichas del agente; "pattern" / "linear": pesos de WEIGHTS_FILE / VALUE_MODEL_FILE
+    # si existen, si no los pesos por defecto; otra cadena: ruta a un archivo de pesos de cualquiera de
+    # los dos; cualquier otro objeto se usa tal cual
+    if spec is None or callable(spec):
+        return spec
+    if spec == "pattern":
+        spec = WEIGHTS_FILE if os.path.exists(WEIGHTS_FILE) else "pattern"
+    elif spec == "linear":
+        # Modelo de valor sobre las casillas, evaluable por lotes (algoritmos.value_model)
+        spec = VALUE_MODEL_FILE if os.path.exists(VALUE_MODEL_FILE) else "linear"
+    if spec in ("pattern", "linear"):
+        evaluator = _EVALUATORS.get(spec)
+        if evaluator is None:
+            evaluator = _EVALUATORS[spec] = load_evaluator(spec)
+        return evaluator
+    return cached_model(spec, load_evaluator)
+
+
+def load_evaluator(spec):
+    if spec == "pattern":
+        return PatternEvaluator.default()
+    if spec == "linear":
+        return ValueModel.default()
+    with np.load(spec) as data:
+        is_pattern = "weights" in data.files
+    return PatternEvaluator.load(spec) if is_pattern else ValueModel.load(spec)
+
+
+def self_play_positions(games=200, depth=2, epsilon=0.1, seed=0, evaluator=None):
+    # Partidas AlphaBeta contra si mismo con jugadas aleatorias ocasionales para variar las posiciones.
+    # Devuelve las posiciones (negras, blancas, movilidad potencial de negras y de blancas) y la diferencia final.
+    from algoritmos.alphabeta import AlphaBetaAgent
+
+    rng = random.Random(seed)
+    agents = {color: AlphaBetaAgent(depth, color, endgame_empties=0, evaluator=evaluator) for color in (BLACK, WHITE)}
+    positions, targets = [], []
+    for _ in range(games):
+        for agent in agents.values():
+            agent.tt.clear()
+        game = OthelloGame()
+        start = len(positions)
+        while not game.is_game_over():
+            current = game.current_player
+            moves = game.get_valid_moves(current)
+            if not moves:
+                game.current_player = game.opponent(current)
+                continue
+            if rng.random() < epsilon:
+                move = rng.choice(moves)
+            else:
+                move = agents[current].get_move(game)[0]
+            game.make_move(*move, current)
+            positions.append((game.black, game.white, *potential_mobility(game.black, game.white)))
+        result = game.black_count - game.white_count
+        targets += [result] * (len(positions) - start)
+    return positions, targets
+
+
+def fit(positions, targets, epochs=200, rate=0.05, scalar_rate=0.001):
+    # Descenso por gradiente del error cuadratico. Cada posicion se agrega con sus 8 simetrias
+    # (mismas movilidad y estabilidad, otros codigos de patron).
+    rows, scalars, y = [], [], []
+    for (black, white, moves_black, moves_white), target in zip(positions, targets):
+        mobility = popcount(moves_black) - popcount(moves_white)
+        for b, w in zip(symmetries(black), symmetries(white)):
+            indices, stability = features(b, w)
+            rows.append([offset + index for offset, index in zip(OFFSETS, indices)])
+            scalars.append((mobility, stability))
+            y.append(target)
+    rows = np.array(rows)
+    scalars = np.array(scalars, dtype=np.float64)
+    y = np.array(y, dtype=np.float64)
+
+    counts = np.bincount(rows.ravel(), minlength=N_WEIGHTS)
+    weights = np.zeros(N_WEIGHTS)
+    coefs = np.zeros(2)
+    for _ in range(epochs):
+        error = y - weights[rows].sum(axis=1) - scalars @ coefs
+        gradient = np.bincount(rows.ravel(), weights=np.repeat(error, rows.shape[1]), minlength=N_WEIGHTS)
+        # Paso normalizado por la frecuencia de cada codigo: los patrones raros no se quedan atras
+        weights += rate * gradient / np.maximum(counts, 1)
+        coefs += scalar_rate * scalars.T @ error / len(y)
+    error = y - weights[rows].sum(axis=1) - scalars @ coefs
+    return PatternEvaluator(weights, *coefs), float(np.sqrt(np.mean(error ** 2)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajusta los pesos de la evaluacion por patrones con partidas propias")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--epsilon", type=float, default=0.1, help="probabilidad de una jugada aleatoria")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=WEIGHTS_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    positions, targets = self_play_positions(args.games, args.depth, args.epsilon, args.seed, "pattern")
+    print(f"{len(positions)} posiciones de {args.games} partidas ({time.perf_counter() - start:.1f} s)")
+    start = time.perf_counter()
+    evaluator, rmse = fit(positions, targets, args.epochs)
+    evaluator.save(args.output)
+    print(f"Error cuadratico medio: {rmse:.2f} fichas ({time.perf_counter() - start:.1f} s) -> {args.output}")
@@ -0,0 +1,217 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+
+# Metodos que se envuelven en cada tipo de agente (por nombre de clase, para no importar los agentes):
+#   search: (metodo recursivo, indice de ply, de alpha, de beta y de maximizing_player en sus argumentos)
+#   eval / movegen: (metodo, cantidad de posiciones evaluadas segun los argumentos)
+HOOKS = {
+    "MinimaxAgent": {
+        "search": ("minimax", 3, None, None, 2),
+        "eval": [("evaluate", lambda args: 1)],
+    },
+    "AlphaBetaAgent": {
+        "search": ("alphabeta", 5, 2, 3, 4),
+        "eval": [("evaluate", lambda args: 1), ("_last_ply", lambda args: len(args[1]))],
+    },
+    "QLearningAgent": {
+        "eval": [("select_action", lambda args: len(args[1]))],
+        "movegen": ["get_valid_actions"],
+    },
+}
+
+
+class Instrumentation:
+    # Mide un agente envolviendo sus metodos como atributos de la instancia. Desactivada no queda
+    # ningun envoltorio, asi que el agente corre exactamente el mismo codigo que sin instrumentar.
+    def __init__(self, agent, sink=None, profile=False):
+        self.agent = agent
+        self.sink = sink  # archivo abierto: un registro JSON por linea y jugada
+        self.profile = profile  # True: cProfile en cada jugada; "next": solo en la proxima
+        self.records = []
+        self._wrapped = []
+        self._game = None
+        self._in_eval = False
+        self._reset()
+
+    def _reset(self):
+        self.nodes_per_depth = []
+        self.cutoffs = 0
+        self.leaf_evals = 0
+        self.eval_time = 0.0
+        self.movegen_time = 0.0
+        self._game = None
+
+    def enable(self):
+        if self._wrapped:
+            return self
+        hooks = next((HOOKS[cls.__name__] for cls in type(self.agent).__mro__ if cls.__name__ in HOOKS), {})
+        if "search" in hooks:
+            self._wrap(hooks["search"][0], self._search_wrapper(*hooks["search"]))
+        for name, count in hooks.get("eval", []):
+            if hasattr(self.agent, name):
+                self._wrap(name, self._eval_wrapper(getattr(self.agent, name), count))
+        for name in hooks.get("movegen", []):
+            self._wrap(name, self._movegen_wrapper(getattr(self.agent, name)))
+        self._wrap("get_move", self._get_move_wrapper(self.agent.get_move))
+        return self
+
+    def disable(self):
+        for name in self._wrapped:
+            del self.agent.__dict__[name]
+        self._wrapped = []
+        if self._game is not None:
+            self._game.__dict__.pop("legal_mask", None)
+            self._game = None
+
+    def profile_next_move(self):
+        self.profile = "next"
+
+    def _wrap(self, name, wrapper):
+        setattr(self.agent, name, wrapper)
+        self._wrapped.append(name)
+
+    def _search_wrapper(self, name, ply_index, alpha_index, beta_index, max_index):
+        original = getattr(self.agent, name)
+        stats = self
+
+        def search(*args):
+            game = args[0]
+            if game is not stats._game:
+                stats._watch_game(game)
+            ply = args[ply_index] if len(args) > ply_index else 0
+            counts = stats.nodes_per_depth
+            while len(counts) <= ply:
+                counts.append(0)
+            counts[ply] += 1
+            result = original(*args)
+            # Corte: un nodo interior que termina fuera de la ventana por el lado de su jugador
+            if alpha_index is not None and args[1] > 0:
+                value = result[0]
+                if value >= args[beta_index] if args[max_index] else value <= args[alpha_index]:
+                    stats.cutoffs += 1
+            return result
+        return search
+
+    def _watch_game(self, game):
+        # La busqueda trabaja sobre una copia del juego: se mide su generacion de jugadas
+        if self._game is not None:
+            self._game.__dict__.pop("legal_mask", None)
+        self._game = game
+        game.legal_mask = self._movegen_wrapper(game.legal_mask)
+
+    def _eval_wrapper(self, original, count):
+        stats = self
+
+        def evaluate(*args):
+            stats._in_eval = True
+            start = time.perf_counter()
+            try:
+                return original(*args)
+            finally:
+                stats.eval_time += time.perf_counter() - start
+                stats.leaf_evals += count(args)
+                stats._in_eval = False
+        return evaluate
+
+    def _movegen_wrapper(self, original):
+        stats = self
+
+        def movegen(*args):
+            if stats._in_eval:
+                return original(*args)  # ya se cuenta como tiempo de evaluacion
+            start = time.perf_counter()
+            try:
+                return original(*args)
+            finally:
+                stats.movegen_time += time.perf_counter() - start
+        return movegen
+
+    def _get_move_wrapper(self, original):
+        def get_move(game):
+            self._reset()
+            profiler = cProfile.Profile() if self.profile else None
+            if self.profile == "next":
+                self.profile = False
+            start = time.perf_counter()
+            if profiler is not None:
+                profiler.enable()
+            try:
+                move, nodes, elapsed = original(game)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                if self._game is not None:
+                    self._game.__dict__.pop("legal_mask", None)
+                    self._game = None
+            wall = time.perf_counter() - start
+            record = self.record(self.agent.player, move, nodes, wall)
+            if profiler is not None:
+                record["profile"] = profile_summary(profiler)
+            self.records.append(record)
+            self.agent.last_search = record
+            if self.sink is not None:
+                self.sink.write(json.dumps(record) + "\n")
+            return move, nodes, elapsed
+        return get_move
+
+    def record(self, player, move, nodes, elapsed):
+        agent = self.agent
+        counts = self.nodes_per_depth
+        tt = getattr(agent, "tt", None)
+        return {
+            "agent": agent.name,
+            "player": player,
+            "move": list(move) if move else None,
+            "nodes": nodes,
+            "depth": getattr(agent, "depth_reached", 0),
+            "elapsed": round(elapsed, 6),
+            "nps": round(nodes / elapsed) if elapsed else 0,
+            "nodes_per_depth": counts,
+            "ebf": round(effective_branching_factor(counts), 3),
+            "cutoffs": self.cutoffs,
+            "tt_cutoffs": tt.cutoffs if tt is not None else 0,
+            "leaf_evals": self.leaf_evals,
+            "eval_time": round(self.eval_time, 6),
+            "movegen_time": round(self.movegen_time, 6),
+            "book_hit": getattr(agent, "book_hit", False),
+        }
+
+
+def effective_branching_factor(nodes_per_depth):
+    # Media geometrica del crecimiento entre niveles: (nodos del ultimo nivel / nodos de la raiz) ** (1 / d)
+    depth = len(nodes_per_depth) - 1
+    if depth < 1 or not nodes_per_depth[0]:
+        return 0.0
+    return (nodes_per_depth[-1] / nodes_per_depth[0]) ** (1 / depth)
+
+
+def profile_summary(profiler, limit=15):
+    # Las funciones con mas tiempo acumulado, como lista serializable
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{filename}:{line}({name})", "calls": calls,
+                     "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:limit]
+
+
+def summarize(records):
+    # Totales de una partida para un agente (usado por metrics.play_game y la GUI)
+    searched = [r for r in records if r["nodes"]]
+    elapsed = sum(r["elapsed"] for r in records)
+    nodes = sum(r["nodes"] for r in records)
+    return {
+        "moves": len(records),
+        "nodes": nodes,
+        "nps": round(nodes / elapsed) if elapsed else 0,
+        "ebf": round(sum(r["ebf"] for r in searched) / len(searched), 3) if searched else 0.0,
+        "cutoffs": sum(r["cutoffs"] for r in records),
+        "leaf_evals": sum(r["leaf_evals"] for r in records),
+        "eval_time": round(sum(r["eval_time"] for r in records), 6),
+        "movegen_time": round(sum(r["movegen_time"] for r in records), 6),
+        "elapsed": round(elapsed, 6),
+    }
@@ -0,0 +1,204 @@
+import math
+import random
+import time
+
+from core.bitboard import popcount, iter_bits, board_geometry
+from core.game import OthelloGame, BLACK
+from algoritmos.parallel import get_pool
+
+PASS = -1
+DEFAULT_PLAYOUTS = 1000
+# Tablero por defecto; las partidas de otros tamanos pasan su geometria (mascaras, esquinas y casillas X)
+GEOMETRY_8 = board_geometry(8)
+
+
+def play(own, opp, sq, geometry=GEOMETRY_8):
+    # Posicion tras la jugada, otra vez desde el punto de vista de quien queda al turno
+    if sq == PASS:
+        return opp, own
+    f = geometry.flips(own, opp, sq)
+    return opp ^ f, own | f | (1 << sq)
+
+
+class Node:
+    __slots__ = ("own", "opp", "move", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, own, opp, move=None, parent=None, geometry=GEOMETRY_8):
+        self.own = own  # fichas del jugador al turno
+        self.opp = opp
+        self.move = move
+        self.parent = parent
+        self.children = []
+        legal_moves = geometry.legal_moves
+        moves = legal_moves(own, opp)
+        if moves:
+            self.untried = list(iter_bits(moves))
+        elif legal_moves(opp, own):
+            self.untried = [PASS]
+        else:
+            self.untried = []
+        self.visits = 0
+        self.wins = 0.0  # resultados para quien jugo `move`, es decir el rival del jugador al turno
+
+
+def rollout(own, opp, rng, heuristic=False, geometry=GEOMETRY_8):
+    # Partida hasta el final con jugadas al azar (o tomando esquinas y evitando casillas X con heuristic).
+    # Devuelve 1, 0.5 o 0 para el jugador al turno al empezar.
+    legal_moves, flips = geometry.legal_moves, geometry.flips
+    corners, x_squares = geometry.corners, geometry.x_squares
+    flipped_sides = False
+    passed = False
+    while True:
+        moves = legal_moves(own, opp)
+        if not moves:
+            if passed:
+                break
+            passed = True
+        else:
+            passed = False
+            if heuristic:
+                if moves & corners:
+                    moves &= corners
+                elif moves & ~x_squares:
+                    moves &= ~x_squares
+            squares = list(iter_bits(moves))
+            sq = squares[rng.randrange(len(squares))] if len(squares) > 1 else squares[0]
+            f = flips(own, opp, sq)
+            own, opp = own | f | (1 << sq), opp ^ f
+        own, opp = opp, own
+        flipped_sides = not flipped_sides
+    diff = popcount(own) - popcount(opp)
+    if flipped_sides:
+        diff = -diff
+    return 1.0 if diff > 0 else 0.0 if diff < 0 else 0.5
+
+
+class MCTSAgent:
+    def __init__(self, player=BLACK, time_limit=None, playouts=None, exploration=1.4, rollout="random",
+                 workers=1, reuse=True, seed=None):
+        self.player = player
+        # Presupuesto por jugada: time_limit en segundos y/o cantidad de partidas simuladas
+        self.time_limit = time_limit
+        self.playouts = playouts if playouts or time_limit else DEFAULT_PLAYOUTS
+        self.exploration = exploration
+        self.rollout = rollout
+        # Con workers > 1 se buscan arboles independientes en otros procesos y se suman las visitas de la raiz
+        self.workers = workers
+        # El subarbol de la jugada elegida se conserva para la jugada siguiente
+        self.reuse = reuse
+        self.rng = random.Random(seed if seed is not None else random.random())
+        self.nodes_expanded = 0
+        self.depth_reached = 0
+        self.reused_playouts = 0
+        self.name = "MCTSAgent"
+        self._root = None
+        self._cancelled = False
+        self._geometry = GEOMETRY_8
+
+    def search(self, root, time_limit=None, playouts=None):
+        # Iteraciones UCT sobre root hasta agotar el presupuesto
+        rng = self.rng
+        heuristic = self.rollout == "heuristic"
+        c = self.exploration
+        geometry = self._geometry
+        deadline = time.perf_counter() + time_limit if time_limit else None
+        done = 0
+        while ((playouts is None or done < playouts) and (deadline is None or time.perf_counter() < deadline)
+               and not self._cancelled):
+            node = root
+            depth = 0
+            while not node.untried and node.children:
+                log_n = math.log(node.visits)
+                node = max(node.children, key=lambda child: child.wins / child.visits
+                           + c * math.sqrt(log_n / child.visits))
+                depth += 1
+            if node.untried:
+                sq = node.untried.pop(rng.randrange(len(node.untried)))
+                child = Node(*play(node.own, node.opp, sq, geometry), sq, node, geometry)
+                node.children.append(child)
+                node = child
+                depth += 1
+            result = rollout(node.own, node.opp, rng, heuristic, geometry)
+            while node is not None:
+                node.visits += 1
+                node.wins += 1 - result
+                result = 1 - result
+                node = node.parent
+            done += 1
+            if depth > self.depth_reached:
+                self.depth_reached = depth
+        self.nodes_expanded += done
+        return done
+
+    def _find_root(self, own, opp):
+        # Busca la posicion actual entre el arbol guardado y las respuestas del rival
+        root = self._root
+        self._root = None
+        if root is None:
+            return None
+        for child in root.children:
+            if (child.own, child.opp) == (own, opp):
+                child.parent = None
+                return child
+        return None
+
+    def cancel(self):
+        # Puede llamarse desde otro hilo: la busqueda termina en la iteracion siguiente
+        self._cancelled = True
+
+    def get_move(self, game: OthelloGame):
+        self._cancelled = False
+        self.nodes_expanded = 0
+        self.depth_reached = 0
+        start_time = time.perf_counter()
+        own, opp = game._bitboards(self.player)
+        geometry = game.geometry
+        if geometry is not self._geometry:
+            self._geometry = geometry
+            self._root = None
+        if not geometry.legal_moves(own, opp):
+            self._root = None
+            return None, 0, time.perf_counter() - start_time
+
+        root = self._find_root(own, opp) if self.reuse else None
+        self.reused_playouts = root.visits if root is not None else 0
+        if root is None:
+            root = Node(own, opp, geometry=geometry)
+
+        visits = {}
+        if self.workers > 1:
+            # Paralelismo en la raiz: cada proceso hace su propio arbol con otra semilla y reparte las simulaciones
+            playouts = self.playouts // self.workers if self.playouts else None
+            pool = get_pool(self.workers - 1)
+            futures = [pool.submit(_root_search, game.size, own, opp, self.time_limit, playouts, self.exploration,
+                                   self.rollout, self.rng.random()) for _ in range(self.workers - 1)]
+            self.search(root, self.time_limit, playouts)
+            for future in futures:
+                stats, nodes = future.result()
+                self.nodes_expanded += nodes
+                for sq, n in stats.items():
+                    visits[sq] = visits.get(sq, 0) + n
+        else:
+            self.search(root, self.time_limit, self.playouts)
+
+        for child in root.children:
+            visits[child.move] = visits.get(child.move, 0) + child.visits
+        if not visits:
+            # Cancelada antes de la primera simulacion
+            return None, self.nodes_expanded, time.perf_counter() - start_time
+        # Jugada mas visitada; en empate, la de menor casilla para que el resultado sea reproducible
+        sq = max(sorted(visits), key=visits.get)
+        if self.reuse:
+            self._root = next((child for child in root.children if child.move == sq), None)
+            if self._root is not None:
+                self._root.parent = None
+        elapsed_time = time.perf_counter() - start_time
+        return geometry.coords[sq], self.nodes_expanded, elapsed_time
+
+
+def _root_search(size, own, opp, time_limit, playouts, exploration, rollout_kind, seed):
+    agent = MCTSAgent(exploration=exploration, rollout=rollout_kind, reuse=False, seed=seed)
+    agent._geometry = board_geometry(size)
+    root = Node(own, opp, geometry=agent._geometry)
+    agent.search(root, time_limit, playouts)
+    return {child.move: child.visits for child in root.children}, agent.nodes_expanded
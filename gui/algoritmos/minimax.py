@@ -1,20 +1,48 @@
-import time
 from math import inf
 from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.parallel import parallel_root_search
+from algoritmos.book import load_book
+from algoritmos.registry import lazy_evaluator
+from algoritmos.ponder import Ponderer
+from algoritmos.search import SearchDriver, CHECK_INTERVAL, check_deadline
 
-class MinimaxAgent:
-    def __init__(self, max_depth=3, player=BLACK):
+class MinimaxAgent(SearchDriver):
+    def __init__(self, max_depth=3, player=BLACK, time_limit=None, workers=1, book=None, evaluator=None, ponder=False):
         self.player = player
         self.max_depth = int(max_depth)
+        # Con time_limit (segundos) se usa profundizacion iterativa y max_depth es solo un tope (0 = sin tope)
+        self.time_limit = time_limit
+        # Con workers > 1 las jugadas de la raiz se reparten entre procesos
+        self.workers = workers
+        # Libro de aperturas (ruta o OpeningBook): si la posicion esta en el libro no se busca
+        self.book = load_book(book)
+        self.book_hit = False
+        self.book_hits = 0
+        # Funcion de evaluacion (None: diferencia de fichas; "pattern" o ruta: evaluacion por patrones)
+        self.evaluator_spec = evaluator
+        self.evaluator = lazy_evaluator(evaluator)
         self.nodes_expanded = 0
+        self.depth_reached = 0
         self.name = "MinimaxAgent"
+        self._deadline = None
+        self._root_move = None
+        self._cancelled = False
+        # Con ponder, ponder(game) busca en segundo plano mientras juega el rival (solo con workers=1)
+        if ponder and workers > 1:
+            raise ValueError("ponder requiere workers=1")
+        self.ponderer = Ponderer(self) if ponder else None
+        self.ponder_hit = False
 
     def evaluate(self, game: OthelloGame):
+        if self.evaluator is not None:
+            return self.evaluator(game, self.player)
         black, white = game.count_pieces()
         return black - white if self.player == BLACK else white - black
 
-    def minimax(self, game: OthelloGame, depth: int, maximizing_player: bool):
+    def minimax(self, game: OthelloGame, depth: int, maximizing_player: bool, ply: int = 0):
         self.nodes_expanded += 1
+        if self._deadline is not None and not self.nodes_expanded % CHECK_INTERVAL:
+            check_deadline(self._deadline)
 
         if depth == 0 or game.is_game_over():
             return self.evaluate(game), None
@@ -23,15 +51,20 @@ class MinimaxAgent:
         valid_moves = game.get_valid_moves(current_player)
 
         if not valid_moves:
-            return self.minimax(game, depth - 1, not maximizing_player)[0], None
+            return self.minimax(game, depth - 1, not maximizing_player, ply + 1)[0], None
+
+        if ply == 0 and self._root_move in valid_moves:
+            # La mejor jugada de la iteracion anterior se explora primero
+            valid_moves.remove(self._root_move)
+            valid_moves.insert(0, self._root_move)
 
         best_value = -inf if maximizing_player else inf
         best_move = None
 
         for move in valid_moves:
-            next_state = game.clone()
-            next_state.make_move(*move, current_player)
-            value, _ = self.minimax(next_state, depth - 1, not maximizing_player)
+            undo = game.make_move(*move, current_player)
+            value, _ = self.minimax(game, depth - 1, not maximizing_player, ply + 1)
+            game.unmake_move(undo)
 
             if maximizing_player:
                 if value > best_value:
@@ -44,9 +77,19 @@ class MinimaxAgent:
 
         return best_value, best_move
 
-    def get_move(self, game: OthelloGame):
-        self.nodes_expanded = 0
-        start_time = time.time()
-        _, move = self.minimax(game, self.max_depth, True)
-        elapsed_time = time.time() - start_time
-        return move, self.nodes_expanded, elapsed_time
\ No newline at end of file
+    def search_config(self):
+        return {"max_depth": self.max_depth, "player": self.player, "evaluator": self.evaluator_spec}
+
+    def child_value(self, game: OthelloGame, depth: int, alpha: float, beta: float):
+        # Valor de una posicion tras una jugada de la raiz (juega el rival); usado por los procesos auxiliares
+        return self.minimax(game, depth, False, 1)[0]
+
+    def search_root(self, game: OthelloGame, depth: int):
+        if self.workers > 1 and depth > 0:
+            moves = game.get_valid_moves(self.player)
+            if self._root_move in moves:
+                moves.remove(self._root_move)
+                moves.insert(0, self._root_move)
+            if len(moves) > 1:
+                return parallel_root_search(self, game, depth, moves, self._deadline)[1]
+        return self.minimax(game.clone(), depth, True)[1]
@@ -0,0 +1,79 @@
+from core.game import BLACK
+
+# Pesos estaticos por casilla: esquinas primero, casillas X y C (junto a las esquinas) al final
+SQUARE_WEIGHTS = [
+    [100, -20, 10,  5,  5, 10, -20, 100],
+    [-20, -50, -2, -2, -2, -2, -50, -20],
+    [ 10,  -2,  1,  1,  1,  1,  -2,  10],
+    [  5,  -2,  1,  0,  0,  1,  -2,   5],
+    [  5,  -2,  1,  0,  0,  1,  -2,   5],
+    [ 10,  -2,  1,  1,  1,  1,  -2,  10],
+    [-20, -50, -2, -2, -2, -2, -50, -20],
+    [100, -20, 10,  5,  5, 10, -20, 100],
+]
+
+
+def square_weights(size):
+    # Pesos para otros tamanos: bordes y esquinas como en 8x8 y el interior con los pesos del centro
+    if size == 8:
+        return SQUARE_WEIGHTS
+    index = [min(i, 3) if i < size // 2 else max(7 - (size - 1 - i), 4) for i in range(size)]
+    return [[SQUARE_WEIGHTS[i][j] for j in index] for i in index]
+
+
+HASH_MOVE_SCORE = 1 << 40
+KILLER_SCORE = 1 << 30
+
+
+class MoveOrderer:
+    def __init__(self, static=True, killers=True, history=True, size=8):
+        self.size = size
+        self.weights = square_weights(size)
+        self.use_static = static
+        self.use_killers = killers
+        self.use_history = history
+        self.killers = {}  # ply -> [jugada mas reciente, anterior]
+        self.history = ({}, {})  # por color: jugada -> puntaje acumulado de cortes
+
+    def resize(self, size):
+        # Las jugadas guardadas son de otro tablero: se descartan junto con los pesos
+        if size != self.size:
+            self.size = size
+            self.weights = square_weights(size)
+            self.killers = {}
+            self.history = ({}, {})
+
+    def new_search(self):
+        # Los killers dependen del arbol actual; el historial se conserva pero pierde peso
+        self.killers = {}
+        for table in self.history:
+            for move in table:
+                table[move] //= 2
+
+    def order(self, moves, player, ply, hash_move=None):
+        killers = self.killers.get(ply, ()) if self.use_killers else ()
+        history = self.history[player == BLACK] if self.use_history else {}
+        use_static = self.use_static
+        weights = self.weights
+
+        def score(move):
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+            value = history.get(move, 0)
+            if move in killers:
+                value += KILLER_SCORE - killers.index(move)
+            if use_static:
+                value += weights[move[0]][move[1]]
+            return value
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, move, player, ply, depth):
+        if self.use_killers:
+            killers = self.killers.setdefault(ply, [])
+            if move not in killers:
+                killers.insert(0, move)
+                del killers[2:]
+        if self.use_history:
+            table = self.history[player == BLACK]
+            table[move] = table.get(move, 0) + depth * depth
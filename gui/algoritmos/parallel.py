@@ -0,0 +1,131 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from math import inf
+
+from core.game import OthelloGame
+from algoritmos.search import SearchTimeout
+
+# Un pool por cantidad de procesos, reutilizado entre jugadas y agentes
+_POOLS = {}
+# Evento compartido con los procesos de cada pool: al activarlo, las busquedas en curso se cancelan
+_STOPS = {}
+# Cada cuantos segundos se revisa si hay que cancelar, en el proceso principal y en los auxiliares
+POLL_INTERVAL = 0.05
+
+_stop = None  # evento del pool, en cada proceso auxiliar
+
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def get_pool(workers):
+    pool = _POOLS.get(workers)
+    if pool is None:
+        stop = _STOPS[workers] = multiprocessing.Event()
+        pool = _POOLS[workers] = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                     initargs=(stop,))
+    return pool
+
+
+@atexit.register
+def shutdown_pools():
+    # Las tareas en cola ya se cancelan al terminar cada busqueda; el evento corta las que siguen corriendo
+    # (shutdown(cancel_futures=True) requiere Python 3.9)
+    for workers, pool in _POOLS.items():
+        _STOPS[workers].set()
+        pool.shutdown(wait=False)
+    _POOLS.clear()
+    _STOPS.clear()
+
+
+def _watch_stop(agent, finished):
+    # Hilo del proceso auxiliar: reenvia al agente la cancelacion pedida por el proceso principal
+    while not finished.wait(POLL_INTERVAL):
+        if _stop is not None and _stop.is_set():
+            agent.cancel()
+            return
+
+
+def _search_child(agent_class, config, size, black, white, player, move, depth, alpha, beta, time_left):
+    # Cada tarea usa un agente nuevo para que el resultado no dependa del orden de ejecucion.
+    # time_left: segundos restantes (None = sin limite); siempre hay deadline para que cancel() pueda cortarla.
+    agent = agent_class(**config)
+    game = OthelloGame(size)
+    game.set_bitboards(black, white)
+    game.make_move(*move, player)
+    agent._deadline = time.perf_counter() + time_left if time_left is not None else inf
+    finished = threading.Event()
+    threading.Thread(target=_watch_stop, args=(agent, finished), daemon=True).start()
+    try:
+        value = agent.child_value(game, depth - 1, alpha, beta)
+    finally:
+        finished.set()
+    return value, agent.nodes_expanded
+
+
+def _stop_workers(workers, futures):
+    # Cancela las tareas en cola y corta las que estan corriendo; el evento se limpia cuando todas terminaron
+    for future in futures:
+        future.cancel()
+    stop = _STOPS[workers]
+    stop.set()
+    try:
+        wait(futures)
+    finally:
+        stop.clear()
+
+
+def parallel_root_search(agent, game, depth, moves, deadline=None, split_first=False):
+    # Reparte las jugadas de la raiz entre procesos. Con split_first (alfa-beta) la primera jugada
+    # se busca sola para fijar alfa y el resto en paralelo con esa cota (Young Brothers Wait).
+    # El mejor valor se elige en el orden de `moves`, por lo que el resultado es determinista.
+    # Sin tiempo restante o con el agente cancelado se lanza SearchTimeout, como en la busqueda en serie.
+    pool = get_pool(agent.workers)
+    config = agent.search_config()
+    args = (type(agent), config, game.size, game.black, game.white, agent.player)
+
+    def time_left():
+        if deadline is None:
+            return None
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise SearchTimeout()
+        return remaining
+
+    def result(future, futures):
+        # wait con timeout en vez de future.result(timeout): antes de 3.11 su TimeoutError no es el de builtins
+        while not wait([future], timeout=POLL_INTERVAL).done:
+            if agent._cancelled:
+                _stop_workers(agent.workers, futures)
+                raise SearchTimeout()
+        return future.result()
+
+    best_value, best_move = -inf, None
+    alpha = -inf
+    pending = list(moves)
+    if split_first:
+        first = pending.pop(0)
+        future = pool.submit(_search_child, *args, first, depth, -inf, inf, time_left())
+        best_value, nodes = result(future, [future])
+        best_move = first
+        alpha = best_value
+        agent.nodes_expanded += nodes
+
+    remaining = time_left()
+    futures = [pool.submit(_search_child, *args, move, depth, alpha, inf, remaining) for move in pending]
+    try:
+        for move, future in zip(pending, futures):
+            value, nodes = result(future, futures)
+            agent.nodes_expanded += nodes
+            if value > best_value:
+                best_value, best_move = value, move
+    finally:
+        for future in futures:
+            future.cancel()
+    agent.nodes_expanded += 1
+    return best_value, best_move
@@ -0,0 +1,94 @@
+import threading
+from math import inf
+
+from core.game import WHITE
+from core.zobrist import ZOBRIST_TURN
+from algoritmos.search import SearchTimeout, empty_squares
+
+
+class Ponderer:
+    # Busqueda especulativa mientras piensa el rival: para cada respuesta posible (primero la que predice la tabla
+    # de transposicion) se busca la jugada propia con profundidad creciente. Usa el mismo agente, asi que la tabla
+    # y el orden de jugadas quedan cargados; get_move la detiene antes de buscar y consulta `result`.
+    def __init__(self, agent):
+        self.agent = agent
+        self.results = {}  # hash de la posicion (con el agente al turno) -> (jugada, profundidad)
+        self.nodes = 0
+        self._thread = None
+        self._stopped = True
+        self._lock = threading.Lock()
+
+    def start(self, game):
+        # game: posicion despues de la jugada propia, con el rival al turno
+        self.stop()
+        self.results = {}
+        self.nodes = 0
+        agent = self.agent
+        if game.is_game_over() or empty_squares(game) - 1 <= getattr(agent, "endgame_empties", 0):
+            return  # en el final el solucionador exacto es rapido por si solo
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, args=(game.clone(),), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        with self._lock:
+            self._stopped = True
+            self.agent._deadline = -inf
+        self._thread.join()
+        self._thread = None
+        self.agent._deadline = None
+        self.agent._root_move = None
+
+    def result(self, game):
+        # (jugada, profundidad) ya buscada para esta posicion, o None
+        if game.current_player != self.agent.player:
+            return None
+        entry = self.results.get(game.hash)
+        return entry if entry is not None and entry[0] is not None else None
+
+    def _replies(self, game):
+        agent = self.agent
+        opponent = game.current_player
+        moves = game.get_valid_moves(opponent)
+        if not moves:
+            child = game.clone()
+            child.current_player = agent.player
+            return [child]
+        tt = getattr(agent, "tt", None)
+        if tt is not None:
+            entry = tt.probe(game.hash ^ ZOBRIST_TURN if opponent == WHITE else game.hash)
+            if entry is not None and entry[4] in moves:
+                moves.remove(entry[4])
+                moves.insert(0, entry[4])
+        children = []
+        for move in moves:
+            child = game.clone()
+            child.make_move(*move, opponent)
+            if child.legal_mask(agent.player):
+                children.append(child)
+        return children
+
+    def _run(self, game):
+        agent = self.agent
+        agent.nodes_expanded = 0
+        children = self._replies(game)
+        limit = empty_squares(game) - 1
+        if agent.max_depth > 0:
+            limit = min(limit, agent.max_depth)
+        try:
+            # Todas las respuestas a cada profundidad antes de pasar a la siguiente
+            for depth in range(1, limit + 1):
+                for child in children:
+                    with self._lock:
+                        if self._stopped:
+                            return
+                        agent._deadline = inf
+                    previous = self.results.get(child.hash)
+                    agent._root_move = previous[0] if previous else None
+                    self.results[child.hash] = (agent.search_root(child, depth), depth)
+        except SearchTimeout:
+            pass
+        finally:
+            self.nodes = agent.nodes_expanded
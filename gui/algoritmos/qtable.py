@@ -0,0 +1,262 @@
+import sys
+import mmap
+import pickle
+import struct
+import tracemalloc
+import random
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+from core.bitboard import canonical, SYMMETRY_SQUARES
+
+# Valores Q por estado: un arreglo float32 con una entrada por casilla
+EMPTY_VALUES = array('f', bytes(4 * 64))
+
+
+def state_key(black, white, to_move_black, geometry=None):
+    # Clave entera de la posicion canonica (128 bits de fichas + 1 bit de turno)
+    # y la tabla que lleva cada casilla real a la casilla canonica.
+    # Con la geometria de otro tamano la clave usa 2 * size * size bits de fichas.
+    if geometry is None:
+        key, symmetry = canonical(black, white)
+        return (key << 1) | (not to_move_black), SYMMETRY_SQUARES[symmetry]
+    key, symmetry = geometry.canonical(black, white)
+    return (key << 1) | (not to_move_black), geometry.symmetry_squares[symmetry]
+
+
+class QTable:
+    def __init__(self, squares=64):
+        self.states = {}
+        self.squares = squares
+        self.empty = EMPTY_VALUES if squares == 64 else array('f', bytes(4 * squares))
+
+    def __len__(self):
+        return len(self.states)
+
+    def get(self, key, sq):
+        # Consulta sin insertar: un estado no visto vale 0
+        values = self.states.get(key)
+        return values[sq] if values is not None else 0.0
+
+    def values(self, key):
+        return self.states.get(key, self.empty)
+
+    def set(self, key, sq, value):
+        values = self.states.get(key)
+        if values is None:
+            values = self.states[key] = array('f', self.empty)
+        values[sq] = value
+
+    def items(self):
+        return self.states.items()
+
+    def memory_bytes(self):
+        total = sys.getsizeof(self.states)
+        for key, values in self.states.items():
+            total += sys.getsizeof(key) + sys.getsizeof(values)
+        return total
+
+
+# Formato binario: cabecera fija, claves ordenadas en tres columnas uint64 (turno, negras, blancas de la posicion
+# canonica) y un bloque float32 de 64 valores por estado. Todo en little-endian para poder mapearlo con mmap.
+MAGIC = b"OTHQTBL\0"
+VERSION = 2
+HEADER = struct.Struct("<8sIIQ40x")  # magic, version, valores por estado, cantidad de estados
+MASK_64 = (1 << 64) - 1
+
+
+def split_key(key):
+    # (turno, negras, blancas) de una clave de state_key: (posicion canonica << 1) | turno
+    board = key >> 1
+    return key & 1, board >> 64, board & MASK_64
+
+
+def join_key(turn, black, white):
+    return (((black << 64) | white) << 1) | turn
+
+
+def save_binary(table, path):
+    if getattr(table, "squares", 64) != 64:
+        raise ValueError("el formato binario es solo para tablas de 8x8; usar pickle")
+    keys = sorted((split_key(key) for key, _ in table.items()))
+    count = len(keys)
+    columns = [np.array(column, dtype="<u8") for column in zip(*keys)] if keys else [np.zeros(0, "<u8")] * 3
+    values = np.zeros((count, 64), dtype="<f4")
+    for row, parts in enumerate(keys):
+        values[row] = table.values(join_key(*parts))
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 64, count))
+        for column in (*columns, values):
+            f.write(column.tobytes())
+
+
+def is_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class MappedQTable:
+    # Tabla de solo lectura mapeada en memoria; las actualizaciones van a un diccionario aparte
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or width != 64:
+            raise ValueError(f"{path}: formato de tabla Q no soportado")
+        if version != VERSION:
+            raise ValueError(f"{path}: tabla Q de la version {version} del formato (se lee la {VERSION}); "
+                             "volver a guardarla desde el pickle con convert")
+        offset = HEADER.size
+        columns = []
+        for _ in range(3):
+            columns.append(np.frombuffer(self._mmap, dtype="<u8", count=count, offset=offset))
+            offset += 8 * count
+        values = np.frombuffer(self._mmap, dtype="<f4", count=64 * count, offset=offset).reshape(count, 64)
+        self._turn, self._black, self._white = columns
+        self._values = values
+        self._split = int(np.searchsorted(self._turn, 1))  # las claves con turno 0 (negras) van primero
+        self.count = count
+        self.squares = 64
+        self.states = {}
+        self._added = 0  # estados del diccionario que no estan en el archivo
+
+    def __len__(self):
+        return self.count + self._added
+
+    def _find(self, key):
+        turn, black, white = split_key(key)
+        start, end = (0, self._split) if turn == 0 else (self._split, self.count)
+        blacks = self._black[start:end]
+        low = int(np.searchsorted(blacks, black, "left"))
+        high = int(np.searchsorted(blacks, black, "right"))
+        if low == high:
+            return -1
+        row = low + int(np.searchsorted(self._white[start + low:start + high], white))
+        if row < high and self._white[start + row] == white:
+            return start + row
+        return -1
+
+    def get(self, key, sq):
+        return self.values(key)[sq]
+
+    def values(self, key):
+        values = self.states.get(key)
+        if values is not None:
+            return values
+        row = self._find(key)
+        return self._values[row] if row >= 0 else EMPTY_VALUES
+
+    def set(self, key, sq, value):
+        values = self.states.get(key)
+        if values is None:
+            row = self._find(key)
+            if row < 0:
+                self._added += 1
+                values = array('f', EMPTY_VALUES)
+            else:
+                values = array('f', self._values[row].tobytes())
+            self.states[key] = values
+        values[sq] = value
+
+    def items(self):
+        for row in range(self.count):
+            key = join_key(int(self._turn[row]), int(self._black[row]), int(self._white[row]))
+            if key not in self.states:
+                yield key, self._values[row]
+        yield from self.states.items()
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        states = pickle.load(f)
+    if states and isinstance(next(iter(states)), tuple):
+        # Archivo del formato anterior con claves (texto, jugada)
+        return from_legacy(states)
+    # El tamano del tablero sale de la cantidad de valores por estado
+    table = QTable(len(next(iter(states.values()))) if states else 64)
+    table.states = states
+    return table
+
+
+def load_table(path):
+    return MappedQTable(path) if is_binary(path) else load_pickle(path)
+
+
+def convert(source, target):
+    table = load_pickle(source)
+    save_binary(table, target)
+    return len(table)
+
+
+def from_legacy(legacy):
+    # Convierte el formato anterior {(tablero de 65 caracteres, (x, y)): valor}
+    table = QTable()
+    for (state, (x, y)), value in legacy.items():
+        if not value:
+            continue  # entradas creadas solo por consultar
+        black = white = 0
+        for sq, cell in enumerate(state[:64]):
+            if cell == 'B':
+                black |= 1 << sq
+            elif cell == 'W':
+                white |= 1 << sq
+        key, squares = state_key(black, white, state[64] == 'B')
+        sq = squares[x * 8 + y]
+        # Posiciones simetricas del formato anterior se fusionan conservando el valor de mayor magnitud
+        if abs(value) >= abs(table.get(key, sq)):
+            table.set(key, sq, value)
+    return table
+
+
+def _random_position(rng):
+    black = white = 0
+    for sq in range(64):
+        r = rng.random()
+        if r < 0.3:
+            black |= 1 << sq
+        elif r < 0.6:
+            white |= 1 << sq
+    return black, white
+
+
+def measure_footprint(states=20000, actions_per_state=8, seed=0):
+    # Bytes por millon de estados: dict de tuplas (texto, jugada) contra QTable compacta
+    rng = random.Random(seed)
+    positions = [_random_position(rng) for _ in range(states)]
+    actions = [[divmod(rng.randrange(64), 8) for _ in range(actions_per_state)] for _ in positions]
+
+    tracemalloc.start()
+    legacy = defaultdict(float)
+    for (black, white), moves in zip(positions, actions):
+        text = ''.join('B' if black >> sq & 1 else 'W' if white >> sq & 1 else '.' for sq in range(64)) + 'B'
+        for move in moves:
+            legacy[(text, (move[0], move[1]))] = rng.random()
+    legacy_bytes = tracemalloc.get_traced_memory()[0]
+    del legacy
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = QTable()
+    for (black, white), moves in zip(positions, actions):
+        key, squares = state_key(black, white, True)
+        for x, y in moves:
+            table.set(key, squares[x * 8 + y], rng.random())
+    compact_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    scale = 1_000_000 / states
+    return legacy_bytes * scale, compact_bytes * scale
+
+
+if __name__ == "__main__":
+    # python -m algoritmos.qtable convert q_agent.pkl q_agent.qtb
+    # python -m algoritmos.qtable footprint
+    if len(sys.argv) == 4 and sys.argv[1] == "convert":
+        print(f"{convert(sys.argv[2], sys.argv[3])} estados escritos en {sys.argv[3]}")
+    else:
+        legacy_bytes, compact_bytes = measure_footprint()
+        print(f"Formato anterior: {legacy_bytes / 2 ** 20:.0f} MiB por millon de estados")
+        print(f"QTable compacta:  {compact_bytes / 2 ** 20:.0f} MiB por millon de estados")
+        print("(sin contar la reduccion adicional por simetrias, hasta 8 estados por entrada)")
@@ -0,0 +1,53 @@
+import importlib
+import os
+import threading
+
+# Tipo de agente -> (modulo, clase). El modulo se importa recien cuando se crea el primer agente de ese tipo.
+AGENTS = {
+    "minimax": ("algoritmos.minimax", "MinimaxAgent"),
+    "alphabeta": ("algoritmos.alphabeta", "AlphaBetaAgent"),
+    "rl": ("algoritmos.reinforcement", "QLearningAgent"),
+    "mcts": ("algoritmos.mcts", "MCTSAgent"),
+    "humano": ("algoritmos.humano", "HumanoAgent"),
+}
+
+# Modelos cargados en este proceso: (cargador, ruta absoluta) -> (mtime, tamano, modelo)
+_MODELS = {}
+_LOCK = threading.Lock()
+
+
+def agent_class(kind):
+    module, name = AGENTS[kind]
+    return getattr(importlib.import_module(module), name)
+
+
+def create_agent(kind, player, **params):
+    return agent_class(kind)(player=player, **params)
+
+
+def cached_model(path, loader):
+    # Un mismo archivo se carga una vez por proceso; si cambia en disco (mtime o tamano) se vuelve a cargar.
+    # El modelo es compartido: quien lo vaya a modificar debe cargar su propia copia.
+    stat = os.stat(path)
+    key = (loader, os.path.abspath(path))
+    with _LOCK:
+        entry = _MODELS.get(key)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+    model = loader(path)
+    with _LOCK:
+        _MODELS[key] = (stat.st_mtime_ns, stat.st_size, model)
+    return model
+
+
+def lazy_evaluator(spec):
+    # La evaluacion por patrones o por modelo (y con ella NumPy) se importa solo si algun agente la pide
+    if spec is None:
+        return None
+    from algoritmos.evaluation import get_evaluator
+    return get_evaluator(spec)
+
+
+def clear_models():
+    with _LOCK:
+        _MODELS.clear()
@@ -1,76 +1,221 @@
 import time
 import random
 import pickle
-from collections import defaultdict
+from array import array
+import numpy as np
 from core.game import OthelloGame, BLACK, WHITE
+from core.bitboard import legal_moves, iter_bits, board_geometry
+from core.vector_env import VectorOthelloEnv, legal_masks, unpack
+from algoritmos.qtable import QTable, state_key, load_table, save_binary
+from algoritmos.training_log import TrainingLog, SUMMARY
+from algoritmos.registry import cached_model
 
 class QLearningAgent:
-    def __init__(self, player=BLACK, alpha=0.1, gamma=0.9, epsilon=0.2):
+    def __init__(self, player=BLACK, alpha=0.1, gamma=0.9, epsilon=0.2, size=8):
         self.player = player
         self.alpha = alpha    
         self.gamma = gamma     
         self.epsilon = epsilon  
-        self.q_table = defaultdict(float)
+        # Tamano del tablero en el que juega y entrena: la tabla Q tiene un valor por casilla
+        self.size = size
+        self.geometry = board_geometry(size)
+        # Estados canonicos por simetria -> valores Q por casilla
+        self.q_table = QTable(size * size)
         self.name = "RLAgent"
 
     def get_state_key(self, game):
-        return ''.join([''.join(row) for row in game.board]) + game.current_player
+        # (clave entera canonica, casilla real -> casilla canonica)
+        return state_key(game.black, game.white, game.current_player == BLACK, self.geometry)
+
+    def get_state_keys(self, black, white, to_move):
+        # Misma clave que get_state_key para un lote de bitboards (arrays uint64)
+        return [state_key(int(b), int(w), bool(t)) for b, w, t in zip(black, white, to_move)]
 
     def get_valid_actions(self, game):
         return game.get_valid_moves(self.player)
 
+    def select_action(self, state, actions):
+        if random.random() < self.epsilon:
+            return random.choice(actions)
+
+        key, squares = state
+        values = self.q_table.values(key)
+        size = self.size
+        q_values = [values[squares[x * size + y]] for x, y in actions]
+        max_q = max(q_values)
+        best_actions = [a for a, q in zip(actions, q_values) if q == max_q]
+        return random.choice(best_actions)
+
     def choose_action(self, game):
-        state = self.get_state_key(game)
         actions = self.get_valid_actions(game)
 
         if not actions:
             return None
 
-        if random.random() < self.epsilon:
-            return random.choice(actions)
+        return self.select_action(self.get_state_key(game), actions)
 
-        q_values = [self.q_table[(state, action)] for action in actions]
-        max_q = max(q_values)
-        best_actions = [a for a, q in zip(actions, q_values) if q == max_q]
-        return random.choice(best_actions)
+    def update(self, state, action, reward, new_state, new_actions):
+        key, squares = state
+        new_key, new_squares = new_state
+        new_values = self.q_table.values(new_key)
+        size = self.size
+        max_future_q = max((new_values[new_squares[x * size + y]] for x, y in new_actions), default=0.0)
+
+        sq = squares[action[0] * size + action[1]]
+        old_q = self.q_table.get(key, sq)
+        self.q_table.set(key, sq, old_q + self.alpha * (reward + self.gamma * max_future_q - old_q))
 
     def learn(self, old_game, action, reward, new_game):
-        old_state = self.get_state_key(old_game)
-        new_state = self.get_state_key(new_game)
-        future_qs = [self.q_table[(new_state, a)] for a in self.get_valid_actions(new_game)]
-        max_future_q = max(future_qs, default=0.0)
+        self.update(self.get_state_key(old_game), action, reward,
+                    self.get_state_key(new_game), self.get_valid_actions(new_game))
 
-        old_q = self.q_table[(old_state, action)]
-        self.q_table[(old_state, action)] = old_q + self.alpha * (reward + self.gamma * max_future_q - old_q)
+    def learn_replay(self, buffer, batch_size=32):
+        # Actualizaciones Q sobre un minilote de algoritmos.replay.ReplayBuffer. El valor futuro es el maximo sobre
+        # las jugadas de quien movio, en la posicion siguiente; con prioridades, el paso se escala por el peso de importancia.
+        if not len(buffer):
+            return
+        indices, columns, weights = buffer.sample(batch_size)
+        errors = []
+        for j, (black, white, to_move, sq, reward, next_black, next_white, next_to_move, done) in enumerate(zip(*columns)):
+            key, squares = state_key(black, white, to_move)
+            max_future_q = 0.0
+            if not done:
+                own, opp = (next_black, next_white) if to_move else (next_white, next_black)
+                new_key, new_squares = state_key(next_black, next_white, next_to_move)
+                new_values = self.q_table.values(new_key)
+                max_future_q = max((new_values[new_squares[s]] for s in iter_bits(legal_moves(own, opp))), default=0.0)
+            sq = squares[sq]
+            old_q = self.q_table.get(key, sq)
+            error = reward + self.gamma * max_future_q - old_q
+            step = self.alpha * (weights[j] if weights is not None else 1.0)
+            self.q_table.set(key, sq, old_q + step * error)
+            errors.append(error)
+        if buffer.prioritized:
+            buffer.update_priorities(indices, errors)
 
-    def train(self, episodes=1000, log_file="training_log.txt"):
-        with open(log_file, 'w') as f:  #para mostrar el entrenamiento del agente
+    def train(self, episodes=1000, log_file="training_log.txt", batch_size=1, verbosity=SUMMARY, records_file=None,
+              summary_every=100, replay=None, replay_batch=32):
+        # verbosity: training_log.QUIET, SUMMARY, EPISODE o MOVES (texto por jugada, el formato original).
+        # records_file: registros binarios comprimidos por episodio, legibles con training_log.read_records.
+        # replay: ReplayBuffer donde se guarda cada transicion; tras cada jugada se repasa un minilote de replay_batch.
+        # Como en replay.record_transitions, la posicion siguiente es la proxima en la que vuelve a mover el agente
+        # (o la final, con la recompensa de la partida): solo esas claves estan en la tabla Q
+        if replay is not None and self.size != 8:
+            raise ValueError("el buffer de repeticion guarda tableros de 8x8")
+        if batch_size > 1:
+            return self.train_batched(episodes, batch_size, log_file, verbosity=verbosity,
+                                      records_file=records_file, summary_every=summary_every,
+                                      replay=replay, replay_batch=replay_batch)
+        with TrainingLog(log_file, verbosity, records_file, summary_every) as log:  #para mostrar el entrenamiento del agente
+            moves = log.moves
+            agent_black = self.player == BLACK
             for ep in range(episodes):
-                game = OthelloGame()
-                f.write(f"=== Episodio {ep+1} ===\n")
+                game = OthelloGame(self.size)
+                pending = None  # (negras, blancas, turno, casilla) de la ultima jugada del agente
                 while not game.is_game_over():
                     state = game.clone()
                     if game.current_player == self.player:
                         action = self.choose_action(game)
                         if action:
+                            if replay is not None and pending is not None:
+                                replay.add(*pending, 0, game.black, game.white, agent_black, False)
+                                self.learn_replay(replay, replay_batch)
                             game.make_move(*action, self.player)
                             reward = self.get_reward(game)
                             self.learn(state, action, reward, game)
-                            f.write(f"Jugador RL ({self.player}) hizo movimiento: {action}\n")
+                            pending = (state.black, state.white, agent_black, action[0] * 8 + action[1])
+                            if moves:
+                                log.move(f"Jugador RL ({self.player}) hizo movimiento: {action}")
                         else:
-                            f.write("Jugador RL sin movimientos válidos\n")
+                            if moves:
+                                log.move("Jugador RL sin movimientos válidos")
                             break
                     else:
                         enemy_moves = game.get_valid_moves(game.current_player)
                         if enemy_moves:
                             move = random.choice(enemy_moves)
                             game.make_move(*move, game.current_player)
-                            f.write(f"Jugador rival ({game.current_player}) hizo movimiento: {move}\n")
+                            if moves:
+                                log.move(f"Jugador rival ({game.current_player}) hizo movimiento: {move}")
                         else:
-                            f.write(f"Jugador rival ({game.current_player}) sin movimientos válidos\n")
+                            if moves:
+                                log.move(f"Jugador rival ({game.current_player}) sin movimientos válidos")
                             break
+                if replay is not None and pending is not None:
+                    replay.add(*pending, self.get_reward(game), game.black, game.white, agent_black, True)
+                    self.learn_replay(replay, replay_batch)
                 black, white = game.count_pieces()
-                f.write(f"Resultado final: BLACK={black}, WHITE={white}\n\n")
+                log.episode(black + white - 4, self.get_reward(game), self.epsilon, len(self.q_table), black, white)
+
+    def train_batched(self, episodes=1000, batch_size=64, log_file="training_log.txt", seed=None, verbosity=SUMMARY,
+                      records_file=None, summary_every=100, replay=None, replay_batch=32):
+        # Entrena contra un rival aleatorio con `batch_size` partidas avanzando a la vez en un entorno NumPy.
+        # Con replay, como en train: cada transicion del agente se guarda (hasta su proxima jugada o el final)
+        # y se repasa un minilote por cada una
+        if self.size != 8:
+            raise ValueError("el entrenamiento por lotes usa tableros de 8x8 (uint64)")
+        env = VectorOthelloEnv(batch_size, seed)
+        agent_black = self.player == BLACK
+        active = np.arange(batch_size) < episodes
+        env.done[~active] = True
+        started = int(active.sum())
+        finished = 0
+        pending = {}  # partida -> (negras, blancas, turno, casilla) de la ultima jugada del agente, para replay
+
+        # Las partidas por lotes no registran jugadas: con MOVES se registra lo mismo que con EPISODE
+        with TrainingLog(log_file, verbosity, records_file, summary_every) as log:
+            while finished < episodes:
+                legal = env.legal_moves()
+                actions = env.random_actions(legal)
+                agent_turn = np.flatnonzero(active & ~env.done & (env.to_move == agent_black) & legal.any(axis=1))
+                old_black, old_white = env.black[agent_turn], env.white[agent_turn]
+                states = self.get_state_keys(old_black, old_white, env.to_move[agent_turn])
+                if replay is not None:
+                    for i in agent_turn:
+                        if i in pending:
+                            replay.add(*pending.pop(i), 0, int(env.black[i]), int(env.white[i]), agent_black, False)
+                            self.learn_replay(replay, replay_batch)
+
+                for i, state in zip(agent_turn, states):
+                    moves = [divmod(int(sq), 8) for sq in np.flatnonzero(legal[i])]
+                    action = self.select_action(state, moves)
+                    actions[i] = action[0] * 8 + action[1]
+
+                env.step(actions)
+
+                # Actualizacion Q de todas las partidas en las que jugo el agente
+                if len(agent_turn):
+                    rewards = env.rewards(agent_black)[agent_turn]
+                    black, white = env.black[agent_turn], env.white[agent_turn]
+                    own, opp = (black, white) if agent_black else (white, black)
+                    future_moves = unpack(legal_masks(own, opp))
+                    new_states = self.get_state_keys(black, white, env.to_move[agent_turn])
+                    for j, i in enumerate(agent_turn):
+                        future_actions = [divmod(int(sq), 8) for sq in np.flatnonzero(future_moves[j])]
+                        self.update(states[j], divmod(int(actions[i]), 8), float(rewards[j]),
+                                    new_states[j], future_actions)
+                    if replay is not None:
+                        for j, i in enumerate(agent_turn):
+                            pending[i] = (int(old_black[j]), int(old_white[j]), agent_black, int(actions[i]))
+
+                ended = np.flatnonzero(active & env.done)
+                if len(ended):
+                    black_counts, white_counts = env.counts()
+                    final_rewards = env.rewards(agent_black)
+                    for i in ended:
+                        if i in pending:
+                            replay.add(*pending.pop(i), int(final_rewards[i]), int(env.black[i]), int(env.white[i]),
+                                       agent_black, True)
+                            self.learn_replay(replay, replay_batch)
+                        finished += 1
+                        black, white = int(black_counts[i]), int(white_counts[i])
+                        log.episode(black + white - 4, int(final_rewards[i]), self.epsilon, len(self.q_table),
+                                    black, white)
+                    restart = ended[:max(0, episodes - started)]
+                    started += len(restart)
+                    active[ended] = False
+                    active[restart] = True
+                    env.reset(restart)
 
     def get_reward(self, game):
         black, white = game.count_pieces()
@@ -82,15 +227,28 @@ class QLearningAgent:
         return 0
 
     def save(self, path):
+        # .qtb: formato binario mapeable en memoria; cualquier otra extension usa pickle
+        if path.endswith(".qtb"):
+            save_binary(self.q_table, path)
+            return
+        if not isinstance(self.q_table, QTable):
+            table = QTable()
+            table.states = {key: array('f', values) for key, values in self.q_table.items()}
+            self.q_table = table
         with open(path, 'wb') as f:
-            pickle.dump(dict(self.q_table), f)
+            pickle.dump(self.q_table.states, f)
 
-    def load(self, path):
-        with open(path, 'rb') as f:
-            self.q_table = defaultdict(float, pickle.load(f))
+    def load(self, path, shared=False):
+        # shared: tabla cargada una vez por proceso y compartida entre agentes (solo para jugar, no para entrenar)
+        table = cached_model(path, load_table) if shared else load_table(path)
+        if table.squares != self.size * self.size:
+            raise ValueError(f"{path}: la tabla Q es de otro tamano de tablero")
+        self.q_table = table
 
 
     def get_move(self, game):
+        if game.size != self.size:
+            raise ValueError(f"agente Q de {self.size}x{self.size} en un tablero de {game.size}x{game.size}")
         self.nodes_expanded = 0
         start = time.perf_counter()
         action = self.choose_action(game)
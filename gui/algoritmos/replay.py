@@ -0,0 +1,202 @@
+import argparse
+import json
+import random
+
+import numpy as np
+
+from core.game import OthelloGame, BLACK, WHITE
+
+# Columnas de cada transicion, desde el punto de vista de quien mueve en `black, white`:
+# posicion, turno (True = negras), casilla jugada, recompensa, posicion siguiente en la que vuelve a mover
+# (o la final), turno en esa posicion y si la partida termino
+FIELDS = [("black", np.uint64), ("white", np.uint64), ("to_move", np.bool_), ("action", np.uint8),
+          ("reward", np.float32), ("next_black", np.uint64), ("next_white", np.uint64),
+          ("next_to_move", np.bool_), ("done", np.bool_)]
+
+
+class ReplayBuffer:
+    # Buffer circular de tamano fijo sobre arreglos NumPy: al llenarse, cada transicion nueva reemplaza a la mas vieja.
+    # Con prioritized se muestrea proporcional a |error TD| ** alpha y se devuelven pesos de importancia ** beta.
+    def __init__(self, capacity=100000, prioritized=False, alpha=0.6, beta=0.4, seed=None):
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+        self.rng = np.random.default_rng(seed)
+        self.columns = [np.zeros(capacity, dtype=dtype) for _, dtype in FIELDS]
+        self.priorities = np.zeros(capacity, dtype=np.float64)
+        self.max_priority = 1.0
+        self.size = 0
+        self.next = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, black, white, to_move, action, reward, next_black, next_white, next_to_move, done):
+        i = self.next
+        for column, value in zip(self.columns, (black, white, to_move, action, reward, next_black, next_white,
+                                                next_to_move, done)):
+            column[i] = value
+        # Una transicion nueva se muestrea al menos una vez con la prioridad mas alta vista
+        self.priorities[i] = self.max_priority
+        self.next = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        # Devuelve (indices, columnas como listas de Python, pesos de importancia o None si es uniforme)
+        if not self.prioritized:
+            indices = self.rng.integers(0, self.size, batch_size)
+            weights = None
+        else:
+            p = self.priorities[:self.size] ** self.alpha
+            cumulative = np.cumsum(p)
+            indices = np.searchsorted(cumulative, self.rng.random(batch_size) * cumulative[-1], side="right")
+            indices = np.minimum(indices, self.size - 1)
+            weights = (self.size * p[indices] / cumulative[-1]) ** -self.beta
+            weights = (weights / weights.max()).tolist()
+        return indices, [column[indices].tolist() for column in self.columns], weights
+
+    def update_priorities(self, indices, errors):
+        priorities = np.abs(errors) + 1e-3
+        self.priorities[indices] = priorities
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+
+def record_moves(record):
+    # Jugadas de un registro de partida: apertura [[x, y], ...] y jugadas de metrics.play_game [[jugador, x, y], ...]
+    return [tuple(m) for m in record.get("opening", [])] + [tuple(m[-2:]) for m in record.get("moves", [])]
+
+
+def record_transitions(record):
+    # Transiciones de ambos colores de una partida registrada. La siguiente posicion de cada jugada es la proxima
+    # en la que el mismo jugador vuelve a mover; la ultima jugada de cada uno lleva el resultado final (+1/0/-1).
+    game = OthelloGame()
+    steps = []
+    for x, y in record_moves(record):
+        if not game.legal_mask(game.current_player):
+            game.current_player = game.opponent(game.current_player)
+        player = game.current_player
+        steps.append((game.black, game.white, player, x * 8 + y))
+        if not game.make_move(x, y, player):
+            raise ValueError(f"jugada ilegal {[x, y]} en la jugada {len(steps)}")
+    diff = game.black_count - game.white_count
+    final = {BLACK: (diff > 0) - (diff < 0), WHITE: (diff < 0) - (diff > 0)}
+    following = {}
+    transitions = []
+    for black, white, player, sq in reversed(steps):
+        after = following.get(player)
+        if after is None:
+            transitions.append((black, white, player == BLACK, sq, final[player], game.black, game.white,
+                                player == BLACK, True))
+        else:
+            transitions.append((black, white, player == BLACK, sq, 0, after[0], after[1], player == BLACK, False))
+        following[player] = (black, white)
+    transitions.reverse()
+    return transitions
+
+
+def iter_records(paths):
+    # Lee los archivos JSONL linea por linea: la base de partidas nunca se carga entera en memoria
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # linea cortada por una interrupcion
+                if "moves" in record:
+                    yield record
+
+
+def train_offline(agent, paths, buffer=None, batch_size=64, updates_per_game=16, passes=1):
+    # Q-learning sin jugar partidas: cada partida registrada se agrega al buffer y se hacen minilotes de actualizaciones
+    buffer = buffer if buffer is not None else ReplayBuffer()
+    games = 0
+    for _ in range(passes):
+        for record in iter_records(paths):
+            try:
+                transitions = record_transitions(record)
+            except ValueError:
+                continue
+            for transition in transitions:
+                buffer.add(*transition)
+            games += 1
+            for _ in range(updates_per_game):
+                agent.learn_replay(buffer, batch_size)
+    return games
+
+
+def self_play(path, games=100, depth=2, opening_plies=6, seed=0):
+    # Partidas de AlphaBeta contra si mismo desde aperturas al azar, en el formato de registros del torneo
+    from algoritmos.alphabeta import AlphaBetaAgent
+    from metrics import play_game
+    from tournament import random_opening
+
+    rng = random.Random(seed)
+    with open(path, "a") as f:
+        for g in range(games):
+            opening = random_opening(rng.randrange(2 ** 32), opening_plies)
+            game = OthelloGame()
+            for x, y in opening:
+                game.make_move(x, y, game.current_player)
+            result = play_game(AlphaBetaAgent(depth, BLACK, endgame_empties=0),
+                               AlphaBetaAgent(depth, WHITE, endgame_empties=0), game)
+            f.write(json.dumps({"id": f"selfplay#{g}", "opening": opening, "moves": result["moves"],
+                                "winner": result["winner"]}) + "\n")
+
+
+def win_rate(agent, depth=1, games=20, seed=0):
+    # Puntaje (victoria 1, empate 0.5) del agente Q sin exploracion contra AlphaBeta, alternando colores
+    from algoritmos.alphabeta import AlphaBetaAgent
+    from metrics import play_game
+    from tournament import random_opening
+
+    epsilon, player = agent.epsilon, agent.player
+    agent.epsilon = 0.0
+    score = 0.0
+    try:
+        for g in range(games):
+            agent.player = BLACK if g % 2 == 0 else WHITE
+            opponent = AlphaBetaAgent(depth, WHITE if agent.player == BLACK else BLACK, endgame_empties=0)
+            game = OthelloGame()
+            for x, y in random_opening(seed * 1000 + g // 2, 2):
+                game.make_move(x, y, game.current_player)
+            black, white = (agent, opponent) if agent.player == BLACK else (opponent, agent)
+            winner = play_game(black, white, game)["winner"]
+            score += 1.0 if winner == ("BLACK" if agent.player == BLACK else "WHITE") else 0.5 if winner == "DRAW" else 0.0
+    finally:
+        agent.epsilon, agent.player = epsilon, player
+    return score / games if games else 0.0
+
+
+if __name__ == "__main__":
+    from algoritmos.reinforcement import QLearningAgent
+
+    parser = argparse.ArgumentParser(description="Q-learning con repeticion de experiencias desde partidas registradas")
+    parser.add_argument("command", choices=["selfplay", "train"])
+    parser.add_argument("--records", nargs="+", default=["selfplay.jsonl"],
+                        help="archivos JSONL con partidas (torneo, metrics.play_game o selfplay)")
+    parser.add_argument("--games", type=int, default=200, help="partidas de selfplay")
+    parser.add_argument("--depth", type=int, default=2, help="profundidad de AlphaBeta en selfplay y en la evaluacion")
+    parser.add_argument("--capacity", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--updates", type=int, default=16, help="minilotes por partida leida")
+    parser.add_argument("--passes", type=int, default=1)
+    parser.add_argument("--prioritized", action="store_true")
+    parser.add_argument("--eval-games", type=int, default=20)
+    parser.add_argument("--output", default="q_agent.qtb")
+    args = parser.parse_args()
+
+    if args.command == "selfplay":
+        self_play(args.records[0], args.games, args.depth)
+    else:
+        agent = QLearningAgent(BLACK)
+        games = train_offline(agent, args.records, ReplayBuffer(args.capacity, args.prioritized),
+                              args.batch, args.updates, args.passes)
+        agent.save(args.output)
+        print(f"{games} partidas, {len(agent.q_table)} estados -> {args.output}")
+        if args.eval_games:
+            print(f"Puntaje contra AlphaBeta-{args.depth}: {win_rate(agent, args.depth, args.eval_games):.2f}")
@@ -0,0 +1,129 @@
+import time
+from math import inf
+
+# Cada cuantos nodos se consulta el reloj durante una busqueda con limite de tiempo
+CHECK_INTERVAL = 1024
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def make_deadline(time_limit):
+    return time.perf_counter() + time_limit if time_limit else None
+
+
+def check_deadline(deadline):
+    if deadline is not None and time.perf_counter() >= deadline:
+        raise SearchTimeout()
+
+
+def empty_squares(game):
+    return game.geometry.squares - bin(game.black | game.white).count("1")
+
+
+class SearchDriver:
+    # Parte comun de MinimaxAgent y AlphaBetaAgent: libro, ponder, profundizacion iterativa y cancelacion.
+    # La clase define search_root(game, depth); prepare y exact_move son ganchos opcionales.
+    def prepare(self, game):
+        pass
+
+    def exact_move(self, game, deadline=None):
+        # Jugada resuelta sin busqueda (por ejemplo el solucionador de finales), o None.
+        # deadline: el de toda la jugada; lo que no use queda para la busqueda
+        return None
+
+    def iterative_deepening(self, game, pondered=None, deadline=None):
+        # Devuelve la mejor jugada de la ultima profundidad completada antes de agotar el tiempo
+        # (deadline, o time_limit desde ahora)
+        max_depth = empty_squares(game)
+        if self.max_depth > 0:
+            max_depth = min(max_depth, self.max_depth)
+        valid_moves = game.get_valid_moves(self.player)
+        if len(valid_moves) <= 1:
+            self.depth_reached = 0
+            return valid_moves[0] if valid_moves else None
+
+        if deadline is None:
+            deadline = make_deadline(self.time_limit)
+        best_move = None
+        self._root_move = None
+        first_depth = 1
+        if pondered is not None:
+            # Se sigue desde la profundidad ya buscada mientras pensaba el rival
+            best_move = self._root_move = pondered[0]
+            self.depth_reached = pondered[1]
+            first_depth = pondered[1] + 1
+            self._deadline = -inf if self._cancelled else deadline
+        try:
+            for depth in range(first_depth, max(max_depth, 1) + 1):
+                move = self.search_root(game, depth)
+                best_move = self._root_move = move
+                self.depth_reached = depth
+                # La primera iteracion siempre se completa para tener una jugada
+                self._deadline = -inf if self._cancelled else deadline
+                check_deadline(deadline)
+        except SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+            self._root_move = None
+        return best_move
+
+    def cancel(self):
+        # Puede llamarse desde otro hilo: la busqueda en curso termina en el proximo control de tiempo
+        # (SearchTimeout con profundidad fija; con time_limit se devuelve la ultima jugada completa)
+        self._cancelled = True
+        self._deadline = -inf
+
+    def ponder(self, game):
+        # Llamar despues de jugar, con el rival al turno: sus respuestas probables se buscan en segundo plano
+        if self.ponderer is not None:
+            self.ponderer.start(game)
+
+    def stop_pondering(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+    def get_move(self, game):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        self._cancelled = False
+        self.nodes_expanded = 0
+        self.depth_reached = 0
+        start_time = time.perf_counter()
+        # Un solo limite para toda la jugada, compartido por el solucionador de finales y la busqueda
+        deadline = start_time + self.time_limit if self.time_limit else None
+        self.book_hit = False
+        self.prepare(game)
+        # Libro y evaluadores por patrones son de 8x8: en otros tamanos el libro se omite y un evaluador es un error
+        if self.evaluator is not None and game.size != 8:
+            raise ValueError("la evaluacion por patrones requiere un tablero de 8x8")
+        if self.book is not None and game.size == 8:
+            move = self.book.lookup(game, self.player)
+            if move is not None:
+                self.book_hit = True
+                self.book_hits += 1
+                return move, 0, time.perf_counter() - start_time
+        pondered = self.ponderer.result(game) if self.ponderer is not None else None
+        self.ponder_hit = False
+        move = self.exact_move(game, deadline)
+        if move is None:
+            if self.time_limit:
+                self.ponder_hit = pondered is not None
+                move = self.iterative_deepening(game, pondered, deadline)
+            elif pondered is not None and pondered[1] >= self.max_depth:
+                # Posicion ya buscada a la profundidad pedida: respuesta inmediata
+                self.ponder_hit = True
+                move = pondered[0]
+                self.depth_reached = pondered[1]
+            else:
+                # Sin limite de tiempo, pero con controles para que cancel() pueda cortarla
+                self._deadline = -inf if self._cancelled else inf
+                try:
+                    move = self.search_root(game, self.max_depth)
+                finally:
+                    self._deadline = None
+                self.depth_reached = self.max_depth
+        elapsed_time = time.perf_counter() - start_time
+        return move, self.nodes_expanded, elapsed_time
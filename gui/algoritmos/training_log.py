@@ -0,0 +1,128 @@
+import gzip
+import queue
+import struct
+import threading
+
+# Niveles de detalle del registro de entrenamiento
+QUIET = 0      # sin texto; records_file se escribe igual
+SUMMARY = 1    # resumenes cada summary_every episodios
+EPISODE = 2    # ademas el resultado de cada episodio
+MOVES = 3      # ademas cada jugada, como el registro de texto original
+
+MAGIC = b"OTHTLOG\0"
+# Registro binario por episodio: numero, jugadas, recompensa, epsilon, estados en la tabla Q, fichas negras y blancas
+RECORD = struct.Struct("<IHbfIBB")
+
+
+class TrainingLog:
+    # Las lineas y registros se juntan en lotes en el hilo de entrenamiento y un hilo aparte los formatea,
+    # comprime y escribe. Con verbosity < MOVES, `moves` es False y el entrenamiento no arma ningun texto por jugada.
+    def __init__(self, log_file="training_log.txt", verbosity=SUMMARY, records_file=None, summary_every=100,
+                 batch_size=256):
+        self.verbosity = verbosity
+        self.moves = verbosity >= MOVES
+        self.summary_every = summary_every
+        self.batch_size = batch_size
+        self.episodes = 0
+        self._lines = []
+        self._records = []
+        self._queue = queue.Queue()
+        self._thread = None
+        # verbosity solo controla el texto: con records_file los registros binarios se escriben siempre
+        if verbosity > QUIET or records_file:
+            if verbosity == QUIET:
+                log_file = None
+            self._thread = threading.Thread(target=self._writer, args=(log_file, records_file), daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def move(self, line):
+        # Llamar solo si self.moves
+        self._lines.append(line)
+
+    def episode(self, length, reward, epsilon, q_size, black, white):
+        self.episodes += 1
+        if self._thread is None:
+            return
+        if self.moves:
+            self._queue.put(("moves", (self.episodes, self._lines)))
+            self._lines = []
+        self._records.append((self.episodes, length, reward, epsilon, q_size, black, white))
+        # Con las jugadas en el registro se escribe episodio por episodio para conservar el orden
+        if self.moves or len(self._records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._records:
+            self._queue.put(("records", self._records))
+            self._records = []
+
+    def close(self):
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _writer(self, log_file, records_file):
+        text = open(log_file, "w") if log_file else None
+        binary = gzip.open(records_file, "wb") if records_file else None
+        if binary is not None:
+            binary.write(MAGIC)
+        window = []
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                kind, batch = item
+                if kind == "moves":
+                    if text is not None:
+                        number, lines = batch
+                        text.write(f"=== Episodio {number} ===\n" + "".join(line + "\n" for line in lines))
+                    continue
+                if binary is not None:
+                    binary.write(b"".join(RECORD.pack(*record) for record in batch))
+                for record in batch:
+                    if self.verbosity >= EPISODE and text is not None:
+                        text.write(f"Episodio {record[0]}: {record[1]} jugadas, recompensa {record[2]}, "
+                                   f"BLACK={record[5]}, WHITE={record[6]}\n")
+                    window.append(record)
+                    if len(window) == self.summary_every:
+                        if text is not None:
+                            text.write(summary_line(window) + "\n")
+                        window = []
+            if window and text is not None:
+                text.write(summary_line(window) + "\n")
+        finally:
+            if text is not None:
+                text.close()
+            if binary is not None:
+                binary.close()
+
+
+def summary_line(records):
+    n = len(records)
+    wins = sum(1 for r in records if r[2] > 0)
+    losses = sum(1 for r in records if r[2] < 0)
+    return (f"Episodios {records[0][0]}-{records[-1][0]}: victorias {wins / n:.1%}, derrotas {losses / n:.1%}, "
+            f"jugadas {sum(r[1] for r in records) / n:.1f}, recompensa media {sum(r[2] for r in records) / n:+.3f}, "
+            f"epsilon {records[-1][3]:.3f}, estados Q {records[-1][4]}")
+
+
+def read_records(path):
+    # Registros de un archivo escrito por TrainingLog, como tuplas de RECORD
+    with gzip.open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un registro de entrenamiento")
+        while True:
+            chunk = f.read(RECORD.size * 4096)
+            if not chunk:
+                break
+            yield from RECORD.iter_unpack(chunk)
@@ -0,0 +1,53 @@
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Tamano aproximado de una entrada en memoria (tupla + clave + valor + jugada)
+ENTRY_BYTES = 200
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=16):
+        capacity = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        size = 1 << (capacity.bit_length() - 1)  # potencia de 2 para indexar con una mascara
+        self.mask = size - 1
+        self.entries = [None] * size
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+
+    def new_search(self):
+        # Las entradas de busquedas anteriores se conservan pero pasan a ser reemplazables
+        self.generation += 1
+        self.reset_stats()
+
+    def clear(self):
+        self.entries = [None] * len(self.entries)
+        self.generation = 0
+        self.reset_stats()
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        index = key & self.mask
+        old = self.entries[index]
+        # Reemplazo: casilla vacia, misma posicion, entrada antigua o profundidad mayor o igual
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.entries[index] = (key, depth, value, flag, move, self.generation)
+
+    def stats(self):
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "cutoffs": self.cutoffs,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "cutoff_rate": self.cutoffs / self.probes if self.probes else 0.0,
+        }
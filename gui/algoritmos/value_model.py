@@ -0,0 +1,166 @@
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from core.bitboard import symmetries
+from core.game import OthelloGame, BLACK
+from core.vector_env import legal_masks, unpack, popcounts
+from algoritmos.ordering import SQUARE_WEIGHTS
+
+VALUE_MODEL_FILE = "value_model.npz"
+
+
+def board_features(black, white):
+    # (B,) uint64 negras y blancas -> (B, 128) float32: una columna por casilla y color
+    return np.concatenate([unpack(black), unpack(white)], axis=1).astype(np.float32)
+
+
+class ValueModel:
+    # Red densa sobre las casillas del tablero: capas ocultas tanh y salida lineal. Sin capas
+    # ocultas es un modelo lineal. Valor desde el punto de vista de negras, en fichas de diferencia final.
+    def __init__(self, layers):
+        self.layers = [(np.asarray(w, dtype=np.float32), np.asarray(b, dtype=np.float32)) for w, b in layers]
+
+    @classmethod
+    def default(cls):
+        # Modelo lineal con los pesos estaticos por casilla, como punto de partida sin entrenar
+        weights = np.array(SQUARE_WEIGHTS, dtype=np.float32).ravel() / 10
+        return cls([(np.concatenate([weights, -weights])[:, None], np.zeros(1))])
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls([(data[f"W{i}"], data[f"b{i}"]) for i in range(len(data.files) // 2)])
+
+    def save(self, path):
+        arrays = {}
+        for i, (w, b) in enumerate(self.layers):
+            arrays[f"W{i}"], arrays[f"b{i}"] = w, b
+        np.savez(path, **arrays)
+
+    def predict(self, features):
+        x = features
+        for w, b in self.layers[:-1]:
+            x = np.tanh(x @ w + b)
+        w, b = self.layers[-1]
+        return (x @ w + b)[:, 0]
+
+    def evaluate_batch(self, black, white):
+        # Un solo producto de matrices para todo el lote. Sin jugadas para ningun color (como
+        # game.is_game_over): partida terminada y se usa la diferencia exacta.
+        values = self.predict(board_features(black, white)).astype(np.float64)
+        ended = legal_masks(black, white) == np.uint64(0)
+        if ended.any():
+            # Solo las filas sin jugadas de negras necesitan las de blancas
+            rows = np.flatnonzero(ended)
+            ended[rows] = legal_masks(white[rows], black[rows]) == np.uint64(0)
+        if ended.any():
+            diff = popcounts(black).astype(np.float64) - popcounts(white)
+            values = np.where(ended, diff, values)
+        return values
+
+    def __call__(self, game, player):
+        if game.is_game_over():
+            value = game.black_count - game.white_count
+        else:
+            value = float(self.predict(board_features(np.array([game.black], dtype=np.uint64),
+                                                      np.array([game.white], dtype=np.uint64)))[0])
+        return value if player == BLACK else -value
+
+
+def fit(positions, targets, hidden=0, epochs=300, rate=0.01, seed=0):
+    # Sin capa oculta: minimos cuadrados con un poco de regularizacion. Con capa oculta: descenso
+    # por gradiente en lotes. Cada posicion se agrega con sus 8 simetrias.
+    black, white, y = [], [], []
+    for (b, w, _, _), target in zip(positions, targets):
+        black += symmetries(b)
+        white += symmetries(w)
+        y += [target] * 8
+    x = board_features(np.array(black, dtype=np.uint64), np.array(white, dtype=np.uint64))
+    y = np.array(y, dtype=np.float32)
+
+    if not hidden:
+        design = np.hstack([x, np.ones((len(x), 1), dtype=np.float32)])
+        coefs = np.linalg.solve(design.T @ design + 1e-2 * np.eye(design.shape[1]), design.T @ y)
+        model = ValueModel([(coefs[:-1, None], coefs[-1:])])
+    else:
+        rng = np.random.default_rng(seed)
+        w1 = rng.normal(0, 1 / np.sqrt(x.shape[1]), (x.shape[1], hidden)).astype(np.float32)
+        b1 = np.zeros(hidden, dtype=np.float32)
+        w2 = rng.normal(0, 1 / np.sqrt(hidden), (hidden, 1)).astype(np.float32)
+        b2 = np.zeros(1, dtype=np.float32)
+        for _ in range(epochs):
+            for batch in np.array_split(rng.permutation(len(x)), max(1, len(x) // 256)):
+                h = np.tanh(x[batch] @ w1 + b1)
+                error = (h @ w2 + b2)[:, 0] - y[batch]
+                grad_out = error[:, None] / len(batch)
+                grad_h = (grad_out @ w2.T) * (1 - h ** 2)
+                w2 -= rate * h.T @ grad_out
+                b2 -= rate * grad_out.sum(axis=0)
+                w1 -= rate * x[batch].T @ grad_h
+                b1 -= rate * grad_h.sum(axis=0)
+        model = ValueModel([(w1, b1), (w2, b2)])
+    error = model.predict(x) - y
+    return model, float(np.sqrt(np.mean(error ** 2)))
+
+
+def benchmark(model, depth=4, positions=10, seed=0):
+    # Tiempo de AlphaBeta con el mismo modelo, evaluando hoja por hoja o por lotes en los dos ultimos niveles.
+    # Los nodos no son comparables entre modos: los lotes evaluan todas las hojas de esos niveles, sin cortes
+    from algoritmos.alphabeta import AlphaBetaAgent
+
+    rng = random.Random(seed)
+    games = []
+    for _ in range(positions):
+        game = OthelloGame()
+        for _ in range(rng.randrange(8, 30)):
+            moves = game.get_valid_moves(game.current_player)
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves), game.current_player)
+        if game.get_valid_moves(game.current_player):
+            games.append(game)
+
+    rows = []
+    for batch in (False, True):
+        nodes = elapsed = 0
+        moves = []
+        for game in games:
+            agent = AlphaBetaAgent(depth, game.current_player, tt_size_mb=0, endgame_empties=0,
+                                   evaluator=model, batch_leaves=batch)
+            start = time.perf_counter()
+            move, n, _ = agent.get_move(game)
+            elapsed += time.perf_counter() - start
+            nodes += n
+            moves.append(move)
+        rows.append((batch, nodes, elapsed, moves))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrena el modelo de valor para la evaluacion por lotes")
+    parser.add_argument("command", nargs="?", choices=["fit", "bench"], default="fit")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=None,
+                        help="profundidad de las partidas de entrenamiento (2) o de la busqueda medida (4)")
+    parser.add_argument("--hidden", type=int, default=0, help="neuronas de la capa oculta (0 = modelo lineal)")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--model", default=VALUE_MODEL_FILE)
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        from algoritmos.evaluation import self_play_positions
+
+        positions, targets = self_play_positions(args.games, args.depth or 2, evaluator="pattern")
+        model, rmse = fit(positions, targets, args.hidden, args.epochs)
+        model.save(args.model)
+        print(f"{len(positions)} posiciones, error cuadratico medio {rmse:.2f} fichas -> {args.model}")
+    else:
+        model = ValueModel.load(args.model) if os.path.exists(args.model) else ValueModel.default()
+        print("| Modo | Nodos | Tiempo (s) | Nodos/s |")
+        print("|------|-------|------------|---------|")
+        for batch, nodes, elapsed, _ in benchmark(model, args.depth or 4):
+            print(f"| {'lotes' if batch else 'hoja a hoja'} | {nodes} | {elapsed:.2f} | {nodes / elapsed:.0f} |")
@@ -0,0 +1,172 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core.game import OthelloGame, BLACK, WHITE
+from tournament import agent_spec, build_agent, AGENT_TYPES, Q_TABLE_FILE
+
+# Profundidad de Minimax y AlphaBeta cuando no se indica ni profundidad ni tiempo
+DEFAULT_DEPTH = 4
+
+# Caracteres aceptados en el formato de texto de size * size casillas (fila por fila) seguido del jugador al turno
+PIECES = {"B": BLACK, "X": BLACK, "*": BLACK, "W": WHITE, "O": WHITE, "-": None, ".": None}
+
+
+def parse_board(text, to_move=None):
+    # "64 casillas [jugador]" (o 100, 144... para otros tamanos); sin jugador juegan negras
+    parts = text.split()
+    squares = parts[0]
+    size = math.isqrt(len(squares))
+    if size * size != len(squares) or size < 4 or size % 2 or any(c not in PIECES for c in squares):
+        raise ValueError("se esperaban 64 (o size * size) casillas de B/W/X/O/-/.")
+    black = white = 0
+    for sq, c in enumerate(squares):
+        if PIECES[c] == BLACK:
+            black |= 1 << sq
+        elif PIECES[c] == WHITE:
+            white |= 1 << sq
+    side = to_move or (parts[1] if len(parts) > 1 else "B")
+    if side not in ("B", "X", "W", "O"):
+        raise ValueError(f"jugador al turno desconocido: {side}")
+    game = OthelloGame(size)
+    game.set_bitboards(black, white)
+    game.current_player = PIECES[side]
+    return game
+
+
+def parse_line(line):
+    # Devuelve (id, posiciones a analizar, jugada jugada en cada una o None)
+    line = line.strip()
+    if not line.startswith("{"):
+        return None, [parse_board(line)], [None]
+    record = json.loads(line)
+    if "moves" in record or "opening" in record:
+        # Partida del torneo: apertura [[x, y], ...] y jugadas [[jugador, x, y], ...]
+        game = OthelloGame(record.get("size", 8))
+        played = [tuple(m) for m in record.get("opening", [])] + [tuple(m[-2:]) for m in record.get("moves", [])]
+        games, moves = [], []
+        for move in played:
+            if not game.legal_mask(game.current_player):
+                game.current_player = game.opponent(game.current_player)
+            games.append(game.clone())
+            moves.append(move)
+            if not game.make_move(*move, game.current_player):
+                raise ValueError(f"jugada ilegal {list(move)} en la jugada {len(moves)}")
+        return record.get("id"), games, moves
+    if "board" in record:
+        return record.get("id"), [parse_board(record["board"], record.get("to_move"))], [None]
+    game = OthelloGame(record.get("size", 8))
+    game.set_bitboards(int(record["black"]), int(record["white"]))
+    game.current_player = PIECES[record.get("to_move", "B")]
+    return record.get("id"), [game], [None]
+
+
+def analyze_position(spec, game):
+    player = game.current_player
+    if not game.legal_mask(player):
+        return {"to_move": player, "move": None, "nodes": 0, "depth": 0, "elapsed": 0.0}
+    # Un agente nuevo por posicion: el resultado no depende de lo analizado antes en el mismo proceso
+    agent = build_agent(spec, player, game.size)
+    start = time.perf_counter()
+    move, nodes, _ = agent.get_move(game.clone())
+    return {"to_move": player, "move": list(move) if move else None, "nodes": nodes,
+            "depth": getattr(agent, "depth_reached", 0), "elapsed": round(time.perf_counter() - start, 6)}
+
+
+def analyze_line(spec, number, line):
+    try:
+        record_id, games, played = parse_line(line)
+    except (ValueError, KeyError, json.JSONDecodeError) as e:
+        return {"line": number, "error": str(e)}
+    result = {"line": number}
+    if record_id is not None:
+        result["id"] = record_id
+    analyses = []
+    try:
+        for game, move in zip(games, played):
+            analysis = analyze_position(spec, game)
+            if move is not None:
+                analysis["played"] = list(move)
+                analysis["match"] = analysis["move"] == list(move)
+            analyses.append(analysis)
+    except Exception as e:
+        # Agente mal configurado, tabla Q danada, tamano no soportado...: se informa en la linea y se sigue
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    if len(analyses) == 1 and played[0] is None:
+        result.update(analyses[0])
+    else:
+        result["positions"] = analyses
+    return result
+
+
+def analyze_chunk(spec, chunk):
+    return [analyze_line(spec, number, line) for number, line in chunk]
+
+
+def analyze_stream(lines, spec, workers=1, chunk_size=32):
+    # Resultados en el orden de entrada. Como mucho 2 * workers lotes en vuelo: la memoria no depende del tamano de la entrada.
+    numbered = ((n, line) for n, line in enumerate(lines, 1) if line.strip())
+    chunks = iter(lambda: list(itertools.islice(numbered, chunk_size)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from analyze_chunk(spec, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(analyze_chunk, spec, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def make_spec(kind, depth=None, time_limit=None):
+    params = {}
+    if kind in ("minimax", "alphabeta"):
+        # Sin profundidad explicita: con tiempo, sin tope; si no, DEFAULT_DEPTH
+        params["max_depth"] = depth if depth is not None else 0 if time_limit else DEFAULT_DEPTH
+    if time_limit and kind != "rl":
+        params["time_limit"] = time_limit
+    if kind == "rl":
+        # Sin exploracion: el analisis muestra la jugada de la tabla, no una al azar
+        params["q_table"] = Q_TABLE_FILE
+        params["epsilon"] = 0.0
+    return agent_spec(kind, **params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiza posiciones o partidas sin interfaz grafica")
+    parser.add_argument("input", nargs="?", default="-",
+                        help='archivo con una posicion o partida por linea ("-" = entrada estandar)')
+    parser.add_argument("--agent", choices=AGENT_TYPES, default="alphabeta")
+    parser.add_argument("--depth", type=int, default=None,
+                        help=f"profundidad fija ({DEFAULT_DEPTH} por defecto; con --time, tope opcional)")
+    parser.add_argument("--time", type=float, default=None, help="segundos por posicion (en lugar de profundidad fija)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=32, help="lineas por tarea enviada a cada proceso")
+    parser.add_argument("--output", default="-")
+    args = parser.parse_args()
+
+    spec = make_spec(args.agent, args.depth, args.time)
+    source = sys.stdin if args.input == "-" else open(args.input)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in analyze_stream(source, spec, args.workers, args.chunk):
+            out.write(json.dumps(result) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
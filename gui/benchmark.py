@@ -0,0 +1,261 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from core.game import OthelloGame, BLACK
+from algoritmos.minimax import MinimaxAgent
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.reinforcement import QLearningAgent
+
+BASELINE_FILE = "benchmark_baseline.json"
+# Cuanto puede empeorar una medicion respecto de la referencia antes de contarla como regresion
+DEFAULT_THRESHOLD = 0.15
+
+# Cantidad de hojas desde la posicion inicial, para verificar la generacion de jugadas
+PERFT_INITIAL = {1: 4, 2: 12, 3: 56, 4: 244, 5: 1396, 6: 8200, 7: 55092, 8: 390216}
+# Tableros grandes medidos ademas del de 8x8: generacion de jugadas y nodos por segundo de la busqueda
+BOARD_SIZES = [10, 12]
+
+
+def perft(game, depth):
+    # Hojas del arbol completo a `depth` jugadas; pasar cuenta como jugada y la partida terminada como hoja
+    if depth == 0:
+        return 1
+    player = game.current_player
+    mask = game.legal_mask(player)
+    if not mask:
+        opponent = game.opponent(player)
+        if not game.legal_mask(opponent):
+            return 1
+        game.current_player = opponent
+        count = perft(game, depth - 1)
+        game.current_player = player
+        return count
+    count = 0
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        undo = game.make_move(*divmod(low.bit_length() - 1, game.size), player)
+        count += perft(game, depth - 1)
+        game.unmake_move(undo)
+    return count
+
+
+def positions(count=4, seed=0, size=8):
+    # Posiciones fijas: la inicial y otras tras jugadas al azar con semilla (apertura, medio juego)
+    rng = random.Random(seed)
+    games = [OthelloGame(size)]
+    while len(games) < count:
+        game = OthelloGame(size)
+        for _ in range(10 * (len(games) - 1) % 50 + 10):  # 10 a 50 jugadas
+            moves = game.get_valid_moves(game.current_player)
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves), game.current_player)
+        if game.get_valid_moves(game.current_player):
+            games.append(game)
+    return games
+
+
+def best_time(function, repeat):
+    # Minimo de varias repeticiones: lo menos afectado por el resto de la maquina
+    return min(timed(function)[1] for _ in range(repeat))
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def bench_perft(games, depth, repeat):
+    results = {}
+    for i, game in enumerate(games):
+        runs = [timed(lambda: perft(game.clone(), depth)) for _ in range(repeat)]
+        nodes = runs[0][0]
+        elapsed = min(t for _, t in runs)
+        results[f"perft.pos{i}.d{depth}.nodes"] = {"value": nodes, "unit": "hojas", "exact": True}
+        results[f"perft.pos{i}.d{depth}.rate"] = {"value": round(nodes / elapsed), "unit": "hojas/s"}
+    return results
+
+
+def bench_make_clone(games, repeat, iterations=20000):
+    game = games[-1]
+    moves = game.get_valid_moves(game.current_player)
+    player = game.current_player
+
+    def make_unmake():
+        g = game.clone()
+        for i in range(iterations):
+            g.unmake_move(g.make_move(*moves[i % len(moves)], player))
+
+    def clone():
+        for _ in range(iterations):
+            game.clone()
+
+    return {
+        "make_unmake.rate": {"value": round(iterations / best_time(make_unmake, repeat)), "unit": "jugadas/s"},
+        "clone.rate": {"value": round(iterations / best_time(clone, repeat)), "unit": "copias/s"},
+    }
+
+
+def bench_agents(games, agents, repeat):
+    # Latencia media de get_move por agente y profundidad sobre las posiciones fijas
+    results = {}
+    for name, cls, depths in agents:
+        for depth in depths:
+            def search():
+                for game in games:
+                    cls(depth, game.current_player).get_move(game)
+            elapsed = best_time(search, repeat)
+            results[f"{name}.d{depth}.latency"] = {"value": round(elapsed / len(games), 6), "unit": "s",
+                                                   "lower_is_better": True}
+    return results
+
+
+def bench_board_sizes(sizes, perft_depth, depths, repeat, seed=0):
+    # Por tamano: perft desde la inicial y dos aperturas, y nodos por segundo de Minimax y AlphaBeta
+    # sobre las mismas posiciones
+    results = {}
+    for size in sizes:
+        games = positions(3, seed, size)
+        for name, nodes in bench_perft(games, perft_depth, repeat).items():
+            results[f"size{size}.{name}"] = nodes
+        for name, cls, depth in [("minimax", MinimaxAgent, depths[0]),
+                                 ("alphabeta", lambda d, p: AlphaBetaAgent(d, p, endgame_empties=0), depths[1])]:
+            def search():
+                return sum(cls(depth, game.current_player).get_move(game)[1] for game in games)
+            runs = [timed(search) for _ in range(repeat)]
+            # Los nodos de busqueda cambian con el orden de jugadas o la tabla: se comparan con el umbral relativo
+            results[f"size{size}.{name}.d{depth}.nodes"] = {"value": runs[0][0], "unit": "nodos",
+                                                            "lower_is_better": True}
+            results[f"size{size}.{name}.d{depth}.rate"] = {"value": round(runs[0][0] / min(t for _, t in runs)),
+                                                           "unit": "nodos/s"}
+    return results
+
+
+def bench_qlearning(episodes, repeat):
+    def train():
+        random.seed(0)
+        QLearningAgent(BLACK, epsilon=0.2).train(episodes, log_file=os.devnull)
+    return {"qlearning.train.rate": {"value": round(episodes / best_time(train, repeat), 2), "unit": "episodios/s"}}
+
+
+# Cada medicion de arranque corre en un interprete nuevo: tiempo hasta importar la ventana (sin abrirla,
+# asi funciona sin pantalla) y hasta la primera jugada de un agente creado por el registro
+STARTUP = {
+    "startup.import_gui": "import main_window",
+    "startup.first_move.alphabeta": "from algoritmos.registry import create_agent\n"
+                                    "from core.game import OthelloGame\n"
+                                    "create_agent('alphabeta', 'B', max_depth=4).get_move(OthelloGame())",
+    "startup.first_move.mcts": "from algoritmos.registry import create_agent\n"
+                               "from core.game import OthelloGame\n"
+                               "create_agent('mcts', 'B', playouts=200, seed=0).get_move(OthelloGame())",
+}
+
+
+def bench_startup(repeat):
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, code in STARTUP.items():
+        script = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)"
+        elapsed = min(float(subprocess.run([sys.executable, "-c", script], cwd=here, capture_output=True,
+                                           text=True, check=True).stdout.split()[-1]) for _ in range(repeat))
+        results[name] = {"value": round(elapsed, 4), "unit": "s", "lower_is_better": True}
+    return results
+
+
+def run(quick=False, repeat=3, seed=0):
+    games = positions(seed=seed)
+    agents = [("minimax", MinimaxAgent, [1, 2] if quick else [1, 2, 3]),
+              ("alphabeta", lambda depth, player: AlphaBetaAgent(depth, player, endgame_empties=0),
+               [2, 3] if quick else [2, 3, 4, 5])]
+    results = {}
+    results.update(bench_perft(games, 4 if quick else 5, repeat))
+    results.update(bench_make_clone(games, repeat))
+    results.update(bench_agents(games, agents, repeat))
+    results.update(bench_board_sizes(BOARD_SIZES, 3 if quick else 4, (2, 4) if quick else (3, 5), repeat, seed))
+    results.update(bench_qlearning(20 if quick else 100, repeat))
+    results.update(bench_startup(repeat))
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "platform": platform.platform(), "quick": quick, "repeat": repeat, "seed": seed,
+                 "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # Devuelve (nombre, referencia, actual, cambio relativo) de cada medicion que empeoro mas que threshold.
+    # Las cuentas exactas (perft) no admiten diferencia: otro valor es un error de generacion de jugadas.
+    regressions = []
+    for name, entry in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        old, new = reference["value"], entry["value"]
+        if entry.get("exact"):
+            if new != old:
+                regressions.append((name, old, new, None))
+            continue
+        if not old:
+            continue
+        change = (new - old) / old
+        worse = change if entry.get("lower_is_better") else -change
+        if worse > threshold:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def print_results(report, baseline=None):
+    reference = baseline["results"] if baseline else {}
+    print(f"{'Medicion':<32} {'Valor':>14} {'Referencia':>14}  Unidad")
+    for name, entry in report["results"].items():
+        old = reference.get(name, {}).get("value", "-")
+        print(f"{name:<32} {entry['value']:>14} {old:>14}  {entry['unit']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del motor y de los agentes")
+    parser.add_argument("--quick", action="store_true", help="profundidades y episodios reducidos")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="archivo JSON con los resultados")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="guarda los resultados como nueva referencia")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    report = run(args.quick, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print_results(report)
+        return
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("quick") != args.quick:
+            print("La referencia se midio con otro modo (--quick); solo se comparan las mediciones en comun")
+    print_results(report, baseline)
+    if baseline is None:
+        return
+    regressions = compare(report, baseline, args.threshold)
+    for name, old, new, change in regressions:
+        detail = "cuenta distinta" if change is None else f"{change:+.1%}"
+        print(f"REGRESION {name}: {old} -> {new} ({detail})")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# Operaciones de bajo nivel sobre tableros representados como dos enteros de 64 bits.
+# La casilla (x, y) corresponde al bit x * 8 + y (recorrido por filas, igual que el tablero).
+
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_COL_0 = 0xFEFEFEFEFEFEFEFE  # sin la columna y = 0
+NOT_COL_7 = 0x7F7F7F7F7F7F7F7F  # sin la columna y = 7
+
+# (desplazamiento, mascara) para cada una de las 8 direcciones
+SHIFTS = [
+    (-9, NOT_COL_7), (-8, FULL), (-7, NOT_COL_0),
+    (-1, NOT_COL_7),             (1, NOT_COL_0),
+    (7, NOT_COL_7),  (8, FULL),  (9, NOT_COL_0),
+]
+
+INITIAL_BLACK = (1 << 28) | (1 << 35)  # (3, 4) y (4, 3)
+INITIAL_WHITE = (1 << 27) | (1 << 36)  # (3, 3) y (4, 4)
+
+
+def square(x, y):
+    return x * 8 + y
+
+
+def coords(sq):
+    return divmod(sq, 8)
+
+
+def popcount(bb):
+    return bin(bb).count("1")
+
+
+def iter_bits(bb):
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def legal_moves(own, opp):
+    empty = ~(own | opp) & FULL
+    moves = 0
+    for shift, mask in SHIFTS:
+        if shift > 0:
+            x = (own << shift) & mask & opp
+            x |= (x << shift) & mask & opp
+            x |= (x << shift) & mask & opp
+            x |= (x << shift) & mask & opp
+            x |= (x << shift) & mask & opp
+            x |= (x << shift) & mask & opp
+            moves |= (x << shift) & mask & empty
+        else:
+            s = -shift
+            x = (own >> s) & mask & opp
+            x |= (x >> s) & mask & opp
+            x |= (x >> s) & mask & opp
+            x |= (x >> s) & mask & opp
+            x |= (x >> s) & mask & opp
+            x |= (x >> s) & mask & opp
+            moves |= (x >> s) & mask & empty
+    return moves
+
+
+def flips(own, opp, sq):
+    flipped = 0
+    start = 1 << sq
+    for shift, mask in SHIFTS:
+        line = 0
+        if shift > 0:
+            x = (start << shift) & mask
+            while x & opp:
+                line |= x
+                x = (x << shift) & mask
+        else:
+            s = -shift
+            x = (start >> s) & mask
+            while x & opp:
+                line |= x
+                x = (x >> s) & mask
+        if x & own:
+            flipped |= line
+    return flipped
+
+
+# Simetrias del tablero (grupo diedrico de 8 elementos)
+
+def flip_vertical(bb):
+    # (x, y) -> (7 - x, y): invierte el orden de las filas (bytes)
+    return int.from_bytes(bb.to_bytes(8, "little"), "big")
+
+
+def mirror_horizontal(bb):
+    # (x, y) -> (x, 7 - y): invierte los bits dentro de cada fila
+    bb = ((bb >> 1) & 0x5555555555555555) | ((bb & 0x5555555555555555) << 1)
+    bb = ((bb >> 2) & 0x3333333333333333) | ((bb & 0x3333333333333333) << 2)
+    return ((bb >> 4) & 0x0F0F0F0F0F0F0F0F) | ((bb & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def transpose(bb):
+    # (x, y) -> (y, x)
+    t = 0x0F0F0F0F00000000 & (bb ^ (bb << 28))
+    bb ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (bb ^ (bb << 14))
+    bb ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (bb ^ (bb << 7))
+    bb ^= t ^ (t >> 7)
+    return bb
+
+
+def symmetries(bb):
+    # Las 8 imagenes de bb, siempre en el mismo orden (indice 0 = identidad)
+    m = mirror_horizontal(bb)
+    v = flip_vertical(bb)
+    r = flip_vertical(m)
+    return [bb, m, v, r, transpose(bb), transpose(m), transpose(v), transpose(r)]
+
+
+# SYMMETRY_SQUARES[s][sq]: casilla a la que va sq con la simetria s
+SYMMETRY_SQUARES = [list(row) for row in zip(*[
+    [images.bit_length() - 1 for images in symmetries(1 << sq)] for sq in range(64)
+])]
+
+
+def canonical(black, white):
+    # Imagen minima de la posicion entre las 8 simetrias y el indice de la simetria usada
+    best = None
+    best_index = 0
+    for index, (b, w) in enumerate(zip(symmetries(black), symmetries(white))):
+        key = (b << 64) | w
+        if best is None or key < best:
+            best, best_index = key, index
+    return best, best_index
+
+
+# Tableros de otros tamanos: enteros de ancho arbitrario donde la casilla (x, y) es el bit x * size + y.
+# Para 8x8 se usan las funciones de 64 bits de arriba; para el resto, las mismas operaciones con mascaras
+# del tamano del tablero y propagacion por duplicacion (Kogge-Stone), que usa log2(size) pasos por direccion.
+
+class Geometry:
+    def __init__(self, size):
+        if size < 4 or size % 2:
+            raise ValueError("el tablero debe tener un tamano par de al menos 4")
+        from core.zobrist import zobrist_keys
+        n = size
+        self.size = n
+        self.squares = n * n
+        self.full = full = (1 << self.squares) - 1
+        col_0 = sum(1 << (x * n) for x in range(n))
+        not_col_0 = full ^ col_0
+        not_col_last = full ^ (col_0 << (n - 1))
+        self.shifts = [
+            (-n - 1, not_col_last), (-n, full), (-n + 1, not_col_0),
+            (-1, not_col_last),                 (1, not_col_0),
+            (n - 1, not_col_last),  (n, full),  (n + 1, not_col_0),
+        ]
+        # Desplazamientos de la propagacion: una fila de fichas rivales mide como mucho size - 2
+        self._steps = []
+        step = 1
+        while step < n - 2:
+            self._steps.append(step)
+            step *= 2
+        c = n // 2
+        self.initial_black = (1 << ((c - 1) * n + c)) | (1 << (c * n + c - 1))
+        self.initial_white = (1 << ((c - 1) * n + c - 1)) | (1 << (c * n + c))
+        self.coords = [divmod(sq, n) for sq in range(self.squares)]
+        last = n - 1
+        self.corners = sum(1 << (x * n + y) for x in (0, last) for y in (0, last))
+        self.x_squares = sum(1 << (x * n + y) for x in (1, last - 1) for y in (1, last - 1))
+        self.zobrist_black, self.zobrist_white, self.zobrist_flip = zobrist_keys(self.squares)
+        if n == 8:
+            self.legal_moves = legal_moves
+            self.flips = flips
+            self.symmetry_squares = SYMMETRY_SQUARES
+            self.canonical = canonical
+        else:
+            self.legal_moves = self._legal_moves
+            self.flips = self._flips
+            # Mismo orden de simetrias que symmetries() para 8x8
+            images = [
+                lambda x, y: (x, y), lambda x, y: (x, last - y), lambda x, y: (last - x, y),
+                lambda x, y: (last - x, last - y), lambda x, y: (y, x), lambda x, y: (last - y, x),
+                lambda x, y: (y, last - x), lambda x, y: (last - y, last - x),
+            ]
+            self.symmetry_squares = [[i * n + j for i, j in (image(x, y) for x, y in self.coords)]
+                                     for image in images]
+            self.canonical = self._canonical
+
+    def __reduce__(self):
+        # Se envia a otros procesos como el tamano: del otro lado se usa la geometria compartida
+        return board_geometry, (self.size,)
+
+    def _legal_moves(self, own, opp):
+        empty = ~(own | opp) & self.full
+        moves = 0
+        steps = self._steps
+        for shift, mask in self.shifts:
+            pro = mask & opp
+            if shift > 0:
+                x = (own << shift) & pro
+                for step in steps:
+                    s = shift * step
+                    x |= pro & (x << s)
+                    pro &= pro << s
+                moves |= (x << shift) & mask & empty
+            else:
+                shift = -shift
+                x = (own >> shift) & pro
+                for step in steps:
+                    s = shift * step
+                    x |= pro & (x >> s)
+                    pro &= pro >> s
+                moves |= (x >> shift) & mask & empty
+        return moves
+
+    def _flips(self, own, opp, sq):
+        flipped = 0
+        start = 1 << sq
+        for shift, mask in self.shifts:
+            line = 0
+            if shift > 0:
+                x = (start << shift) & mask
+                while x & opp:
+                    line |= x
+                    x = (x << shift) & mask
+            else:
+                s = -shift
+                x = (start >> s) & mask
+                while x & opp:
+                    line |= x
+                    x = (x >> s) & mask
+            if x & own:
+                flipped |= line
+        return flipped
+
+    def _canonical(self, black, white):
+        best = None
+        best_index = 0
+        black_squares = list(iter_bits(black))
+        white_squares = list(iter_bits(white))
+        for index, table in enumerate(self.symmetry_squares):
+            b = w = 0
+            for sq in black_squares:
+                b |= 1 << table[sq]
+            for sq in white_squares:
+                w |= 1 << table[sq]
+            key = (b << self.squares) | w
+            if best is None or key < best:
+                best, best_index = key, index
+        return best, best_index
+
+
+_GEOMETRIES = {}
+
+
+def board_geometry(size=8):
+    geometry = _GEOMETRIES.get(size)
+    if geometry is None:
+        geometry = _GEOMETRIES[size] = Geometry(size)
+    return geometry
@@ -1,9 +1,13 @@
-from copy import deepcopy
+from core.bitboard import popcount, coords, board_geometry
+from core.zobrist import zobrist_hash
 
 EMPTY = '.'
 BLACK = 'B'
 WHITE = 'W'
 
+# Tuplas (x, y) compartidas para no crear una por jugada (tablero de 8x8; cada geometria tiene las suyas)
+COORDS = [coords(sq) for sq in range(64)]
+
 DIRECTIONS = [
     (-1, -1), (-1, 0), (-1, 1),
     (0, -1),          (0, 1),
@@ -11,78 +15,165 @@ DIRECTIONS = [
 ]
 
 class OthelloGame:
-    def __init__(self):
-        self.board = self._initialize_board()
+    def __init__(self, size=8):
+        # Tablero de size x size (par, al menos 4); la geometria con mascaras y claves se comparte entre partidas
+        self.size = size
+        self.geometry = board_geometry(size)
+        self._initialize_board()
         self.current_player = BLACK
 
     def _initialize_board(self):
-        board = [[EMPTY for _ in range(8)] for _ in range(8)]
-        board[3][3], board[4][4] = WHITE, WHITE
-        board[3][4], board[4][3] = BLACK, BLACK
-        return board
+        # Cada color es un entero de size * size bits; el bit x * size + y es la casilla (x, y)
+        self.set_bitboards(self.geometry.initial_black, self.geometry.initial_white)
+
+    def set_bitboards(self, black, white):
+        # Unica forma de reemplazar las fichas: recalcula hash, conteos y cache de jugadas
+        self.black = black
+        self.white = white
+        # Hash Zobrist de las fichas; el turno se combina aparte con ZOBRIST_TURN
+        self.hash = zobrist_hash(black, white, self.geometry.zobrist_black, self.geometry.zobrist_white)
+        self.black_count = popcount(black)
+        self.white_count = popcount(white)
+        # Mascaras de jugadas legales por color; None = no calculada desde el ultimo cambio
+        self._legal_black = None
+        self._legal_white = None
+
+    @property
+    def board(self):
+        # Copia de solo lectura (tuplas): game.board[x][y] = ... falla en vez de no hacer nada.
+        # Para cambiar fichas se asigna un tablero entero (game.board = filas) o se usa set_bitboards.
+        black, white = self.black, self.white
+        size = self.size
+        return tuple(
+            tuple(BLACK if black & (1 << (x * size + y)) else WHITE if white & (1 << (x * size + y)) else EMPTY
+                  for y in range(size))
+            for x in range(size))
+
+    @board.setter
+    def board(self, board):
+        black = white = 0
+        size = self.size
+        for x in range(size):
+            for y in range(size):
+                if board[x][y] == BLACK:
+                    black |= 1 << (x * size + y)
+                elif board[x][y] == WHITE:
+                    white |= 1 << (x * size + y)
+        self.set_bitboards(black, white)
 
     def in_bounds(self, x, y):
-        return 0 <= x < 8 and 0 <= y < 8
+        return 0 <= x < self.size and 0 <= y < self.size
 
     def opponent(self, player):
         return BLACK if player == WHITE else WHITE
 
-    def is_valid_move(self, x, y, player):
-        if not self.in_bounds(x, y) or self.board[x][y] != EMPTY:
-            return False
-
-        opponent = self.opponent(player)
-        for dx, dy in DIRECTIONS:
-            nx, ny = x + dx, y + dy
-            has_opponent_between = False
-
-            while self.in_bounds(nx, ny) and self.board[nx][ny] == opponent:
-                nx += dx
-                ny += dy
-                has_opponent_between = True
+    def _bitboards(self, player):
+        return (self.black, self.white) if player == BLACK else (self.white, self.black)
 
-            if has_opponent_between and self.in_bounds(nx, ny) and self.board[nx][ny] == player:
-                return True
+    def legal_mask(self, player):
+        if player == BLACK:
+            if self._legal_black is None:
+                self._legal_black = self.geometry.legal_moves(self.black, self.white)
+            return self._legal_black
+        if self._legal_white is None:
+            self._legal_white = self.geometry.legal_moves(self.white, self.black)
+        return self._legal_white
 
-        return False
+    def is_valid_move(self, x, y, player):
+        if not self.in_bounds(x, y):
+            return False
+        return bool(self.legal_mask(player) >> (x * self.size + y) & 1)
 
     def get_valid_moves(self, player):
-        return [(x, y) for x in range(8) for y in range(8) if self.is_valid_move(x, y, player)]
+        moves = []
+        mask = self.legal_mask(player)
+        coords = self.geometry.coords
+        while mask:
+            low = mask & -mask
+            moves.append(coords[low.bit_length() - 1])
+            mask ^= low
+        return moves
 
     def make_move(self, x, y, player):
-        if not self.is_valid_move(x, y, player):
+        # Devuelve un registro para deshacer la jugada con unmake_move, o False si no es valida
+        if not self.in_bounds(x, y):
+            return False
+        sq = x * self.size + y
+        bit = 1 << sq
+        if (self.black | self.white) & bit:
             return False
 
-        self.board[x][y] = player
-        opponent = self.opponent(player)
-
-        for dx, dy in DIRECTIONS:
-            nx, ny = x + dx, y + dy
-            to_flip = []
-
-            while self.in_bounds(nx, ny) and self.board[nx][ny] == opponent:
-                to_flip.append((nx, ny))
-                nx += dx
-                ny += dy
-
-            if self.in_bounds(nx, ny) and self.board[nx][ny] == player:
-                for fx, fy in to_flip:
-                    self.board[fx][fy] = player
+        geometry = self.geometry
+        own, opp = self._bitboards(player)
+        flipped = geometry.flips(own, opp, sq)
+        if not flipped:
+            return False
 
+        own |= flipped | bit
+        opp ^= flipped
+        h = self.hash
+        if player == BLACK:
+            self.black, self.white = own, opp
+            h ^= geometry.zobrist_black[sq]
+        else:
+            self.white, self.black = own, opp
+            h ^= geometry.zobrist_white[sq]
+        zobrist_flip = geometry.zobrist_flip
+        f = flipped
+        n = 0
+        while f:
+            low = f & -f
+            h ^= zobrist_flip[low.bit_length() - 1]
+            f ^= low
+            n += 1
+        if player == BLACK:
+            self.black_count += n + 1
+            self.white_count -= n
+        else:
+            self.white_count += n + 1
+            self.black_count -= n
+
+        # El registro guarda las mascaras anteriores para que deshacer restaure la cache
+        undo = (bit, flipped, n, player, self.current_player, self.hash, self._legal_black, self._legal_white)
+        self.hash = h
+        self._legal_black = self._legal_white = None
         self.current_player = self.opponent(player)
-        return True
+        return undo
+
+    def unmake_move(self, undo):
+        bit, flipped, n, player, previous_player, previous_hash, legal_black, legal_white = undo
+        if player == BLACK:
+            self.black ^= flipped | bit
+            self.white |= flipped
+            self.black_count -= n + 1
+            self.white_count += n
+        else:
+            self.white ^= flipped | bit
+            self.black |= flipped
+            self.white_count -= n + 1
+            self.black_count += n
+        self.current_player = previous_player
+        self.hash = previous_hash
+        self._legal_black = legal_black
+        self._legal_white = legal_white
 
     def is_game_over(self):
-        return not self.get_valid_moves(BLACK) and not self.get_valid_moves(WHITE)
+        return not self.legal_mask(BLACK) and not self.legal_mask(WHITE)
 
     def count_pieces(self):
-        black = sum(row.count(BLACK) for row in self.board)
-        white = sum(row.count(WHITE) for row in self.board)
-        return black, white
+        return self.black_count, self.white_count
 
     def clone(self):
-        clone_game = OthelloGame()
-        clone_game.board = deepcopy(self.board)
+        clone_game = OthelloGame.__new__(OthelloGame)
+        clone_game.size = self.size
+        clone_game.geometry = self.geometry
+        clone_game.black = self.black
+        clone_game.white = self.white
+        clone_game.hash = self.hash
+        clone_game.black_count = self.black_count
+        clone_game.white_count = self.white_count
+        clone_game._legal_black = self._legal_black
+        clone_game._legal_white = self._legal_white
         clone_game.current_player = self.current_player
         return clone_game
 
@@ -0,0 +1,117 @@
+import numpy as np
+
+from core.bitboard import INITIAL_BLACK, INITIAL_WHITE, FULL, NOT_COL_0, NOT_COL_7
+
+# Mismas direcciones que core.bitboard.SHIFTS, agrupadas por sentido: cada paso desplaza las 4 direcciones de un
+# sentido con una sola operacion sobre un arreglo (B, 4), en vez de una operacion por direccion
+_DIRECTIONS = [
+    (np.left_shift, np.array([1, 7, 8, 9], dtype=np.uint64),
+     np.array([NOT_COL_0, NOT_COL_7, FULL, NOT_COL_0], dtype=np.uint64)),
+    (np.right_shift, np.array([1, 7, 8, 9], dtype=np.uint64),
+     np.array([NOT_COL_7, NOT_COL_0, FULL, NOT_COL_7], dtype=np.uint64)),
+]
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+_SQUARE_BITS = np.left_shift(_ONE, np.arange(64, dtype=np.uint64))
+
+
+def _runs(start, opp):
+    # Por sentido: (desplazamiento, cantidades, mascaras, fichas rivales contiguas a `start` en cada direccion)
+    for shift, amounts, masks in _DIRECTIONS:
+        through = masks & opp[:, None]
+        x = shift(start[:, None], amounts) & through
+        for _ in range(5):
+            x |= shift(x, amounts) & through
+        yield shift, amounts, masks, x
+
+
+def legal_masks(own, opp):
+    moves = np.zeros_like(own)
+    for shift, amounts, masks, x in _runs(own, opp):
+        moves |= np.bitwise_or.reduce(shift(x, amounts) & masks, axis=1)
+    return moves & ~(own | opp)
+
+
+def flip_masks(own, opp, move_bits):
+    flipped = np.zeros_like(own)
+    for shift, amounts, masks, x in _runs(move_bits, opp):
+        bracketed = (shift(x, amounts) & masks & own[:, None]) != _ZERO
+        flipped |= np.bitwise_or.reduce(np.where(bracketed, x, _ZERO), axis=1)
+    return flipped
+
+
+def unpack(bbs):
+    # (B,) uint64 -> (B, 64) bool, columna i = casilla i
+    return (bbs[:, None] & _SQUARE_BITS) != _ZERO
+
+
+def popcounts(bbs):
+    return unpack(bbs).sum(axis=1)
+
+
+class VectorOthelloEnv:
+    # B partidas avanzando en paralelo. to_move es True donde juega BLACK.
+    def __init__(self, batch_size, seed=None):
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self, indices=None):
+        if indices is None:
+            self.black = np.full(self.batch_size, INITIAL_BLACK, dtype=np.uint64)
+            self.white = np.full(self.batch_size, INITIAL_WHITE, dtype=np.uint64)
+            self.to_move = np.ones(self.batch_size, dtype=bool)
+            self.done = np.zeros(self.batch_size, dtype=bool)
+        else:
+            self.black[indices] = INITIAL_BLACK
+            self.white[indices] = INITIAL_WHITE
+            self.to_move[indices] = True
+            self.done[indices] = False
+
+    def sides(self):
+        own = np.where(self.to_move, self.black, self.white)
+        opp = np.where(self.to_move, self.white, self.black)
+        return own, opp
+
+    def legal_masks(self):
+        own, opp = self.sides()
+        return np.where(self.done, _ZERO, legal_masks(own, opp))
+
+    def legal_moves(self):
+        return unpack(self.legal_masks())
+
+    def random_actions(self, legal=None):
+        # Una jugada legal uniforme por partida; -1 si no hay ninguna (pasa)
+        legal = self.legal_moves() if legal is None else legal
+        noise = np.where(legal, self.rng.random(legal.shape), -1.0)
+        actions = noise.argmax(axis=1)
+        return np.where(legal.any(axis=1), actions, -1)
+
+    def step(self, actions):
+        # actions: casilla 0..63 por partida, o -1 para pasar. Las partidas terminadas se ignoran.
+        actions = np.asarray(actions)
+        active = ~self.done & (actions >= 0)
+        move_bits = np.where(active, np.left_shift(_ONE, np.maximum(actions, 0).astype(np.uint64)), _ZERO)
+        own, opp = self.sides()
+        flipped = flip_masks(own, opp, move_bits)
+        own = own | flipped | move_bits
+        opp = opp & ~flipped
+        self.black = np.where(self.to_move, own, opp)
+        self.white = np.where(self.to_move, opp, own)
+        self.to_move = np.where(self.done, self.to_move, ~self.to_move)
+        # Fin de partida: ninguno de los dos jugadores tiene jugadas
+        own, opp = self.sides()
+        stuck = (legal_masks(own, opp) == _ZERO) & (legal_masks(opp, own) == _ZERO)
+        self.done |= stuck
+        return self.done.copy()
+
+    def counts(self):
+        return popcounts(self.black), popcounts(self.white)
+
+    def rewards(self, black_player=True):
+        # +1/-1/0 en partidas terminadas desde el punto de vista del color indicado, 0 en las demas
+        black, white = self.counts()
+        diff = np.sign(black.astype(np.int64) - white.astype(np.int64))
+        if not black_player:
+            diff = -diff
+        return np.where(self.done, diff, 0)
@@ -0,0 +1,37 @@
+import random
+
+# Claves fijas (semilla constante) para que los hashes sean reproducibles entre procesos
+_rng = random.Random(0x0E7E110)
+
+ZOBRIST_BLACK = [_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_WHITE = [_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_FLIP = [b ^ w for b, w in zip(ZOBRIST_BLACK, ZOBRIST_WHITE)]
+ZOBRIST_TURN = _rng.getrandbits(64)  # se aplica cuando juega WHITE
+
+# Tableros de mas de 64 casillas: las primeras 64 claves son las de arriba y el resto sale de otra semilla fija
+_extra_rng = random.Random(0x0E7E111)
+_EXTRA_BLACK = []
+_EXTRA_WHITE = []
+
+
+def zobrist_keys(squares):
+    # (claves negras, claves blancas, claves de volteo) para un tablero de `squares` casillas
+    if squares <= 64:
+        return ZOBRIST_BLACK[:squares], ZOBRIST_WHITE[:squares], ZOBRIST_FLIP[:squares]
+    while len(_EXTRA_BLACK) < squares - 64:
+        _EXTRA_BLACK.append(_extra_rng.getrandbits(64))
+        _EXTRA_WHITE.append(_extra_rng.getrandbits(64))
+    black = ZOBRIST_BLACK + _EXTRA_BLACK[:squares - 64]
+    white = ZOBRIST_WHITE + _EXTRA_WHITE[:squares - 64]
+    return black, white, [b ^ w for b, w in zip(black, white)]
+
+
+def zobrist_hash(black, white, keys_black=ZOBRIST_BLACK, keys_white=ZOBRIST_WHITE):
+    h = 0
+    for sq in range(len(keys_black)):
+        bit = 1 << sq
+        if black & bit:
+            h ^= keys_black[sq]
+        elif white & bit:
+            h ^= keys_white[sq]
+    return h
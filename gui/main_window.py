@@ -1,27 +1,60 @@
+import time
+
+# Referencia para medir el tiempo hasta el primer cuadro y la primera jugada
+STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 from core.game import OthelloGame, BLACK, WHITE
-from algoritmos.minimax import MinimaxAgent
-from algoritmos.humano import HumanoAgent
-from algoritmos.alphabeta import AlphaBetaAgent
-from algoritmos.reinforcement import QLearningAgent
-import time
+from algoritmos.registry import create_agent
+from algoritmos.search import SearchTimeout
+import queue
+import threading
 import os
 
+# Cada cuantos milisegundos se revisa si el agente termino y se actualiza el progreso
+POLL_MS = 100
+# Registro de las busquedas instrumentadas: una linea JSON por jugada
+SEARCH_LOG = "search_log.jsonl"
+# Tamanos de tablero ofrecidos; libro, tabla Q guardada y solucionador de finales son solo de 8x8
+BOARD_SIZES = [8, 10, 12]
+
 class OthelloGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Othello")
-        self.board_buttons = [[None for _ in range(8)] for _ in range(8)]
-        self.game = OthelloGame()
+        self.board_size = tk.IntVar(value=8)
+        self.game = OthelloGame(self.board_size.get())
+        self.board_buttons = []
+        self.board_frame = None
         self.metrics_tree = None
 
         self.black_player_type = tk.StringVar(value="Humano")
         self.white_player_type = tk.StringVar(value="Humano")
         self.depth_black = tk.IntVar(value=0)
         self.depth_white = tk.IntVar(value=0)
+        # Tiempo por jugada en segundos; 0 usa profundidad fija
+        self.time_black = tk.DoubleVar(value=0.0)
+        self.time_white = tk.DoubleVar(value=0.0)
         self.agents = {BLACK: None, WHITE: None}
-        self.q_agent_file = "q_agent.pkl"
+        # Se prefiere la tabla binaria (carga casi instantanea); el pickle queda como alternativa
+        self.q_agent_files = ["q_agent.qtb", "q_agent.pkl"]
+        # Libro de aperturas generado con `python -m algoritmos.book`; se carga una vez y lo comparten los agentes
+        self.book = "book.bin" if os.path.exists("book.bin") else None
+        # Cada algoritmo se importa la primera vez que se elige; los modelos quedan en el cache de algoritmos.registry
+        self.timings = {}
+        self._move_clock = STARTED
+        # Busqueda en curso en un hilo aparte: los resultados llegan por la cola y se aplican en el hilo de Tk.
+        # _generation descarta resultados de partidas reiniciadas mientras el agente pensaba.
+        self._results = queue.Queue()
+        self._generation = 0
+        self._thinking = None
+        self._poll_id = None
+        self.instrument = tk.BooleanVar(value=False)
+        # Minimax y AlphaBeta siguen buscando durante el turno del rival (p. ej. mientras piensa el humano)
+        self.ponder = tk.BooleanVar(value=False)
+        self._instruments = []
+        self._search_log = None
 
         self._setup_ui()
         self.update_board()
@@ -30,26 +63,48 @@ class OthelloGUI:
         self.white_agent = self.create_agent(WHITE)
         self.agents = {BLACK: self.black_agent, WHITE: self.white_agent}
         self.stats = {
-            BLACK: {"time": 0.0, "nodes": 0},
-            WHITE: {"time": 0.0, "nodes": 0}
+            BLACK: {"time": 0.0, "nodes": 0, "depth": 0},
+            WHITE: {"time": 0.0, "nodes": 0, "depth": 0}
         }
 
     def reset_game(self):
-        self.game = OthelloGame()
+        self.cancel_search()
+        for agent in self.agents.values():
+            if hasattr(agent, "stop_pondering"):
+                agent.stop_pondering()
+        self.game = OthelloGame(self.board_size.get())
+        if len(self.board_buttons) != self.game.size:
+            self._build_board()
         self.reset_stats()
+        self._move_clock = time.perf_counter()
+        self.timings.pop("first_move", None)
         self.black_agent = self.create_agent(BLACK)
         self.white_agent = self.create_agent(WHITE)
         self.agents = {BLACK: self.black_agent, WHITE: self.white_agent}
+        self._instrument_agents()
         self.info_label.config(text="")
         if self.metrics_tree:
             for row in self.metrics_tree.get_children():
                 self.metrics_tree.delete(row)
         self.update_board()
 
+    def _instrument_agents(self):
+        for instrumentation in self._instruments:
+            instrumentation.disable()
+        self._instruments = []
+        if not self.instrument.get():
+            return
+        from algoritmos.instrumentation import Instrumentation
+        if self._search_log is None:
+            self._search_log = open(SEARCH_LOG, "a")
+        for agent in (self.black_agent, self.white_agent):
+            if agent is not None:
+                self._instruments.append(Instrumentation(agent, self._search_log).enable())
+
     def reset_stats(self):
         self.stats = {
-            BLACK: {"time": 0.0, "nodes": 0},
-            WHITE: {"time": 0.0, "nodes": 0}
+            BLACK: {"time": 0.0, "nodes": 0, "depth": 0},
+            WHITE: {"time": 0.0, "nodes": 0, "depth": 0}
         }
 
 
@@ -59,7 +114,7 @@ class OthelloGUI:
 
         ttk.Label(top_frame, text="Jugador Negro:").grid(row=0, column=0)
         black_player_menu = ttk.Combobox(top_frame, textvariable=self.black_player_type,
-                                         values=["Humano", "Minimax", "AlphaBeta", "RL"], width=12)
+                                         values=["Humano", "Minimax", "AlphaBeta", "RL", "MCTS"], width=12)
         black_player_menu.grid(row=0, column=1)
         black_player_menu.bind("<<ComboboxSelected>>", lambda e: self._update_depth_state(BLACK))
 
@@ -67,9 +122,13 @@ class OthelloGUI:
         self.depth_black_entry = ttk.Entry(top_frame, textvariable=self.depth_black, width=5)
         self.depth_black_entry.grid(row=0, column=3)
 
+        ttk.Label(top_frame, text="Tiempo Negro (s):").grid(row=0, column=4)
+        self.time_black_entry = ttk.Entry(top_frame, textvariable=self.time_black, width=5)
+        self.time_black_entry.grid(row=0, column=5)
+
         ttk.Label(top_frame, text="Jugador Blanco:").grid(row=1, column=0)
         white_player_menu = ttk.Combobox(top_frame, textvariable=self.white_player_type,
-                                         values=["Humano", "Minimax", "AlphaBeta", "RL"], width=12)
+                                         values=["Humano", "Minimax", "AlphaBeta", "RL", "MCTS"], width=12)
         white_player_menu.grid(row=1, column=1)
         white_player_menu.bind("<<ComboboxSelected>>", lambda e: self._update_depth_state(WHITE))
 
@@ -77,41 +136,68 @@ class OthelloGUI:
         self.depth_white_entry = ttk.Entry(top_frame, textvariable=self.depth_white, width=5)
         self.depth_white_entry.grid(row=1, column=3)
 
-        ttk.Button(top_frame, text="Empezar", command=self.reset_game).grid(row=0, column=4, rowspan=2, padx=10)
+        ttk.Label(top_frame, text="Tiempo Blanco (s):").grid(row=1, column=4)
+        self.time_white_entry = ttk.Entry(top_frame, textvariable=self.time_white, width=5)
+        self.time_white_entry.grid(row=1, column=5)
+
+        ttk.Button(top_frame, text="Empezar", command=self.reset_game).grid(row=0, column=6, rowspan=2, padx=10)
+        ttk.Checkbutton(top_frame, text="Instrumentar", variable=self.instrument).grid(row=0, column=7)
+        ttk.Checkbutton(top_frame, text="Pensar en turno rival", variable=self.ponder).grid(row=1, column=7)
+        ttk.Label(top_frame, text="Tablero:").grid(row=0, column=8)
+        ttk.Combobox(top_frame, textvariable=self.board_size, values=BOARD_SIZES, width=4,
+                     state="readonly").grid(row=1, column=8)
 
         self.info_label = ttk.Label(self.root, text="")
         self.info_label.pack(pady=5)
 
         # Tablero
-        board_frame = ttk.Frame(self.root)
-        board_frame.pack()
-        for i in range(8):
-            for j in range(8):
-                btn = tk.Button(board_frame, width=4, height=2, bg="green",
-                                command=lambda x=i, y=j: self.player_move(x, y))
-                btn.grid(row=i, column=j)
-                self.board_buttons[i][j] = btn
+        self.board_frame = ttk.Frame(self.root)
+        self.board_frame.pack()
+        self._build_board()
 
         # Tabla de métricas
-        self.metrics_tree = ttk.Treeview(self.root, columns=("Jugador", "Algoritmo", "Tiempo", "Nodos"), show="headings", height=2)
+        self.metrics_tree = ttk.Treeview(self.root, columns=("Jugador", "Algoritmo", "Tiempo", "Nodos", "Profundidad", "Nodos/s"), show="headings", height=2)
         self.metrics_tree.heading("Jugador", text="Jugador")
         self.metrics_tree.heading("Algoritmo", text="Algoritmo")
         self.metrics_tree.heading("Tiempo", text="Tiempo (s)")
         self.metrics_tree.heading("Nodos", text="Nodos")
+        self.metrics_tree.heading("Profundidad", text="Prof. max")
+        self.metrics_tree.heading("Nodos/s", text="Nodos/s")
         self.metrics_tree.pack(pady=10)
 
         self._update_depth_state(BLACK)
         self._update_depth_state(WHITE)
 
+    def _build_board(self):
+        # Una grilla de botones del tamano del juego actual; con tableros grandes los botones se achican
+        for row in self.board_buttons:
+            for btn in row:
+                btn.destroy()
+        size = self.game.size
+        width, height = (4, 2) if size <= 8 else (3, 1)
+        self.board_buttons = [[None for _ in range(size)] for _ in range(size)]
+        for i in range(size):
+            for j in range(size):
+                btn = tk.Button(self.board_frame, width=width, height=height, bg="green",
+                                command=lambda x=i, y=j: self.player_move(x, y))
+                btn.grid(row=i, column=j)
+                self.board_buttons[i][j] = btn
+
     def _update_depth_state(self, player):
         tipo = self.black_player_type.get() if player == BLACK else self.white_player_type.get()
-        entry = self.depth_black_entry if player == BLACK else self.depth_white_entry
-        entry.config(state="normal" if tipo in ["Minimax", "AlphaBeta"] else "disabled")
+        state = "normal" if tipo in ["Minimax", "AlphaBeta"] else "disabled"
+        depth_entry, time_entry = ((self.depth_black_entry, self.time_black_entry) if player == BLACK
+                                   else (self.depth_white_entry, self.time_white_entry))
+        depth_entry.config(state=state)
+        # MCTS no usa nivel: solo tiempo por jugada (0 = cantidad fija de simulaciones)
+        time_entry.config(state="normal" if tipo == "MCTS" else state)
 
     def update_board(self):
-        for i in range(8):
-            for j in range(8):
-                val = self.game.board[i][j]
+        board = self.game.board
+        size = self.game.size
+        for i in range(size):
+            for j in range(size):
+                val = board[i][j]
                 btn = self.board_buttons[i][j]
                 if val == BLACK:
                     btn.config(text="B", bg="black", fg="white")
@@ -125,7 +211,8 @@ class OthelloGUI:
         else:
             current = self.game.current_player
             if self.agents[current]:
-                self.root.after(500, self.agent_move)
+                # Sin demora fija: el tablero se dibuja y enseguida empieza la busqueda
+                self.root.after_idle(self.agent_move)
 
     def player_move(self, x, y):
         current = self.game.current_player
@@ -133,17 +220,16 @@ class OthelloGUI:
            (current == WHITE and self.white_player_type.get() != "Humano"):
             return
         if self.game.make_move(x, y, current):
+            self._first_move()
             self.update_board()
 
     def agent_move(self):
+        if self._thinking is not None:
+            return
         current = self.game.current_player
 
         if not hasattr(self, "stats"):
             self.reset_stats()
-            self.stats = {
-                BLACK: {"time": 0.0, "nodes": 0},
-                WHITE: {"time": 0.0, "nodes": 0}
-            }
 
         valid_moves_current = self.game.get_valid_moves(current)
         opponent = BLACK if current == WHITE else WHITE
@@ -155,26 +241,116 @@ class OthelloGUI:
                 return
             else:
                 self.game.current_player = opponent
-                self.root.after(500, self.agent_move)
+                self.root.after_idle(self.agent_move)
                 return
 
-        start_time = time.time()
-        if current == BLACK:
-            move, nodes, _ = self.black_agent.get_move(self.game)
+        agent = self.agents[current]
+        self._thinking = {"player": current, "agent": agent, "start": time.perf_counter()}
+        # El agente busca sobre una copia: el tablero de la ventana no cambia mientras piensa
+        threading.Thread(target=self._search_worker, args=(agent, self.game.clone(), current, self._generation),
+                         daemon=True).start()
+        self._poll_id = self.root.after(POLL_MS, self._poll_search)
+
+    def _search_worker(self, agent, game, player, generation):
+        start_time = time.perf_counter()
+        try:
+            move, nodes, _ = agent.get_move(game)
+        except SearchTimeout:
+            return  # cancelada
+        except Exception as e:
+            # El error se muestra en el hilo de Tk; sin esto la ventana quedaria esperando la jugada
+            self._results.put((generation, player, None, 0, time.perf_counter() - start_time, e))
+            return
+        self._results.put((generation, player, move, nodes, time.perf_counter() - start_time, None))
+
+    def _poll_search(self):
+        self._poll_id = None
+        while True:
+            try:
+                generation, current, move, nodes, elapsed, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                if error is not None:
+                    self._search_failed(current, error)
+                else:
+                    self._apply_agent_move(current, move, nodes, elapsed)
+                return
+        if self._thinking is not None:
+            self._show_progress()
+            self._poll_id = self.root.after(POLL_MS, self._poll_search)
+
+    def _show_progress(self):
+        # Lee los contadores del agente mientras busca (enteros: la lectura desde este hilo es segura)
+        player, agent = self._thinking["player"], self._thinking["agent"]
+        elapsed = time.perf_counter() - self._thinking["start"]
+        nodes = getattr(agent, "nodes_expanded", 0)
+        values = ("Negras" if player == BLACK else "Blancas", f"{agent.name} (pensando)", f"{elapsed:.2f}",
+                  nodes, getattr(agent, "depth_reached", 0), f"{nodes / elapsed:.0f}" if elapsed else "-")
+        if self.metrics_tree.exists("progress"):
+            self.metrics_tree.item("progress", values=values)
         else:
-            move, nodes, _ = self.white_agent.get_move(self.game)
-        elapsed = time.time() - start_time
+            self.metrics_tree.insert("", "end", iid="progress", values=values)
+
+    def _search_failed(self, current, error):
+        # La partida queda detenida en esta posicion hasta Empezar
+        agent = self._thinking["agent"]
+        self._thinking = None
+        if self.metrics_tree.exists("progress"):
+            self.metrics_tree.delete("progress")
+        color = "Negras" if current == BLACK else "Blancas"
+        self.info_label.config(text=f"Error de {agent.name} ({color}): {type(error).__name__}: {error}")
+
+    def _apply_agent_move(self, current, move, nodes, elapsed):
+        agent = self._thinking["agent"]
+        self._thinking = None
+        if self.metrics_tree.exists("progress"):
+            self.metrics_tree.delete("progress")
 
         self.stats[current]["time"] += elapsed
         self.stats[current]["nodes"] += nodes
+        self.stats[current]["depth"] = max(self.stats[current]["depth"], getattr(agent, "depth_reached", 0))
 
         if move:
             self.game.make_move(*move, current)
+            self._first_move()
+            if hasattr(agent, "ponder") and not self.game.is_game_over():
+                agent.ponder(self.game)
         self.update_board()
 
+    def show_first_frame(self):
+        self.timings["first_frame"] = time.perf_counter() - STARTED
+        print(f"Primer cuadro: {self.timings['first_frame']:.3f} s")
+
+    def _first_move(self):
+        # Desde el inicio del programa (o desde Empezar) hasta la primera jugada aplicada al tablero
+        if "first_move" not in self.timings:
+            self.timings["first_move"] = time.perf_counter() - self._move_clock
+            print(f"Primera jugada: {self.timings['first_move']:.3f} s")
+
+    def cancel_search(self):
+        # Descarta la busqueda en curso (Empezar): el resultado que llegue despues se ignora
+        self._generation += 1
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._thinking is not None:
+            cancel = getattr(self._thinking["agent"], "cancel", None)
+            if cancel is not None:
+                cancel()
+            self._thinking = None
+
     def show_final_metrics(self):
         black, white = self.game.count_pieces()
         result = f"Juego terminado - Negras: {black} | Blancas: {white}"
+        if self._instruments:
+            from algoritmos.instrumentation import summarize
+        for instrumentation in self._instruments:
+            summary = summarize(instrumentation.records)
+            result += (f"\n{instrumentation.agent.name}: factor de ramificacion {summary['ebf']}, "
+                       f"cortes {summary['cutoffs']}, evaluaciones {summary['leaf_evals']}")
+        if self._search_log is not None:
+            self._search_log.flush()
         self.info_label.config(text=result)
 
         for row in self.metrics_tree.get_children():
@@ -185,24 +361,39 @@ class OthelloGUI:
             alg = agent.name if agent else "Humano"
             tiempo = self.stats[player]["time"] if hasattr(self, "stats") else 0
             nodos = self.stats[player]["nodes"] if hasattr(self, "stats") else 0
-            self.metrics_tree.insert("", "end", values=(name, alg, f"{tiempo:.2f}", nodos))
+            profundidad = self.stats[player]["depth"] if hasattr(self, "stats") else 0
+            nps = f"{nodos / tiempo:.0f}" if tiempo else "-"
+            self.metrics_tree.insert("", "end", values=(name, alg, f"{tiempo:.2f}", nodos, profundidad, nps))
 
     def create_agent(self, player):
         tipo = self.black_player_type.get() if player == BLACK else self.white_player_type.get()
         depth = self.depth_black.get() if player == BLACK else self.depth_white.get()
+        time_limit = (self.time_black.get() if player == BLACK else self.time_white.get()) or None
 
+        size = self.game.size
+        book = self.book if size == 8 else None
         if tipo == "Minimax":
-            return MinimaxAgent(depth, player)
+            return create_agent("minimax", player, max_depth=depth, time_limit=time_limit, book=book,
+                                ponder=self.ponder.get())
         elif tipo == "AlphaBeta":
-            return AlphaBetaAgent(depth, player)
+            return create_agent("alphabeta", player, max_depth=depth, time_limit=time_limit, book=book,
+                                ponder=self.ponder.get())
         elif tipo == "RL":
-            agent = QLearningAgent(player)
-            if os.path.exists(self.q_agent_file):
-                agent.load(self.q_agent_file)
+            agent = create_agent("rl", player, size=size)
+            # Las tablas guardadas son de 8x8: en otros tamanos el agente empieza sin experiencia
+            for path in self.q_agent_files if size == 8 else []:
+                if os.path.exists(path):
+                    # La tabla se lee una sola vez: Empezar reutiliza la ya cargada mientras el archivo no cambie
+                    agent.load(path, shared=True)
+                    break
             return agent
+        elif tipo == "MCTS":
+            return create_agent("mcts", player, time_limit=time_limit)
         else:
             return None
 if __name__ == "__main__":
     root = tk.Tk()
     app = OthelloGUI(root)
+    root.update()
+    app.show_first_frame()
     root.mainloop()
\ No newline at end of file
@@ -2,27 +2,77 @@ import time
 from core.game import OthelloGame, BLACK, WHITE
 from algoritmos.minimax import MinimaxAgent
 from algoritmos.alphabeta import AlphaBetaAgent
-from algoritmos.reinforcement import QLearningAgent
+from algoritmos.instrumentation import Instrumentation, summarize
 
 
-def play_game(agent_black, agent_white):
-    game = OthelloGame()
+def play_game(agent_black, agent_white, game=None, instrument=False, sink=None, ponder=False):
+    # game permite empezar desde una apertura ya jugada; si no, desde la posicion inicial.
+    # Con instrument se miden ambos agentes durante la partida (sink: archivo para los registros JSON por jugada).
+    # Con ponder, los agentes creados con ponder=True buscan durante el turno del rival. Corren en el mismo
+    # proceso, asi que el tiempo medido del rival incluye la competencia por el interprete.
+    game = game.clone() if game is not None else OthelloGame()
+    instruments = [Instrumentation(a, sink).enable() for a in (agent_black, agent_white)] if instrument else []
+    try:
+        return _play(agent_black, agent_white, game, ponder)
+    finally:
+        for instrumentation in instruments:
+            instrumentation.disable()
+        for agent in (agent_black, agent_white):
+            if hasattr(agent, "stop_pondering"):
+                agent.stop_pondering()
+
+
+def _play(agent_black, agent_white, game, ponder=False):
     total_times = {BLACK: 0.0, WHITE: 0.0}
     total_nodes = {BLACK: 0, WHITE: 0}
+    move_times = {BLACK: [], WHITE: []}
+    move_nodes = {BLACK: [], WHITE: []}
+    moves = []
+    depths = {BLACK: [], WHITE: []}
+    book_hits = {BLACK: 0, WHITE: 0}
+    ponder_hits = {BLACK: 0, WHITE: 0}
+    searches = {BLACK: [], WHITE: []}
+    total_tt = {BLACK: {"probes": 0, "hits": 0, "cutoffs": 0}, WHITE: {"probes": 0, "hits": 0, "cutoffs": 0}}
 
     while not game.is_game_over():
         current = game.current_player
         agent = agent_black if current == BLACK else agent_white
 
-        start = time.time()
+        if hasattr(agent, "last_search"):
+            agent.last_search = None
+        start = time.perf_counter()
         move, nodes, elapsed = agent.get_move(game)
-        end = time.time()
+        end = time.perf_counter()
+        if getattr(agent, "last_search", None) is not None:
+            searches[current].append(agent.last_search)
+
+        if getattr(agent, "ponder_hit", False):
+            ponder_hits[current] += 1
+        if getattr(agent, "book_hit", False):
+            book_hits[current] += 1
+        elif move and hasattr(agent, "depth_reached"):
+            depths[current].append(agent.depth_reached)
+
+        tt = getattr(agent, "tt", None)
+        if tt is not None:
+            for key in total_tt[current]:
+                total_tt[current][key] += getattr(tt, key)
 
         if move:
             game.make_move(*move, current)
+            moves.append([current, move[0], move[1]])
+            if ponder and hasattr(agent, "ponder"):
+                agent.ponder(game)
+        else:
+            # Sin jugadas validas: se pasa el turno
+            game.current_player = game.opponent(current)
 
-        total_times[current] += elapsed if elapsed else (end - start)
+        move_time = elapsed if elapsed else (end - start)
+        total_times[current] += move_time
         total_nodes[current] += nodes if nodes else 0
+        if move:
+            move_times[current].append(move_time)
+            move_nodes[current].append(nodes or 0)
 
     black_score, white_score = game.count_pieces()
     result = {
@@ -32,44 +82,87 @@ def play_game(agent_black, agent_white):
         "black_time": round(total_times[BLACK], 3),
         "white_time": round(total_times[WHITE], 3),
         "black_nodes": total_nodes[BLACK],
-        "white_nodes": total_nodes[WHITE]
+        "white_nodes": total_nodes[WHITE],
+        # Profundidad media alcanzada por jugada (relevante con time_limit)
+        "black_depth": round(sum(depths[BLACK]) / len(depths[BLACK]), 2) if depths[BLACK] else 0,
+        "white_depth": round(sum(depths[WHITE]) / len(depths[WHITE]), 2) if depths[WHITE] else 0,
+        # Jugadas tomadas del libro de aperturas, sin busqueda
+        "black_book_hits": book_hits[BLACK],
+        "white_book_hits": book_hits[WHITE],
     }
+    if ponder:
+        result["black_ponder_hits"] = ponder_hits[BLACK]
+        result["white_ponder_hits"] = ponder_hits[WHITE]
+    for color, prefix in [(BLACK, "black"), (WHITE, "white")]:
+        for key, value in total_tt[color].items():
+            result[f"{prefix}_tt_{key}"] = value
+        result[f"{prefix}_move_times"] = move_times[color]
+        result[f"{prefix}_move_nodes"] = move_nodes[color]
+        if searches[color]:
+            result[f"{prefix}_search"] = summarize(searches[color])
+    result["moves"] = moves
     return result
 
 
-def run_experiments():
+def tt_rate(count, probes):
+    return f"{100 * count / probes:.1f}%" if probes else "-"
+
+
+def reference_positions(level):
+    # Posiciones en las que juega W en una partida Minimax (B) vs AlphaBeta sin tabla ni orden (W)
+    positions = []
+    game = OthelloGame()
+    agents = {BLACK: MinimaxAgent(max_depth=level, player=BLACK),
+              WHITE: AlphaBetaAgent(max_depth=level, player=WHITE, tt_size_mb=0, ordering=False, endgame_empties=0)}
+    while not game.is_game_over():
+        current = game.current_player
+        if current == WHITE:
+            positions.append(game.clone())
+        move, _, _ = agents[current].get_move(game)
+        if move:
+            game.make_move(*move, current)
+        else:
+            game.current_player = game.opponent(current)
+    return positions
+
+
+def replay_positions(agent, positions):
+    # Busca las mismas posiciones en orden, como en una partida, para comparar configuraciones
+    totals = {"nodes": 0, "probes": 0, "hits": 0, "cutoffs": 0}
+    for position in positions:
+        _, nodes, _ = agent.get_move(position)
+        totals["nodes"] += nodes
+        if agent.tt is not None:
+            totals["probes"] += agent.tt.probes
+            totals["hits"] += agent.tt.hits
+            totals["cutoffs"] += agent.tt.cutoffs
+    return totals
+
+
+def reduction(before, after):
+    return f"{100 * (before - after) / before:.1f}%" if before else "-"
+
+
+def run_experiments(games=10, workers=None):
+    from tournament import run_tournament, default_pairings, print_summary
+
     levels = [2, 3, 4]  # puedes modificar estos niveles según tiempo disponible
-    print("| Algoritmo B | Nivel B | Algoritmo W | Nivel W | Winner | B_Time | W_Time | B_Nodes | W_Nodes |")
-    print("|-------------|---------|-------------|---------|--------|--------|--------|---------|---------|")
+    # Cada enfrentamiento se juega `games` veces con aperturas aleatorias y colores alternados, en paralelo
+    summary = run_tournament(default_pairings(levels), games=games, workers=workers)
+    print_summary(summary)
 
+    print()
+    print("| Nivel | Sin TT ni orden | Solo orden | Reduccion | Solo TT | Reduccion | TT + orden | Reduccion | TT hits | TT cortes |")
+    print("|-------|-----------------|------------|-----------|---------|-----------|------------|-----------|---------|-----------|")
     for level in levels:
-        # Minimax vs AlphaBeta
-        b_agent = MinimaxAgent(max_depth=level, player=BLACK)
-        w_agent = AlphaBetaAgent(max_depth=level, player=WHITE)
-        res = play_game(b_agent, w_agent)
-        print(f"| Minimax     | {level:<7}| AlphaBeta  | {level:<7}| {res['winner']:<6} | {res['black_time']:<6} | {res['white_time']:<6} | {res['black_nodes']:<7} | {res['white_nodes']:<7} |")
-
-        # AlphaBeta vs QLearning
-        b_agent = AlphaBetaAgent(max_depth=level, player=BLACK)
-        q_agent = QLearningAgent(player=WHITE)
-        try:
-            q_agent.load("q_agent.pkl")
-        except:
-            q_agent.train(500)
-            q_agent.save("q_agent.pkl")
-        res = play_game(b_agent, q_agent)
-        print(f"| AlphaBeta   | {level:<7}| QLearning  | -       | {res['winner']:<6} | {res['black_time']:<6} | {res['white_time']:<6} | {res['black_nodes']:<7} | {res['white_nodes']:<7} |")
-
-        # Minimax vs QLearning
-        b_agent = MinimaxAgent(max_depth=level, player=BLACK)
-        q_agent = QLearningAgent(player=WHITE)
-        try:
-            q_agent.load("q_agent.pkl")
-        except:
-            q_agent.train(500)
-            q_agent.save("q_agent.pkl")
-        res = play_game(b_agent, q_agent)
-        print(f"| Minimax     | {level:<7}| QLearning  | -       | {res['winner']:<6} | {res['black_time']:<6} | {res['white_time']:<6} | {res['black_nodes']:<7} | {res['white_nodes']:<7} |")
+        # Sin solucionador de finales, para comparar solo la busqueda a profundidad fija
+        positions = reference_positions(level)
+        base = replay_positions(AlphaBetaAgent(level, WHITE, tt_size_mb=0, ordering=False, endgame_empties=0), positions)["nodes"]
+        ordered = replay_positions(AlphaBetaAgent(level, WHITE, tt_size_mb=0, endgame_empties=0), positions)["nodes"]
+        tt_only = replay_positions(AlphaBetaAgent(level, WHITE, ordering=False, endgame_empties=0), positions)["nodes"]
+        both = replay_positions(AlphaBetaAgent(level, WHITE, endgame_empties=0), positions)
+        print(f"| {level:<5} | {base:<15} | {ordered:<10} | {reduction(base, ordered):<9} | {tt_only:<7} | {reduction(base, tt_only):<9} "
+              f"| {both['nodes']:<10} | {reduction(base, both['nodes']):<9} | {tt_rate(both['hits'], both['probes']):<7} | {tt_rate(both['cutoffs'], both['probes']):<9} |")
 
 
 if __name__ == "__main__":
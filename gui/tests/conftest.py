@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los modulos del proyecto se importan como `core.*` y `algoritmos.*` desde gui/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
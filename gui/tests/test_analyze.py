@@ -0,0 +1,74 @@
+import json
+import subprocess
+import sys
+import os
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.minimax import MinimaxAgent
+from metrics import play_game
+from analyze import analyze_stream, make_spec, parse_board, DEFAULT_DEPTH
+from tournament import agent_spec
+
+INITIAL = "-" * 27 + "WB" + "-" * 6 + "BW" + "-" * 27
+
+
+def without_times(results):
+    for result in results:
+        for analysis in result.get("positions", [result]):
+            analysis.pop("elapsed", None)
+    return results
+
+
+def test_board_text_matches_initial_position():
+    game = parse_board(INITIAL + " B")
+    assert (game.black, game.white, game.current_player) == (OthelloGame().black, OthelloGame().white, BLACK)
+
+
+def test_stream_in_order_with_workers():
+    record = play_game(MinimaxAgent(1, BLACK), MinimaxAgent(1, WHITE))
+    record["id"] = "g1"
+    lines = [INITIAL + " B", json.dumps({"black": OthelloGame().black, "white": OthelloGame().white, "to_move": "W"}),
+             "no es una posicion", json.dumps(record)] * 3
+    spec = make_spec("minimax", 1)
+    serial = without_times(list(analyze_stream(lines, spec, workers=1, chunk_size=2)))
+    parallel = without_times(list(analyze_stream(lines, spec, workers=2, chunk_size=2)))
+    assert serial == parallel
+    assert [r["line"] for r in serial] == list(range(1, 13))
+    assert serial[0]["move"] and serial[1]["to_move"] == WHITE and "error" in serial[2]
+    # Minimax de profundidad 1 contra si mismo: el analisis repite cada jugada
+    assert serial[3]["id"] == "g1" and all(p["match"] for p in serial[3]["positions"])
+
+
+def test_does_not_import_tk():
+    gui = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, analyze; print('tkinter' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=gui, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_larger_board_positions(tmp_path, monkeypatch):
+    # Sin tabla Q en el directorio: el agente Q juega con una tabla vacia del tamano del tablero
+    monkeypatch.chdir(tmp_path)
+    initial = OthelloGame(10)
+    board = "".join("B" if initial.black >> sq & 1 else "W" if initial.white >> sq & 1 else "-" for sq in range(100))
+    for kind in ("rl", "alphabeta"):
+        result = list(analyze_stream([board + " B"], make_spec(kind, 2)))[0]
+        assert "error" not in result
+        assert tuple(result["move"]) in initial.get_valid_moves(BLACK)
+
+
+def test_agent_errors_are_reported_per_line():
+    # Un parametro invalido falla al construir el agente: cada linea lo informa y el pool sigue funcionando
+    spec = agent_spec("alphabeta", max_depth=1, no_existe=True)
+    for workers in (1, 2):
+        results = list(analyze_stream([INITIAL + " B", "no es una posicion", INITIAL + " W"], spec, workers=workers))
+        assert [r["line"] for r in results] == [1, 2, 3]
+        assert all("error" in r for r in results)
+        assert results[0]["error"].startswith("TypeError")
+
+
+def test_spec_defaults():
+    assert make_spec("alphabeta")["params"]["max_depth"] == DEFAULT_DEPTH
+    assert make_spec("alphabeta", time_limit=1.0)["params"] == {"max_depth": 0, "time_limit": 1.0}
+    assert make_spec("minimax", 3, 1.0)["params"]["max_depth"] == 3
+    assert make_spec("rl")["params"]["epsilon"] == 0.0
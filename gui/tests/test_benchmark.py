@@ -0,0 +1,27 @@
+from core.game import OthelloGame
+from benchmark import perft, PERFT_INITIAL, compare, bench_board_sizes
+
+
+def test_perft_initial_position():
+    game = OthelloGame()
+    for depth in range(1, 6):
+        assert perft(game, depth) == PERFT_INITIAL[depth]
+    assert game.black == OthelloGame().black and game.white == OthelloGame().white
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"rate": {"value": 100, "unit": "x"}, "latency": {"value": 1.0, "unit": "s", "lower_is_better": True},
+                            "nodes": {"value": 56, "unit": "hojas", "exact": True}}}
+    current = {"results": {"rate": {"value": 90, "unit": "x"}, "latency": {"value": 1.3, "unit": "s", "lower_is_better": True},
+                           "nodes": {"value": 57, "unit": "hojas", "exact": True}}}
+    names = [name for name, *_ in compare(current, baseline, threshold=0.15)]
+    assert names == ["latency", "nodes"]
+
+
+def test_search_node_counts_use_the_threshold():
+    results = bench_board_sizes([10], 1, (1, 1), 1)
+    search = {name: entry for name, entry in results.items() if name.endswith(".nodes") and ".perft." not in name}
+    assert search and all(not entry.get("exact") and entry["lower_is_better"] for entry in search.values())
+    baseline = {"results": {name: dict(entry) for name, entry in search.items()}}
+    current = {"results": {name: dict(entry, value=entry["value"] * 1.05) for name, entry in search.items()}}
+    assert compare(current, baseline, threshold=0.15) == []
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from core.bitboard import board_geometry
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.mcts import MCTSAgent
+from algoritmos.reinforcement import QLearningAgent
+from benchmark import perft, PERFT_INITIAL
+
+
+def test_initial_position_and_perft_on_larger_boards():
+    for size in (10, 12):
+        game = OthelloGame(size)
+        c = size // 2
+        assert game.get_valid_moves(BLACK) == [(c - 2, c - 1), (c - 1, c - 2), (c, c + 1), (c + 1, c)]
+        # Hasta 5 jugadas ninguna ficha llega a un borde: las cuentas son las de 8x8
+        for depth in range(1, 6):
+            assert perft(game, depth) == PERFT_INITIAL[depth]
+
+
+def test_canonical_key_is_the_same_for_every_symmetry():
+    geometry = board_geometry(10)
+    rng = random.Random(0)
+    for _ in range(20):
+        black = rng.getrandbits(100) & rng.getrandbits(100)
+        white = rng.getrandbits(100) & ~black & geometry.full
+        key, _ = geometry.canonical(black, white)
+        for table in geometry.symmetry_squares:
+            b = sum(1 << table[sq] for sq in range(100) if black >> sq & 1)
+            w = sum(1 << table[sq] for sq in range(100) if white >> sq & 1)
+            assert geometry.canonical(b, w)[0] == key
+
+
+@pytest.mark.parametrize("size", [6, 10])
+def test_agents_play_legal_games_on_other_sizes(size):
+    agents = {BLACK: AlphaBetaAgent(2, BLACK), WHITE: MCTSAgent(WHITE, playouts=20, seed=0)}
+    learner = QLearningAgent(WHITE, size=size)
+    for opponent in (agents[WHITE], learner):
+        agents[WHITE] = opponent
+        game = OthelloGame(size)
+        while not game.is_game_over():
+            current = game.current_player
+            if not game.get_valid_moves(current):
+                game.current_player = game.opponent(current)
+                continue
+            move, _, _ = agents[current].get_move(game)
+            assert move in game.get_valid_moves(current)
+            game.make_move(*move, current)
+        assert sum(game.count_pieces()) <= size * size
+    learner.train(2, log_file=None)
+    assert len(learner.q_table) > 0
@@ -0,0 +1,40 @@
+from core.bitboard import symmetries, SYMMETRY_SQUARES
+from core.game import OthelloGame, BLACK, WHITE, COORDS
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.book import OpeningBook, build_book
+from metrics import play_game
+
+
+def test_book_roundtrip_and_symmetric_lookup(tmp_path):
+    book = build_book(plies=3, depth=2)
+    path = tmp_path / "book.bin"
+    book.save(str(path))
+    loaded = OpeningBook.load(str(path))
+    assert loaded.entries == book.entries
+
+    # Tras la primera jugada de negras, las cuatro posiciones son simetricas entre si
+    answers = []
+    for move in OthelloGame().get_valid_moves(BLACK):
+        game = OthelloGame()
+        game.make_move(*move, BLACK)
+        reply = loaded.lookup(game, WHITE)
+        assert reply is not None and game.is_valid_move(*reply, WHITE)
+        answers.append((game, reply))
+
+    base, base_reply = answers[0]
+    base_sq = base_reply[0] * 8 + base_reply[1]
+    for game, reply in answers[1:]:
+        # La posicion puede coincidir con mas de una imagen de la base (es simetrica respecto a una diagonal)
+        images = zip(symmetries(base.black), symmetries(base.white))
+        candidates = {COORDS[SYMMETRY_SQUARES[s][base_sq]] for s, image in enumerate(images)
+                      if image == (game.black, game.white)}
+        assert reply in candidates
+
+
+def test_agents_play_book_moves_without_search():
+    book = build_book(plies=4, depth=2)
+    black = AlphaBetaAgent(2, BLACK, book=book)
+    white = AlphaBetaAgent(2, WHITE, book=book)
+    result = play_game(black, white)
+    assert result["black_book_hits"] == 2 and result["white_book_hits"] == 2
+    assert result["black_move_nodes"][:2] == [0, 0]
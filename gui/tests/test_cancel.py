@@ -0,0 +1,37 @@
+import threading
+import time
+
+import pytest
+
+from core.game import OthelloGame, BLACK
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.minimax import MinimaxAgent
+from algoritmos.mcts import MCTSAgent
+from algoritmos.search import SearchTimeout
+
+
+def cancel_after(agent, delay):
+    timer = threading.Timer(delay, agent.cancel)
+    timer.start()
+    return timer
+
+
+@pytest.mark.parametrize("agent", [AlphaBetaAgent(12, BLACK), MinimaxAgent(9, BLACK)])
+def test_cancel_stops_fixed_depth_search(agent):
+    cancel_after(agent, 0.1)
+    start = time.perf_counter()
+    with pytest.raises(SearchTimeout):
+        agent.get_move(OthelloGame())
+    assert time.perf_counter() - start < 5
+    # El agente sigue sirviendo despues de cancelar
+    agent.max_depth = 1
+    assert agent.get_move(OthelloGame())[0] is not None
+
+
+@pytest.mark.parametrize("agent", [AlphaBetaAgent(0, BLACK, time_limit=60), MCTSAgent(BLACK, time_limit=60)])
+def test_cancel_returns_best_move_so_far_for_anytime_search(agent):
+    cancel_after(agent, 0.1)
+    start = time.perf_counter()
+    move, _, _ = agent.get_move(OthelloGame())
+    assert time.perf_counter() - start < 5
+    assert move in OthelloGame().get_valid_moves(BLACK)
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from core.bitboard import FULL, legal_moves, flips, popcount, iter_bits
+from algoritmos.endgame import EndgameSolver, random_position
+
+
+def negamax(own, opp, passes, passed=False):
+    # Arbol completo sin podas: referencia del resultado exacto (fichas propias menos rivales al terminar)
+    moves = legal_moves(own, opp)
+    if not moves:
+        if passed or not ~(own | opp) & FULL:
+            return popcount(own) - popcount(opp)
+        passes.append((own, opp))
+        return -negamax(opp, own, passes, True)
+    best = None
+    for sq in iter_bits(moves):
+        f = flips(own, opp, sq)
+        value = -negamax(opp ^ f, own | f | (1 << sq), passes)
+        if best is None or value > best:
+            best = value
+    return best
+
+
+def after(own, opp, sq):
+    f = flips(own, opp, sq)
+    return opp ^ f, own | f | (1 << sq)
+
+
+@pytest.mark.parametrize("empties", [3, 5, 7, 8])
+def test_solve_matches_negamax(empties):
+    rng = random.Random(empties)
+    solver = EndgameSolver()
+    for _ in range(6):
+        own, opp = random_position(empties, rng)
+        exact = negamax(own, opp, [])
+        score, sq = solver.solve(own, opp)
+        assert score == exact
+        # La jugada devuelta logra ese puntaje
+        assert -negamax(*after(own, opp, sq), []) == exact
+        # La ventana nula alrededor de 0 acierta ganar/empatar/perder
+        wld, _ = solver._root(own, opp, -1, 1)
+        assert (wld > 0) - (wld < 0) == (exact > 0) - (exact < 0)
+
+
+def test_solve_position_that_needs_a_pass():
+    rng = random.Random(0)
+    solver = EndgameSolver()
+    for _ in range(200):
+        own, opp = random_position(8, rng)
+        passes = []
+        exact = negamax(own, opp, passes)
+        if passes:
+            break
+    else:
+        pytest.fail("no se encontro una posicion con paso")
+    assert solver.solve(own, opp)[0] == exact
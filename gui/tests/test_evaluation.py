@@ -0,0 +1,91 @@
+import random
+
+from core.bitboard import FULL, symmetries
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.evaluation import (PATTERNS, OFFSETS, PatternEvaluator, features, fit, potential_mobility,
+                                   self_play_positions)
+
+
+def random_board(rng):
+    black = white = 0
+    for sq in range(64):
+        r = rng.random()
+        if r < 0.35:
+            black |= 1 << sq
+        elif r < 0.7:
+            white |= 1 << sq
+    return black, white
+
+
+def reference_codes(black, white):
+    codes = []
+    for pattern in PATTERNS:
+        code = 0
+        for i, (x, y) in enumerate(pattern):
+            sq = x * 8 + y
+            code += 3 ** i * (1 if black >> sq & 1 else 2 if white >> sq & 1 else 0)
+        codes.append(code)
+    return tuple(codes)
+
+
+def test_pattern_codes_match_square_lists():
+    rng = random.Random(0)
+    for _ in range(500):
+        black, white = random_board(rng)
+        assert features(black, white)[0] == reference_codes(black, white)
+
+
+def test_score_matches_weights():
+    rng = random.Random(1)
+    weights = [rng.uniform(-1, 1) for _ in range(len(PatternEvaluator.default().weights))]
+    evaluator = PatternEvaluator(weights, mobility=0.5, stability=2.0)
+    for _ in range(200):
+        black, white = random_board(rng)
+        indices, stability = features(black, white)
+        expected = sum(weights[o + i] for o, i in zip(OFFSETS, indices)) + 2.0 * stability + 0.5 * (3 - 5)
+        assert abs(evaluator.score(black, white, 0b111, 0b11111) - expected) < 1e-9
+
+
+def test_default_weights_are_symmetric():
+    rng = random.Random(2)
+    evaluator = PatternEvaluator.default()
+    for _ in range(50):
+        black, white = random_board(rng)
+        values = {round(evaluator.score(b, w, 0, 0), 9) for b, w in zip(symmetries(black), symmetries(white))}
+        assert len(values) == 1
+
+
+def test_fit_reduces_error():
+    positions, targets = self_play_positions(games=4, depth=1, seed=2)
+    _, initial = fit(positions, targets, epochs=0)
+    _, fitted = fit(positions, targets, epochs=30)
+    assert fitted < initial
+
+
+def test_potential_mobility_matches_neighbour_squares():
+    rng = random.Random(3)
+    for _ in range(200):
+        black, white = random_board(rng)
+        expected = []
+        for rival in (white, black):
+            mask = 0
+            for sq in range(64):
+                x, y = divmod(sq, 8)
+                if (black | white) >> sq & 1:
+                    continue
+                if any(0 <= x + dx < 8 and 0 <= y + dy < 8 and rival >> ((x + dx) * 8 + y + dy) & 1
+                       for dx in (-1, 0, 1) for dy in (-1, 0, 1)):
+                    mask |= 1 << sq
+            expected.append(mask)
+        assert potential_mobility(black, white) == tuple(expected)
+
+
+def test_finished_games_get_the_exact_difference():
+    rng = random.Random(4)
+    evaluator = PatternEvaluator.default()
+    black, _ = random_board(rng)
+    game = OthelloGame()
+    game.set_bitboards(black, ~black & FULL)
+    assert game.is_game_over()
+    assert evaluator(game, BLACK) == game.black_count - game.white_count
+    assert evaluator(game, WHITE) == game.white_count - game.black_count
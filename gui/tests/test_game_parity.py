@@ -0,0 +1,210 @@
+import random
+from copy import deepcopy
+
+import pytest
+
+from core.bitboard import FULL, Geometry, legal_moves, flips, iter_bits
+from core.game import OthelloGame, BLACK, WHITE, EMPTY, DIRECTIONS
+
+
+class ListOthelloGame:
+    # Implementacion original con lista de listas, usada como referencia
+    def __init__(self, size=8):
+        self.size = size
+        self.board = [[EMPTY for _ in range(size)] for _ in range(size)]
+        c = size // 2
+        self.board[c - 1][c - 1], self.board[c][c] = WHITE, WHITE
+        self.board[c - 1][c], self.board[c][c - 1] = BLACK, BLACK
+        self.current_player = BLACK
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def opponent(self, player):
+        return BLACK if player == WHITE else WHITE
+
+    def is_valid_move(self, x, y, player):
+        if not self.in_bounds(x, y) or self.board[x][y] != EMPTY:
+            return False
+        opponent = self.opponent(player)
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            has_opponent_between = False
+            while self.in_bounds(nx, ny) and self.board[nx][ny] == opponent:
+                nx += dx
+                ny += dy
+                has_opponent_between = True
+            if has_opponent_between and self.in_bounds(nx, ny) and self.board[nx][ny] == player:
+                return True
+        return False
+
+    def get_valid_moves(self, player):
+        return [(x, y) for x in range(self.size) for y in range(self.size) if self.is_valid_move(x, y, player)]
+
+    def make_move(self, x, y, player):
+        if not self.is_valid_move(x, y, player):
+            return False
+        self.board[x][y] = player
+        opponent = self.opponent(player)
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            to_flip = []
+            while self.in_bounds(nx, ny) and self.board[nx][ny] == opponent:
+                to_flip.append((nx, ny))
+                nx += dx
+                ny += dy
+            if self.in_bounds(nx, ny) and self.board[nx][ny] == player:
+                for fx, fy in to_flip:
+                    self.board[fx][fy] = player
+        self.current_player = self.opponent(player)
+        return True
+
+    def is_game_over(self):
+        return not self.get_valid_moves(BLACK) and not self.get_valid_moves(WHITE)
+
+    def count_pieces(self):
+        black = sum(row.count(BLACK) for row in self.board)
+        white = sum(row.count(WHITE) for row in self.board)
+        return black, white
+
+
+def as_rows(board):
+    return tuple(map(tuple, board))
+
+
+def assert_same_state(game, reference):
+    assert game.board == as_rows(reference.board)
+    assert game.current_player == reference.current_player
+    assert game.count_pieces() == reference.count_pieces()
+    assert game.is_game_over() == reference.is_game_over()
+    for player in (BLACK, WHITE):
+        assert game.get_valid_moves(player) == reference.get_valid_moves(player)
+
+
+def random_playout(seed, size=8):
+    rng = random.Random(seed)
+    game, reference = OthelloGame(size), ListOthelloGame(size)
+    assert_same_state(game, reference)
+    while not reference.is_game_over():
+        player = reference.current_player
+        moves = reference.get_valid_moves(player)
+        if not moves:
+            player = reference.opponent(player)
+            game.current_player = reference.current_player = player
+            moves = reference.get_valid_moves(player)
+        move = rng.choice(moves)
+        assert reference.make_move(*move, player) is True
+        assert game.make_move(*move, player)
+        assert_same_state(game, reference)
+    return game, reference
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_games_match_reference(seed):
+    random_playout(seed)
+
+
+@pytest.mark.parametrize("size", [4, 6, 10, 12])
+@pytest.mark.parametrize("seed", range(3))
+def test_other_board_sizes_match_reference(size, seed):
+    game, _ = random_playout(seed, size)
+    fresh = OthelloGame(size)
+    fresh.set_bitboards(game.black, game.white)
+    assert game.hash == fresh.hash
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_generic_move_generation_matches_64_bit(seed):
+    rng = random.Random(seed)
+    generic = Geometry(8)
+    generic.legal_moves, generic.flips = generic._legal_moves, generic._flips
+    for _ in range(200):
+        black = rng.getrandbits(64) & rng.getrandbits(64)
+        white = rng.getrandbits(64) & ~black & FULL
+        assert generic.legal_moves(black, white) == legal_moves(black, white)
+        for sq in iter_bits(legal_moves(black, white)):
+            assert generic.flips(black, white, sq) == flips(black, white, sq)
+
+
+def test_initial_position():
+    game = OthelloGame()
+    assert game.get_valid_moves(BLACK) == [(2, 3), (3, 2), (4, 5), (5, 4)]
+    assert game.count_pieces() == (2, 2)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_every_square_validity_matches_reference(seed):
+    rng = random.Random(seed)
+    game, reference = OthelloGame(), ListOthelloGame()
+    for _ in range(rng.randint(5, 40)):
+        moves = reference.get_valid_moves(reference.current_player)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        player = reference.current_player
+        game.make_move(*move, player)
+        reference.make_move(*move, player)
+    for player in (BLACK, WHITE):
+        for x in range(-1, 9):
+            for y in range(-1, 9):
+                assert game.is_valid_move(x, y, player) == reference.is_valid_move(x, y, player)
+
+
+def test_invalid_move_is_rejected_without_changes():
+    game = OthelloGame()
+    before = game.board
+    assert game.make_move(0, 0, BLACK) is False
+    assert game.make_move(3, 3, BLACK) is False
+    assert game.board == before
+    assert game.current_player == BLACK
+
+
+def test_clone_is_independent():
+    game = OthelloGame()
+    copy = game.clone()
+    copy.make_move(2, 3, BLACK)
+    assert game.board == as_rows(ListOthelloGame().board)
+    assert copy.board != game.board
+    assert copy.current_player == WHITE and game.current_player == BLACK
+
+
+def test_board_setter_roundtrip():
+    _, reference = random_playout(7)
+    game = OthelloGame()
+    game.board = deepcopy(reference.board)
+    assert game.board == as_rows(reference.board)
+    assert game.count_pieces() == reference.count_pieces()
+
+
+def test_board_is_read_only():
+    game = OthelloGame()
+    with pytest.raises(TypeError):
+        game.board[0][0] = BLACK
+    assert game.board == as_rows(ListOthelloGame().board)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_unmake_move_restores_every_position(seed):
+    rng = random.Random(seed)
+    game = OthelloGame()
+    history = []
+    while not game.is_game_over():
+        player = game.current_player
+        if not game.get_valid_moves(player):
+            player = game.opponent(player)
+        moves = game.get_valid_moves(player)
+        snapshot = (game.black, game.white, game.current_player)
+        undo = game.make_move(*rng.choice(moves), player)
+        assert undo
+        history.append((undo, snapshot))
+    while history:
+        undo, snapshot = history.pop()
+        game.unmake_move(undo)
+        assert (game.black, game.white, game.current_player) == snapshot
+        fresh = OthelloGame()
+        fresh.set_bitboards(game.black, game.white)
+        assert game.count_pieces() == fresh.count_pieces()
+        assert game.hash == fresh.hash
+        for color in (BLACK, WHITE):
+            assert game.get_valid_moves(color) == fresh.get_valid_moves(color)
+    assert game.board == as_rows(ListOthelloGame().board)
@@ -0,0 +1,32 @@
+import io
+import json
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.minimax import MinimaxAgent
+from algoritmos.instrumentation import Instrumentation, effective_branching_factor
+from metrics import play_game
+
+
+def test_records_search_and_restores_agent():
+    agent = AlphaBetaAgent(3, BLACK, endgame_empties=0)
+    sink = io.StringIO()
+    instrumentation = Instrumentation(agent, sink).enable()
+    move, nodes, _ = agent.get_move(OthelloGame())
+    record = json.loads(sink.getvalue())
+    assert record["move"] == list(move) and record["nodes"] == nodes
+    assert len(record["nodes_per_depth"]) == 4 and record["nodes_per_depth"][0] == 1
+    assert record["leaf_evals"] > 0 and record["ebf"] > 1
+    instrumentation.disable()
+    assert "get_move" not in agent.__dict__ and "alphabeta" not in agent.__dict__
+    assert agent.get_move(OthelloGame())[0] == move
+
+
+def test_play_game_summaries():
+    result = play_game(MinimaxAgent(2, BLACK), AlphaBetaAgent(2, WHITE, endgame_empties=0), instrument=True)
+    assert result["black_search"]["moves"] > 0 and result["white_search"]["nodes"] > 0
+
+
+def test_effective_branching_factor():
+    assert effective_branching_factor([1, 4, 16]) == 4
+    assert effective_branching_factor([1]) == 0.0
@@ -0,0 +1,36 @@
+import random
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.mcts import MCTSAgent, Node, rollout
+
+
+def test_rollout_on_finished_game_scores_disc_difference():
+    rng = random.Random(0)
+    full = (1 << 64) - 1
+    own = full >> 30  # 34 fichas propias contra 30
+    assert rollout(own, full ^ own, rng) == 1.0
+    assert rollout(full ^ own, own, rng) == 0.0
+    assert Node(own, full ^ own).untried == []
+
+
+def test_moves_are_legal_and_tree_is_reused():
+    game = OthelloGame()
+    agents = {BLACK: MCTSAgent(BLACK, playouts=200, seed=1), WHITE: MCTSAgent(WHITE, playouts=50, seed=2)}
+    reused = []
+    for _ in range(10):
+        current = game.current_player
+        move, nodes, _ = agents[current].get_move(game)
+        assert move in game.get_valid_moves(current)
+        if current == BLACK:
+            assert nodes == 200
+            reused.append(agents[BLACK].reused_playouts)
+        game.make_move(*move, current)
+    assert reused[0] == 0 and all(n > 0 for n in reused[1:])
+
+
+def test_same_seed_same_move():
+    game = OthelloGame()
+    for move in [(2, 3), (2, 2), (3, 2)]:
+        game.make_move(*move, game.current_player)
+    moves = {MCTSAgent(game.current_player, playouts=300, seed=7).get_move(game)[0] for _ in range(2)}
+    assert len(moves) == 1
@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from core.game import BLACK
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.minimax import MinimaxAgent
+from algoritmos.parallel import parallel_root_search
+from algoritmos.search import SearchTimeout
+from benchmark import positions
+
+
+@pytest.mark.parametrize("make_agent", [
+    lambda player, workers: AlphaBetaAgent(3, player, workers=workers, endgame_empties=0),
+    lambda player, workers: MinimaxAgent(2, player, workers=workers),
+])
+def test_parallel_search_picks_the_serial_move(make_agent):
+    for game in positions(4, seed=1):
+        serial, parallel = make_agent(game.current_player, 1), make_agent(game.current_player, 2)
+        assert parallel.get_move(game.clone())[0] == serial.get_move(game.clone())[0]
+
+
+def test_timed_parallel_search_returns_within_budget():
+    agent = AlphaBetaAgent(0, BLACK, time_limit=0.3, workers=2, endgame_empties=0)
+    agent.get_move(positions(1)[0])  # arranque del pool fuera de la medicion
+    for game in positions(4, seed=2)[1:]:
+        agent.player = game.current_player
+        start = time.perf_counter()
+        move, _, _ = agent.get_move(game)
+        assert move in game.get_valid_moves(game.current_player)
+        assert time.perf_counter() - start < 0.3 + 0.3
+
+
+def test_expired_deadline_is_not_an_unlimited_search():
+    agent = AlphaBetaAgent(8, BLACK, workers=2, endgame_empties=0)
+    game = positions(1)[0]
+    start = time.perf_counter()
+    with pytest.raises(SearchTimeout):
+        parallel_root_search(agent, game, 8, game.get_valid_moves(BLACK), time.perf_counter() - 1, split_first=True)
+    assert time.perf_counter() - start < 1
+
+
+def test_cancel_reaches_worker_processes():
+    agent = AlphaBetaAgent(12, BLACK, workers=2, endgame_empties=0)
+    threading.Timer(0.3, agent.cancel).start()
+    start = time.perf_counter()
+    with pytest.raises(SearchTimeout):
+        agent.get_move(positions(1)[0])
+    assert time.perf_counter() - start < 3
+    # Los procesos quedan libres: una busqueda corta despues de cancelar termina enseguida
+    agent.max_depth = 2
+    start = time.perf_counter()
+    assert agent.get_move(positions(1)[0])[0] is not None
+    assert time.perf_counter() - start < 3
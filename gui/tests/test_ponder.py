@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.minimax import MinimaxAgent
+
+
+def wait_for(ponderer, depth, timeout=10):
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        if ponderer.results and min(d for _, d in ponderer.results.values()) >= depth:
+            return
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("cls", [AlphaBetaAgent, MinimaxAgent])
+def test_ponder_hit_answers_immediately(cls):
+    agent = cls(3, WHITE, ponder=True)
+    # Blancas acaban de jugar: se buscan las respuestas de negras mientras "piensan"
+    opening = OthelloGame()
+    opening.make_move(2, 3, BLACK)
+    opening.make_move(*AlphaBetaAgent(1, WHITE).get_move(opening)[0], WHITE)
+    agent.ponder(opening)
+    wait_for(agent.ponderer, 3)
+    reply = opening.get_valid_moves(BLACK)[0]
+    opening.make_move(*reply, BLACK)
+    move, nodes, _ = agent.get_move(opening)
+    assert agent.ponder_hit and nodes == 0 and move in opening.get_valid_moves(WHITE)
+
+
+def test_stop_interrupts_deep_pondering():
+    agent = AlphaBetaAgent(0, BLACK, time_limit=1, ponder=True)
+    game = OthelloGame()
+    game.make_move(2, 3, BLACK)
+    agent.ponder(game)
+    time.sleep(0.2)
+    start = time.perf_counter()
+    agent.stop_pondering()
+    assert time.perf_counter() - start < 0.5
+    assert agent.ponderer.results and agent._deadline is None
+
+
+def test_ponder_requires_single_worker():
+    with pytest.raises(ValueError):
+        AlphaBetaAgent(3, BLACK, workers=2, ponder=True)
@@ -0,0 +1,100 @@
+import pickle
+import random
+
+import pytest
+
+from core.bitboard import symmetries, SYMMETRY_SQUARES
+from core.game import OthelloGame, BLACK
+from algoritmos.reinforcement import QLearningAgent
+from algoritmos.qtable import (QTable, MappedQTable, save_binary, load_table, convert, state_key, HEADER, MAGIC,
+                               MASK_64)
+
+
+def random_table(states=200, seed=0):
+    rng = random.Random(seed)
+    table = QTable()
+    for _ in range(states):
+        black = rng.getrandbits(64) & rng.getrandbits(64)
+        white = rng.getrandbits(64) & ~black & MASK_64
+        key, squares = state_key(black, white, rng.random() < 0.5)
+        for _ in range(3):
+            table.set(key, squares[rng.randrange(64)], rng.random())
+    return table
+
+
+def assert_same_values(table, loaded):
+    assert len(loaded) == len(table)
+    for key, values in table.items():
+        assert list(loaded.values(key)) == list(values)
+
+
+def test_save_map_and_lookup_roundtrip(tmp_path):
+    table = random_table()
+    path = str(tmp_path / "q.qtb")
+    save_binary(table, path)
+    loaded = load_table(path)
+    assert isinstance(loaded, MappedQTable)
+    assert_same_values(table, loaded)
+    assert sorted(key for key, _ in loaded.items()) == sorted(key for key, _ in table.items())
+    # Estado ausente: ceros, sin contarlo
+    missing, _ = state_key(1, 2, True)
+    assert not any(loaded.values(missing)) and len(loaded) == len(table)
+    # Las actualizaciones quedan en memoria; la cuenta solo suma estados nuevos
+    existing = next(key for key, _ in table.items())
+    loaded.set(existing, 0, 1.5)
+    loaded.set(missing, 0, 2.5)
+    loaded.set(missing, 1, 3.5)
+    assert len(loaded) == len(table) + 1
+    assert loaded.get(existing, 0) == 1.5 and loaded.get(missing, 1) == 3.5
+
+
+def test_convert_pickle_to_binary(tmp_path):
+    table = random_table(50, seed=1)
+    source, target = str(tmp_path / "q.pkl"), str(tmp_path / "q.qtb")
+    with open(source, "wb") as f:
+        pickle.dump(table.states, f)
+    assert convert(source, target) == len(table)
+    assert_same_values(table, load_table(target))
+
+
+def test_rejects_other_format_versions(tmp_path):
+    path = tmp_path / "v1.qtb"
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 1, 64, 0))
+    with pytest.raises(ValueError, match="version 1"):
+        load_table(str(path))
+
+
+def test_symmetric_positions_share_one_entry():
+    # Posicion sin simetrias propias: sus 8 imagenes son distintas
+    game = OthelloGame()
+    for move in [(2, 3), (2, 2), (3, 2), (2, 4)]:
+        game.make_move(*move, game.current_player)
+    assert len(set(zip(symmetries(game.black), symmetries(game.white)))) == 8
+    agent = QLearningAgent(game.current_player)
+    action = game.get_valid_moves(game.current_player)[0]
+    agent.update(agent.get_state_key(game), action, 1.0, agent.get_state_key(game), [])
+    assert len(agent.q_table) == 1
+    sq = action[0] * 8 + action[1]
+    key, squares = agent.get_state_key(game)
+    value = agent.q_table.get(key, squares[sq])
+    assert value != 0
+    for index, (black, white) in enumerate(zip(symmetries(game.black), symmetries(game.white))):
+        image = OthelloGame()
+        image.set_bitboards(black, white)
+        image.current_player = game.current_player
+        key, squares = agent.get_state_key(image)
+        # La casilla de la jugada, vista en la posicion simetrica, lleva el mismo valor
+        assert agent.q_table.get(key, squares[SYMMETRY_SQUARES[index][sq]]) == value
+    assert len(agent.q_table) == 1
+
+
+def test_lookups_do_not_insert_states():
+    agent = QLearningAgent(BLACK, epsilon=0.0)
+    game = OthelloGame()
+    state = agent.get_state_key(game)
+    agent.q_table.get(state[0], 0)
+    agent.q_table.values(state[0])
+    agent.choose_action(game)
+    agent.get_move(game)
+    assert len(agent.q_table) == 0
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+from core.game import BLACK
+from algoritmos.registry import create_agent, cached_model, clear_models
+from algoritmos.reinforcement import QLearningAgent
+
+
+def test_agent_modules_imported_on_demand():
+    gui = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys, main_window\n"
+            "from algoritmos.registry import create_agent\n"
+            "print(sorted(m for m in ('algoritmos.minimax', 'algoritmos.mcts', 'numpy') if m in sys.modules))\n"
+            "create_agent('minimax', 'B')\n"
+            "print('algoritmos.minimax' in sys.modules, 'algoritmos.mcts' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=gui, capture_output=True, text=True, check=True)
+    assert out.stdout.split("\n")[:2] == ["[]", "True False"]
+
+
+def test_model_cache_reloads_changed_files(tmp_path):
+    clear_models()
+    path = str(tmp_path / "q.pkl")
+    trainer = QLearningAgent(BLACK)
+    trainer.q_table.set(1, 19, 0.5)
+    trainer.save(path)
+
+    a, b = create_agent("rl", BLACK), create_agent("rl", BLACK)
+    a.load(path, shared=True)
+    b.load(path, shared=True)
+    assert a.q_table is b.q_table and a.q_table.get(1, 19) == 0.5
+
+    trainer.q_table.set(2, 19, 1.0)
+    trainer.save(path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    c = create_agent("rl", BLACK)
+    c.load(path, shared=True)
+    assert c.q_table is not a.q_table and c.q_table.get(2, 19) == 1.0
+    assert cached_model(path, lambda p: None) is None  # otro cargador, otra entrada
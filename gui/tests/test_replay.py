@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pytest
+
+from core.game import BLACK, WHITE
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.reinforcement import QLearningAgent
+from algoritmos.qtable import state_key
+from algoritmos.replay import ReplayBuffer, record_transitions, train_offline
+from metrics import play_game
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = ReplayBuffer(4, seed=0)
+    for i in range(6):
+        buffer.add(i, 0, True, i, 0.0, 0, 0, True, False)
+    assert len(buffer) == 4 and sorted(buffer.columns[0].tolist()) == [2, 3, 4, 5]
+    indices, columns, weights = buffer.sample(16)
+    assert weights is None and set(columns[0]) <= {2, 3, 4, 5}
+
+
+def test_prioritized_sampling_prefers_large_errors():
+    buffer = ReplayBuffer(100, prioritized=True, alpha=1.0, seed=0)
+    for i in range(100):
+        buffer.add(i, 0, True, 0, 0.0, 0, 0, True, False)
+    buffer.update_priorities(np.arange(100), np.where(np.arange(100) == 7, 100.0, 0.01))
+    indices, _, weights = buffer.sample(200)
+    assert (indices == 7).mean() > 0.9
+    assert max(weights) == 1.0 and min(weights) < 1.0
+
+
+def test_transitions_and_offline_training(tmp_path):
+    result = play_game(AlphaBetaAgent(1, BLACK), AlphaBetaAgent(1, WHITE))
+    transitions = record_transitions(result)
+    assert len(transitions) == len(result["moves"])
+    done = [t for t in transitions if t[8]]
+    assert len(done) == 2 and {t[2] for t in done} == {True, False}
+    black_wins = result["black_score"] > result["white_score"]
+    assert all(t[4] == (1 if t[2] == black_wins else -1) for t in done) or result["winner"] == "DRAW"
+    assert all(t[4] == 0 for t in transitions if not t[8])
+
+    path = tmp_path / "games.jsonl"
+    path.write_text(json.dumps(result) + "\n" + "{cortada\n")
+    agent = QLearningAgent(BLACK)
+    assert train_offline(agent, [str(path)], ReplayBuffer(1000, seed=0), batch_size=32, updates_per_game=20) == 1
+    assert len(agent.q_table) > 0
+
+
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_online_replay_bootstraps_from_table_states(tmp_path, batch_size):
+    agent = QLearningAgent(WHITE)
+    buffer = ReplayBuffer(10000, seed=0)
+    agent.train(6, log_file=str(tmp_path / "log.txt"), batch_size=batch_size, replay=buffer, replay_batch=8)
+    black, white, to_move, action, reward, next_black, next_white, next_to_move, done = buffer.columns
+    n = len(buffer)
+    assert n > 0 and not to_move[:n].any() and not next_to_move[:n].any()
+    # Una transicion final por partida; la recompensa solo es distinta de cero al final
+    assert done[:n].sum() == 6 and not reward[:n][~done[:n]].any()
+    assert all((int(b) | int(w)) >> int(a) & 1 == 0 for b, w, a in zip(black[:n], white[:n], action[:n]))
+    # La posicion siguiente es una en la que el agente vuelve a mover: su clave esta en la tabla
+    keys = {key for key, _ in agent.q_table.items()}
+    following = [state_key(int(b), int(w), False)[0] for b, w, d in zip(next_black[:n], next_white[:n], done[:n])
+                 if not d]
+    assert following and all(key in keys for key in following)
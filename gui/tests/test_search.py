@@ -0,0 +1,107 @@
+import random
+import time
+from math import inf
+
+import pytest
+
+from core.game import OthelloGame, BLACK, WHITE
+from core.zobrist import ZOBRIST_TURN
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.minimax import MinimaxAgent
+from algoritmos.search import empty_squares
+from algoritmos.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from benchmark import positions
+
+
+def root_value(agent, game, depth, alpha=-inf, beta=inf):
+    return agent.alphabeta(game.clone(), depth, alpha, beta, True)[0]
+
+
+def root_key(game):
+    return game.hash ^ ZOBRIST_TURN if game.current_player == WHITE else game.hash
+
+
+def test_tt_replacement_prefers_depth_within_a_search():
+    tt = TranspositionTable(0.001)
+    key, other = 5, 5 + len(tt.entries)  # misma casilla
+    tt.store(key, 4, 1, EXACT, None)
+    tt.store(other, 2, 2, EXACT, None)
+    assert tt.probe(other) is None and tt.probe(key)[2] == 1
+    tt.store(other, 4, 3, EXACT, None)
+    assert tt.probe(other)[2] == 3
+    # Una entrada de una busqueda anterior se reemplaza aunque sea mas profunda
+    tt.new_search()
+    tt.store(key, 1, 4, EXACT, None)
+    assert tt.probe(key)[1:4] == (1, 4, EXACT) and tt.probe(other) is None
+
+
+def test_tt_stores_bounds_outside_the_window():
+    game = positions(1, seed=3)[0]
+    agent = AlphaBetaAgent(3, game.current_player, ordering=False)
+    value = root_value(agent, game, 3)
+    assert agent.tt.probe(root_key(game))[2:4] == (value, EXACT)
+    # Ventana por encima del valor: falla por abajo y la entrada es una cota superior del valor exacto
+    agent.tt.clear()
+    high = root_value(agent, game, 3, value + 1, value + 2)
+    assert value <= high <= value + 1 and agent.tt.probe(root_key(game))[2:4] == (high, UPPER)
+    agent.tt.clear()
+    low = root_value(agent, game, 3, value - 2, value - 1)
+    assert value - 1 <= low <= value and agent.tt.probe(root_key(game))[2:4] == (low, LOWER)
+
+
+def test_tt_is_not_reused_after_switching_player():
+    for game in positions(4, seed=7):
+        agent = AlphaBetaAgent(5, BLACK, endgame_empties=0)
+        move, _, _ = agent.get_move(game.clone())
+        child = game.clone()
+        child.make_move(*move, BLACK)
+        # El mismo agente pasa a jugar con blancas sobre posiciones que ya estan en la tabla
+        agent.player, agent.max_depth = child.current_player, 3
+        agent.get_move(child.clone())
+        fresh = AlphaBetaAgent(3, child.current_player, endgame_empties=0)
+        fresh.get_move(child.clone())
+        assert agent.tt.probe(root_key(child))[2] == fresh.tt.probe(root_key(child))[2]
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_search_value_does_not_depend_on_ordering_or_table(depth):
+    for game in positions(4, seed=5):
+        player = game.current_player
+        reference = MinimaxAgent(depth, player).minimax(game.clone(), depth, True)[0]
+        for ordering in (True, False):
+            for tt_size_mb in (16, 0):
+                agent = AlphaBetaAgent(depth, player, tt_size_mb=tt_size_mb, ordering=ordering)
+                assert root_value(agent, game, depth) == reference
+
+
+def test_iterative_deepening_honors_the_time_limit():
+    game = positions(1, seed=4)[0]
+    agent = AlphaBetaAgent(0, game.current_player, time_limit=0.2, endgame_empties=0)
+    start = time.perf_counter()
+    move, _, _ = agent.get_move(game)
+    assert time.perf_counter() - start < 0.2 + 0.3
+    assert move in game.get_valid_moves(game.current_player)
+    assert agent.depth_reached >= 1
+
+
+def test_iterative_deepening_reports_the_capped_depth():
+    game = positions(1, seed=4)[0]
+    for agent in (AlphaBetaAgent(3, game.current_player, time_limit=30, endgame_empties=0),
+                  MinimaxAgent(2, game.current_player, time_limit=30)):
+        fixed = type(agent)(agent.max_depth, game.current_player)
+        move, _, _ = agent.get_move(game)
+        assert agent.depth_reached == agent.max_depth
+        assert move == fixed.get_move(game)[0]
+
+
+def test_endgame_solver_and_search_share_the_time_limit():
+    # 12 vacias: el solucionador no termina en el tiempo y la busqueda sigue con lo que queda
+    rng = random.Random(0)
+    game = OthelloGame()
+    while empty_squares(game) > 12:
+        game.make_move(*rng.choice(game.get_valid_moves(game.current_player)), game.current_player)
+    agent = AlphaBetaAgent(0, game.current_player, time_limit=0.2, endgame_empties=12)
+    start = time.perf_counter()
+    move, _, _ = agent.get_move(game)
+    assert time.perf_counter() - start < 0.2 * 1.3
+    assert move in game.get_valid_moves(game.current_player) and agent.depth_reached < 12
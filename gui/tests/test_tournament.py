@@ -0,0 +1,50 @@
+import pytest
+
+from tournament import agent_spec, schedule, run_tournament, load_records, wilson_interval, percentile
+
+PAIRINGS = [(agent_spec("minimax", "Minimax-1", max_depth=1), agent_spec("alphabeta", "AlphaBeta-1", max_depth=1))]
+
+
+def test_schedule_is_deterministic():
+    assert schedule(PAIRINGS, 4, seed=3) == schedule(PAIRINGS, 4, seed=3)
+    tasks = schedule(PAIRINGS, 4, seed=3)
+    # Cada par de partidas comparte apertura con los colores invertidos
+    assert tasks[0]["opening"] == tasks[1]["opening"]
+    assert tasks[0]["black"] == tasks[1]["white"]
+
+
+def test_ids_depend_on_configuration():
+    ids = {task["id"] for task in schedule(PAIRINGS, 2, seed=0)}
+    assert ids.isdisjoint(task["id"] for task in schedule(PAIRINGS, 2, seed=1))
+    assert ids.isdisjoint(task["id"] for task in schedule(PAIRINGS, 2, seed=0, opening_plies=2))
+    deeper = [(agent_spec("minimax", "Minimax-1", max_depth=2), PAIRINGS[0][1])]
+    assert ids.isdisjoint(task["id"] for task in schedule(deeper, 2, seed=0))
+
+
+def test_resume_plays_only_missing_games(tmp_path):
+    output = str(tmp_path / "tournament.jsonl")
+    run_tournament(PAIRINGS, games=2, workers=1, output=output)
+    with open(output, "a") as f:
+        f.write('{"id": "cortad')  # linea interrumpida
+    summary = run_tournament(PAIRINGS, games=4, workers=1, output=output)
+    records = load_records(output)
+    assert len(records) == 4 and len({r["id"] for r in records}) == 4
+    assert summary[0]["games"] == 4
+    # Otra semilla no reutiliza las partidas ya jugadas
+    summary = run_tournament(PAIRINGS, games=2, workers=1, seed=1, output=output)
+    assert len(load_records(output)) == 6 and summary[0]["games"] == 2
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 0.0)
+    low, high = wilson_interval(5, 10)
+    assert low == pytest.approx(0.2366, abs=1e-4) and high == pytest.approx(0.7634, abs=1e-4)
+    assert wilson_interval(10, 10)[1] == 1.0 and wilson_interval(0, 10)[0] == 0.0
+
+
+def test_percentile():
+    assert percentile([], 50) == 0
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 0) == 1 and percentile(values, 100) == 5
+    assert percentile(values, 90) == 5
@@ -0,0 +1,45 @@
+import random
+
+from core.game import BLACK, WHITE
+from algoritmos.reinforcement import QLearningAgent
+from algoritmos.training_log import TrainingLog, read_records, QUIET, EPISODE, MOVES
+
+
+def test_train_writes_compressed_records(tmp_path):
+    random.seed(0)
+    log_file, records_file = tmp_path / "log.txt", tmp_path / "log.bin.gz"
+    agent = QLearningAgent(BLACK)
+    agent.train(30, log_file=str(log_file), verbosity=EPISODE, records_file=str(records_file), summary_every=10)
+    records = list(read_records(str(records_file)))
+    assert [r[0] for r in records] == list(range(1, 31))
+    assert all(r[5] + r[6] - 4 == r[1] and r[2] in (-1, 0, 1) for r in records)
+    assert records[-1][4] == len(agent.q_table)
+    text = log_file.read_text()
+    assert text.count("Episodios ") == 3 and text.count("Episodio ") == 30
+
+
+def test_batched_training_and_moves_level(tmp_path):
+    agent = QLearningAgent(WHITE)
+    records_file = tmp_path / "batched.gz"
+    agent.train_batched(20, batch_size=8, log_file=None, seed=1, records_file=str(records_file))
+    assert len(list(read_records(str(records_file)))) == 20
+
+    log_file = tmp_path / "moves.txt"
+    QLearningAgent(BLACK).train(2, log_file=str(log_file), verbosity=MOVES)
+    lines = log_file.read_text().splitlines()
+    assert lines[0] == "=== Episodio 1 ===" and "hizo movimiento" in lines[1]
+
+
+def test_quiet_writes_nothing(tmp_path):
+    with TrainingLog(str(tmp_path / "quiet.txt"), QUIET) as log:
+        assert not log.moves
+        log.episode(60, 1, 0.2, 10, 40, 24)
+    assert not (tmp_path / "quiet.txt").exists() and log.episodes == 1
+
+
+def test_quiet_still_writes_records(tmp_path):
+    records_file = tmp_path / "quiet.gz"
+    with TrainingLog(str(tmp_path / "quiet.txt"), QUIET, str(records_file)) as log:
+        log.episode(60, 1, 0.2, 10, 40, 24)
+    assert not (tmp_path / "quiet.txt").exists()
+    assert [r[:3] for r in read_records(str(records_file))] == [(1, 60, 1)]
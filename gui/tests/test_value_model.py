@@ -0,0 +1,71 @@
+import random
+from math import inf
+
+import numpy as np
+import pytest
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.alphabeta import AlphaBetaAgent
+from algoritmos.value_model import ValueModel
+
+
+def random_game(rng, plies):
+    game = OthelloGame()
+    for _ in range(plies):
+        moves = game.get_valid_moves(game.current_player)
+        if not moves:
+            break
+        game.make_move(*rng.choice(moves), game.current_player)
+    return game
+
+
+def mlp(seed=0):
+    rng = np.random.default_rng(seed)
+    return ValueModel([(rng.normal(0, 0.3, (128, 8)), rng.normal(0, 0.1, 8)),
+                       (rng.normal(0, 3, (8, 1)), np.zeros(1))])
+
+
+def test_batch_matches_single_positions():
+    rng = random.Random(0)
+    model = mlp()
+    games = [random_game(rng, rng.randrange(60)) for _ in range(30)]
+    black = np.array([g.black for g in games], dtype=np.uint64)
+    white = np.array([g.white for g in games], dtype=np.uint64)
+    values = model.evaluate_batch(black, white)
+    for game, value in zip(games, values):
+        if game.is_game_over():
+            assert value == game.black_count - game.white_count
+        else:
+            assert abs(value - model(game, BLACK)) < 1e-4
+            assert abs(-value - model(game, WHITE)) < 1e-4
+
+
+def test_batch_matches_calls_on_terminal_and_pass_positions():
+    model = mlp()
+    # Sin jugadas para ninguno con casillas libres, y una posicion en la que blancas deben pasar
+    blocked = OthelloGame()
+    blocked.set_bitboards(1, 1 << 63)
+    passing = OthelloGame()
+    passing.set_bitboards(1, 1 << 1)
+    passing.current_player = WHITE
+    assert not passing.get_valid_moves(WHITE)
+    assert blocked.is_game_over() and not passing.is_game_over()
+    for game in (blocked, passing):
+        value = model.evaluate_batch(np.array([game.black], dtype=np.uint64), np.array([game.white], dtype=np.uint64))[0]
+        assert abs(value - model(game, BLACK)) < 1e-4
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3, 4])
+def test_batched_last_plies_give_same_root_value(depth):
+    rng = random.Random(depth)
+    model = mlp(1)
+    for _ in range(8):
+        game = random_game(rng, rng.randrange(4, 58))
+        player = game.current_player
+        if not game.get_valid_moves(player):
+            continue
+        values = []
+        for batch in (False, True):
+            agent = AlphaBetaAgent(depth, player, tt_size_mb=0, endgame_empties=0, evaluator=model, batch_leaves=batch)
+            values.append(agent.alphabeta(game.clone(), depth, -inf, inf, True)[0])
+        assert abs(values[0] - values[1]) < 1e-4
@@ -0,0 +1,35 @@
+import numpy as np
+
+from core.bitboard import legal_moves
+from core.game import OthelloGame, BLACK, WHITE
+from core.vector_env import VectorOthelloEnv
+
+
+def test_batched_games_match_single_games():
+    batch = 32
+    env = VectorOthelloEnv(batch, seed=3)
+    games = [OthelloGame() for _ in range(batch)]
+    while not env.done.all():
+        masks = env.legal_masks()
+        actions = env.random_actions()
+        for i, game in enumerate(games):
+            if env.done[i]:
+                continue
+            player = BLACK if env.to_move[i] else WHITE
+            assert game.current_player == player
+            own, opp = game._bitboards(player)
+            assert int(masks[i]) == legal_moves(own, opp)
+            if actions[i] >= 0:
+                assert game.make_move(*divmod(int(actions[i]), 8), player)
+            else:
+                game.current_player = game.opponent(player)
+        env.step(actions)
+        for i, game in enumerate(games):
+            assert (int(env.black[i]), int(env.white[i])) == (game.black, game.white)
+            assert env.done[i] == game.is_game_over()
+
+    black, white = env.counts()
+    rewards = env.rewards(black_player=True)
+    for i, game in enumerate(games):
+        assert (black[i], white[i]) == game.count_pieces()
+        assert rewards[i] == np.sign(int(black[i]) - int(white[i]))
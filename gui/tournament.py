@@ -0,0 +1,293 @@
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.reinforcement import QLearningAgent
+from algoritmos.qtable import convert
+from algoritmos.registry import AGENTS, create_agent
+from metrics import play_game
+
+# Agentes que pueden jugar sin interfaz (los modulos se importan al construir el primero de cada tipo)
+AGENT_TYPES = [kind for kind in AGENTS if kind != "humano"]
+
+CSV_FIELDS = ["id", "pairing", "game", "black", "white", "winner", "black_score", "white_score",
+              "black_time", "white_time", "black_nodes", "white_nodes", "black_book_hits", "white_book_hits",
+              "wall_time"]
+
+Q_TABLE_FILE = "q_agent.qtb"
+LEGACY_Q_TABLE_FILE = "q_agent.pkl"
+
+
+def agent_spec(kind, name=None, **params):
+    # Descripcion serializable de un agente: se construye dentro de cada proceso
+    return {"name": name or kind, "type": kind, "params": params}
+
+
+def build_agent(spec, player, size=8):
+    # size: tablero en el que va a jugar; el agente Q dimensiona su tabla con el
+    params = dict(spec["params"])
+    q_table = params.pop("q_table", None)
+    if spec["type"] == "rl":
+        params.setdefault("size", size)
+    agent = create_agent(spec["type"], player, **params)
+    if q_table and os.path.exists(q_table):
+        agent.load(q_table, shared=True)
+    return agent
+
+
+def ensure_q_table(path=Q_TABLE_FILE, episodes=500):
+    # Los procesos comparten la tabla binaria mapeada en memoria; se convierte el pickle si existe
+    if os.path.exists(path):
+        return
+    if os.path.exists(LEGACY_Q_TABLE_FILE):
+        convert(LEGACY_Q_TABLE_FILE, path)
+    else:
+        agent = QLearningAgent(player=WHITE)
+        agent.train(episodes)
+        agent.save(path)
+
+
+def default_pairings(levels, book=None, evaluator=None):
+    # Los mismos enfrentamientos que run_experiments, con el agente Q entrenado compartido.
+    # Con book (ruta a un libro de aperturas) los agentes de busqueda lo consultan antes de buscar;
+    # evaluator ("pattern" o ruta a pesos) reemplaza la diferencia de fichas en las hojas.
+    rl = agent_spec("rl", "QLearning", q_table=Q_TABLE_FILE)
+    extra = {"book": book} if book else {}
+    if evaluator:
+        extra["evaluator"] = evaluator
+    pairings = []
+    for level in levels:
+        minimax = agent_spec("minimax", f"Minimax-{level}", max_depth=level, **extra)
+        alphabeta = agent_spec("alphabeta", f"AlphaBeta-{level}", max_depth=level, **extra)
+        pairings += [(minimax, alphabeta), (alphabeta, rl), (minimax, rl)]
+    return pairings
+
+
+def random_opening(seed, plies):
+    rng = random.Random(seed)
+    game = OthelloGame()
+    opening = []
+    for _ in range(plies):
+        moves = game.get_valid_moves(game.current_player)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        game.make_move(*move, game.current_player)
+        opening.append(list(move))
+    return opening
+
+
+def schedule(pairings, games, seed=0, opening_plies=4):
+    # Cada par de partidas comparte apertura y alterna colores; los ids son estables entre ejecuciones
+    # e incluyen la configuracion, asi al reanudar no se mezclan partidas de otra semilla o parametros
+    tasks = []
+    for a, b in pairings:
+        pairing = f"{a['name']} vs {b['name']}"
+        config = _config_hash(seed, opening_plies, a, b)
+        for g in range(games):
+            opening_seed = _stable_seed(seed, pairing, "opening", g // 2)
+            black, white = (a, b) if g % 2 == 0 else (b, a)
+            tasks.append({
+                "id": f"{pairing}#{g}@{config}",
+                "pairing": pairing,
+                "game": g,
+                "black": black,
+                "white": white,
+                "seed": _stable_seed(seed, pairing, g),
+                "opening": random_opening(opening_seed, opening_plies),
+            })
+    return tasks
+
+
+def _config_hash(*parts):
+    return f"{zlib.crc32(json.dumps(parts, sort_keys=True).encode()):08x}"
+
+
+def _stable_seed(*parts):
+    # hash() de cadenas cambia entre procesos; se usa una semilla derivada del texto
+    return zlib.crc32(repr(parts).encode())
+
+
+def play_scheduled_game(task):
+    random.seed(task["seed"])
+    game = OthelloGame()
+    for x, y in task["opening"]:
+        game.make_move(x, y, game.current_player)
+    black = build_agent(task["black"], BLACK)
+    white = build_agent(task["white"], WHITE)
+    start = time.perf_counter()
+    result = play_game(black, white, game)
+    record = {
+        "id": task["id"],
+        "pairing": task["pairing"],
+        "game": task["game"],
+        "black": task["black"]["name"],
+        "white": task["white"]["name"],
+        "opening": task["opening"],
+        "wall_time": round(time.perf_counter() - start, 3),
+    }
+    record.update(result)
+    return record
+
+
+def load_records(path):
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Linea incompleta de una ejecucion interrumpida: se vuelve a jugar
+                continue
+    return records
+
+
+def run_tournament(pairings, games=10, workers=None, seed=0, opening_plies=4,
+                   output="tournament.jsonl", csv_path=None):
+    if any(spec["type"] == "rl" for pair in pairings for spec in pair):
+        ensure_q_table()
+    tasks = schedule(pairings, games, seed, opening_plies)
+    done = {record["id"] for record in load_records(output)}
+    pending = [task for task in tasks if task["id"] not in done]
+
+    csv_file = None
+    writer = None
+    if csv_path:
+        new_csv = not os.path.exists(csv_path)
+        csv_file = open(csv_path, "a", newline="")
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        if new_csv:
+            writer.writeheader()
+
+    try:
+        with open(output, "a+") as out, ProcessPoolExecutor(max_workers=workers) as pool:
+            out.seek(0, os.SEEK_END)
+            if out.tell():
+                out.seek(out.tell() - 1)
+                if out.read(1) != "\n":
+                    out.write("\n")  # cierra una linea cortada por una interrupcion
+            futures = [pool.submit(play_scheduled_game, task) for task in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                if writer is not None:
+                    writer.writerow(record)
+                    csv_file.flush()
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+
+    ids = {task["id"] for task in tasks}
+    return summarize([record for record in load_records(output) if record["id"] in ids], pairings)
+
+
+def wilson_interval(score, n, z=1.96):
+    if n == 0:
+        return 0.0, 0.0
+    p = score / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def percentile(values, q):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(records, pairings):
+    summary = []
+    for a, b in pairings:
+        pairing = f"{a['name']} vs {b['name']}"
+        games = [r for r in records if r["pairing"] == pairing]
+        wins = draws = losses = 0
+        times = {a["name"]: [], b["name"]: []}
+        nodes = {a["name"]: [], b["name"]: []}
+        book_hits = {a["name"]: 0, b["name"]: 0}
+        for r in games:
+            a_color = "black" if r["black"] == a["name"] else "white"
+            winner = r["winner"].lower()
+            if winner == "draw":
+                draws += 1
+            elif winner == a_color:
+                wins += 1
+            else:
+                losses += 1
+            for color in ("black", "white"):
+                times[r[color]] += r[f"{color}_move_times"]
+                nodes[r[color]] += r[f"{color}_move_nodes"]
+                book_hits[r[color]] += r.get(f"{color}_book_hits", 0)
+        n = len(games)
+        score = wins + 0.5 * draws
+        low, high = wilson_interval(score, n)
+        summary.append({
+            "pairing": pairing,
+            "a": a["name"],
+            "b": b["name"],
+            "games": n,
+            "wins": wins,
+            "draws": draws,
+            "losses": losses,
+            "score": score / n if n else 0.0,
+            "ci_low": low,
+            "ci_high": high,
+            "agents": {
+                name: {
+                    "time_p50": percentile(times[name], 50),
+                    "time_p90": percentile(times[name], 90),
+                    "time_p99": percentile(times[name], 99),
+                    "nodes_p50": percentile(nodes[name], 50),
+                    "nodes_p90": percentile(nodes[name], 90),
+                    "nodes_p99": percentile(nodes[name], 99),
+                    "book_hits": book_hits[name],
+                } for name in (a["name"], b["name"])
+            },
+        })
+    return summary
+
+
+def print_summary(summary):
+    print("| Agente A | Agente B | Partidas | G-E-P | Puntaje A | IC 95% | A t p50/p90 (s) | B t p50/p90 (s) | A nodos p50/p90 | B nodos p50/p90 | Libro A/B |")
+    print("|----------|----------|----------|-------|-----------|--------|-----------------|-----------------|-----------------|-----------------|-----------|")
+    for row in summary:
+        sa, sb = row["agents"][row["a"]], row["agents"][row["b"]]
+        print(f"| {row['a']} | {row['b']} | {row['games']} | {row['wins']}-{row['draws']}-{row['losses']} "
+              f"| {row['score']:.2f} | {row['ci_low']:.2f}-{row['ci_high']:.2f} "
+              f"| {sa['time_p50']:.3f}/{sa['time_p90']:.3f} | {sb['time_p50']:.3f}/{sb['time_p90']:.3f} "
+              f"| {sa['nodes_p50']}/{sa['nodes_p90']} | {sb['nodes_p50']}/{sb['nodes_p90']} "
+              f"| {sa['book_hits']}/{sb['book_hits']} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneo de agentes de Othello en paralelo")
+    parser.add_argument("--levels", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--games", type=int, default=10, help="partidas por enfrentamiento")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--plies", type=int, default=4, help="jugadas aleatorias de apertura")
+    parser.add_argument("--output", default="tournament.jsonl")
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--book", default=None, help="libro de aperturas para Minimax y AlphaBeta")
+    parser.add_argument("--evaluator", default=None, help='"pattern" o archivo de pesos de la evaluacion por patrones')
+    args = parser.parse_args()
+
+    summary = run_tournament(default_pairings(args.levels, args.book, args.evaluator), args.games, args.workers, args.seed,
+                             args.plies, args.output, args.csv)
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
-from gui.core.game import OthelloGame, BLACK, WHITE
-from gui.algoritmos.minimax import MinimaxAgent
+import os
+import sys
+
+# Los modulos del juego se importan como `core.*` y `algoritmos.*` desde gui/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui"))
+
+from core.game import OthelloGame, BLACK, WHITE
+from algoritmos.minimax import MinimaxAgent
 
 # Crear juego y agente
 juego = OthelloGame()